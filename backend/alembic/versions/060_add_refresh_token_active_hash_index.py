@@ -0,0 +1,35 @@
+"""add_refresh_token_active_hash_index
+
+Revision ID: 060
+Revises: bbf6282d9919
+Create Date: 2026-01-02 10:00:00.000000
+
+Adds a partial index on refresh_tokens.token_hash covering only active
+(non-revoked) tokens. Revocation lookups filter on revoked_at IS NULL, so
+this keeps the index they use small as rotated tokens accumulate.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '060'
+down_revision = 'bbf6282d9919'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create partial index on active refresh token hashes."""
+    op.create_index(
+        'ix_refresh_tokens_hash_active',
+        'refresh_tokens',
+        ['token_hash'],
+        postgresql_where=sa.text('revoked_at IS NULL'),
+        sqlite_where=sa.text('revoked_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop partial index on active refresh token hashes."""
+    op.drop_index('ix_refresh_tokens_hash_active', 'refresh_tokens')
@@ -0,0 +1,32 @@
+"""add_refresh_token_cleanup_index
+
+Revision ID: 061
+Revises: 060
+Create Date: 2026-01-02 11:00:00.000000
+
+Adds a composite (expires_at, revoked_at) index on refresh_tokens so the
+batched cleanup of expired, long-revoked tokens uses an index range scan
+instead of a full table scan.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '061'
+down_revision = '060'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create composite index for refresh token cleanup."""
+    op.create_index(
+        'ix_refresh_tokens_cleanup',
+        'refresh_tokens',
+        ['expires_at', 'revoked_at'],
+    )
+
+
+def downgrade() -> None:
+    """Drop composite index for refresh token cleanup."""
+    op.drop_index('ix_refresh_tokens_cleanup', 'refresh_tokens')
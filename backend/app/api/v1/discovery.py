@@ -25,7 +25,6 @@ from app.schemas.discovery import (
 )
 from app.services.onvif_discovery_service import (
     get_onvif_discovery_service,
-    WSDISCOVERY_AVAILABLE,
     ONVIF_ZEEP_AVAILABLE,
 )
 
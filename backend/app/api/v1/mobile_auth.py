@@ -21,6 +21,7 @@ from app.core.database import get_db
 from app.api.v1.auth import get_current_user
 from app.models.user import User
 from app.models.device import Device
+from app.models.refresh_token import RevokeReason
 from app.services.mobile.pairing_service import PairingService
 from app.services.mobile.token_service import TokenService
 from app.schemas.mobile_auth import (
@@ -394,7 +395,7 @@ async def revoke_tokens(
     revoked_count = 0
 
     if request.refresh_token:
-        if token_service.revoke_token(request.refresh_token, "logout"):
+        if token_service.revoke_token(request.refresh_token, RevokeReason.LOGOUT):
             revoked_count = 1
 
     elif request.device_id:
@@ -405,9 +406,9 @@ async def revoke_tokens(
         ).first()
 
         if device:
-            revoked_count = token_service.revoke_device_tokens(request.device_id, "logout")
+            revoked_count = token_service.revoke_device_tokens(request.device_id, RevokeReason.LOGOUT)
 
     elif request.revoke_all:
-        revoked_count = token_service.revoke_user_tokens(current_user.id, "logout_all")
+        revoked_count = token_service.revoke_user_tokens(current_user.id, RevokeReason.LOGOUT_ALL)
 
     return TokenRevokeResponse(revoked_count=revoked_count)
@@ -6,13 +6,28 @@ Tokens are stored as SHA-256 hashes for security.
 Old tokens are revoked on rotation.
 """
 from datetime import datetime, timezone
+from enum import Enum
 from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
 
+class RevokeReason(str, Enum):
+    """Reasons recorded in RefreshToken.revoked_reason"""
+    ROTATION = "rotation"
+    LOGOUT = "logout"
+    LOGOUT_ALL = "logout_all"
+    DEVICE_REMOVED = "device_removed"
+    SECURITY = "security"
+
+
+def revoke_reason_value(reason: RevokeReason | str) -> str:
+    """Normalize a RevokeReason member or plain string to the stored value."""
+    return reason.value if isinstance(reason, RevokeReason) else reason
+
+
 class RefreshToken(Base):
     """
     Refresh tokens for mobile JWT authentication.
@@ -32,7 +47,7 @@ class RefreshToken(Base):
     token_family = Column(String(36), nullable=False)  # Group related tokens for revocation
     expires_at = Column(DateTime(timezone=True), nullable=False)
     revoked_at = Column(DateTime(timezone=True), nullable=True)  # NULL if valid
-    revoked_reason = Column(String(50), nullable=True)  # rotation, logout, security
+    revoked_reason = Column(String(50), nullable=True)  # RevokeReason value
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # Relationships
@@ -41,9 +56,17 @@ class RefreshToken(Base):
 
     __table_args__ = (
         Index('ix_refresh_tokens_hash', 'token_hash'),
+        # Partial index for lookups that only consider active tokens (revoke_token)
+        Index(
+            'ix_refresh_tokens_hash_active',
+            'token_hash',
+            postgresql_where=text('revoked_at IS NULL'),
+            sqlite_where=text('revoked_at IS NULL'),
+        ),
         Index('ix_refresh_tokens_device', 'device_id'),
         Index('ix_refresh_tokens_user', 'user_id'),
         Index('ix_refresh_tokens_family', 'token_family'),
+        Index('ix_refresh_tokens_cleanup', 'expires_at', 'revoked_at'),
     )
 
     @property
@@ -63,10 +86,10 @@ class RefreshToken(Base):
         """Check if token has been revoked."""
         return self.revoked_at is not None
 
-    def revoke(self, reason: str = "rotation") -> None:
+    def revoke(self, reason: RevokeReason | str = RevokeReason.ROTATION) -> None:
         """Revoke this token."""
         self.revoked_at = datetime.now(timezone.utc)
-        self.revoked_reason = reason
+        self.revoked_reason = revoke_reason_value(reason)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses (excludes sensitive data)."""
@@ -6,7 +6,7 @@ Pydantic models for ONVIF WS-Discovery and device details endpoints.
 P5-2.1: Basic discovery (DiscoveredDevice, DiscoveryRequest/Response)
 P5-2.2: Device details (StreamProfile, DeviceInfo, DiscoveredCameraDetails)
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -23,6 +23,10 @@ class DiscoveredDevice(BaseModel):
         ...,
         description="XAddrs service URL from ProbeMatch response"
     )
+    xaddrs: List[str] = Field(
+        default_factory=list,
+        description="All service URLs the device advertised, across interfaces"
+    )
     scopes: List[str] = Field(
         default_factory=list,
         description="Device scopes (e.g., onvif://www.onvif.org/type/NetworkVideoTransmitter)"
@@ -35,17 +39,29 @@ class DiscoveredDevice(BaseModel):
         None,
         description="Metadata version from ProbeMatch if available"
     )
+    scope_index: Dict[str, str] = Field(
+        default_factory=dict,
+        description="ONVIF scopes by category (e.g., {'name': 'FrontDoor', 'hardware': 'IPC-HDW2431T'})"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "endpoint_url": "http://192.168.1.100:80/onvif/device_service",
+                "xaddrs": [
+                    "http://192.168.1.100:80/onvif/device_service",
+                    "http://[fe80::1]/onvif/device_service"
+                ],
                 "scopes": [
                     "onvif://www.onvif.org/type/NetworkVideoTransmitter",
                     "onvif://www.onvif.org/Profile/Streaming"
                 ],
                 "types": ["tdn:NetworkVideoTransmitter"],
-                "metadata_version": "1"
+                "metadata_version": "1",
+                "scope_index": {
+                    "type": "NetworkVideoTransmitter",
+                    "Profile": "Streaming"
+                }
             }
         }
     )
@@ -732,7 +732,7 @@ class EventProcessor:
                     ).first()
                     if setting and setting.value.lower() == 'true' and is_ocr_available():
                         try:
-                            ocr_result = extract_overlay_text(event.frame)
+                            ocr_result = extract_overlay_text(event.frame, camera_id=event.camera_id)
                         except Exception as ocr_err:
                             logger.warning(f"OCR extraction failed: {ocr_err}")
             except Exception as ocr_setup_err:
@@ -998,10 +998,12 @@ class EventProcessor:
 
                             # Publish updated event counts (AC3)
                             # Import the helper function for count calculation
-                            from app.services.mqtt_status_service import get_camera_event_counts
+                            from app.services.mqtt_status_service import (
+                                get_camera_event_counts, publish_camera_counts_update
+                            )
                             counts = await get_camera_event_counts(event.camera_id)
                             asyncio.create_task(
-                                mqtt_service.publish_event_counts(
+                                publish_camera_counts_update(
                                     camera_id=event.camera_id,
                                     camera_name=event.camera_name,
                                     events_today=counts["events_today"],
@@ -6,7 +6,10 @@ Story P5-1.5 adds OccupancySensor for person-only detection.
 Story P5-1.6 adds Vehicle/Animal/Package sensors for detection-type-specific automations.
 Story P5-1.7 adds Doorbell sensor for Protect doorbell ring events.
 """
+import asyncio
 import logging
+import sys
+import time
 from typing import Optional
 
 try:
@@ -19,6 +22,59 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# AccessoryInformation characteristics set on every ArgusAI accessory
+_INFO_FIELDS = ("Manufacturer", "Model", "SerialNumber", "FirmwareRevision")
+_FIRMWARE_REVISION = "1.0.0"
+_SERIAL_NUMBER_MAX_LENGTH = 20  # HAP limits serial to 20 chars
+
+# Clears arriving this soon after a trigger are deferred to absorb detector flapping
+DEFAULT_CLEAR_DEBOUNCE_SECONDS = 0.5
+
+
+def _configure_accessory_info(accessory, manufacturer: str, model: str, camera_id: str) -> None:
+    """
+    Populate the AccessoryInformation service of a sensor accessory.
+
+    A camera exposes up to six sensor accessories with the same manufacturer
+    and serial number, so those strings are interned and shared between them.
+    """
+    accessory_info = accessory.get_service("AccessoryInformation")
+    if not accessory_info:
+        return
+    # sys.intern only accepts exact str; pass anything else through unchanged
+    serial_number = camera_id[:_SERIAL_NUMBER_MAX_LENGTH]
+    if type(serial_number) is str:
+        serial_number = sys.intern(serial_number)
+    if type(manufacturer) is str:
+        manufacturer = sys.intern(manufacturer)
+    values = (manufacturer, model, serial_number, _FIRMWARE_REVISION)
+    for field, value in zip(_INFO_FIELDS, values):
+        accessory_info.configure_char(field, value=value)
+
+
+def _create_sensor(sensor_cls, sensor_type: str, driver, camera_id: str, camera_name: str, manufacturer: str):
+    """
+    Shared body of the create_*_sensor factories.
+
+    Returns None instead of raising when HAP-python is unavailable or the
+    accessory cannot be constructed, so one bad camera does not abort
+    bridge setup.
+    """
+    if not HAP_AVAILABLE:
+        logger.warning(f"HAP-python not available, cannot create HomeKit {sensor_type} sensor")
+        return None
+
+    try:
+        return sensor_cls(
+            driver=driver,
+            camera_id=camera_id,
+            name=camera_name,
+            manufacturer=manufacturer
+        )
+    except Exception as e:
+        logger.error(f"Failed to create {sensor_type} sensor for {camera_name}: {e}")
+        return None
+
 
 class CameraMotionSensor:
     """
@@ -65,19 +121,13 @@ class CameraMotionSensor:
         self.name = name
         self._motion_detected = False
 
-        # Set accessory information
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])  # HAP limits serial to 20 chars
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
+        _configure_accessory_info(self._accessory, manufacturer, model, camera_id)
 
         # Add MotionSensor service
         self._motion_service = self._accessory.add_preload_service("MotionSensor")
         self._motion_char = self._motion_service.configure_char("MotionDetected", value=False)
 
-        logger.debug(f"Created HomeKit motion sensor for camera: {name} ({camera_id})")
+        logger.debug("Created HomeKit motion sensor for camera: %s (%s)", name, camera_id)
 
     @property
     def accessory(self):
@@ -96,10 +146,13 @@ class CameraMotionSensor:
         Args:
             detected: True if motion is detected, False otherwise
         """
-        if self._motion_detected != detected:
-            self._motion_detected = detected
-            self._motion_char.set_value(detected)
-            logger.debug(f"HomeKit motion sensor {self.name}: motion={'detected' if detected else 'cleared'}")
+        detected = bool(detected)
+        if detected is self._motion_detected:
+            return
+        self._motion_detected = detected
+        self._motion_char.set_value(detected)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("HomeKit motion sensor %s: motion=%s", self.name, "detected" if detected else "cleared")
 
     def trigger_motion(self) -> None:
         """Trigger motion detection (sets motion to True)."""
@@ -131,20 +184,7 @@ def create_motion_sensor(
     Returns:
         CameraMotionSensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit motion sensor")
-        return None
-
-    try:
-        return CameraMotionSensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create motion sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraMotionSensor, "motion", driver, camera_id, camera_name, manufacturer)
 
 
 class CameraOccupancySensor:
@@ -193,19 +233,13 @@ class CameraOccupancySensor:
         self.name = name
         self._occupancy_detected = False
 
-        # Set accessory information
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])  # HAP limits serial to 20 chars
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
+        _configure_accessory_info(self._accessory, manufacturer, model, camera_id)
 
         # Add OccupancySensor service (distinct from MotionSensor)
         self._occupancy_service = self._accessory.add_preload_service("OccupancySensor")
         self._occupancy_char = self._occupancy_service.configure_char("OccupancyDetected", value=0)
 
-        logger.debug(f"Created HomeKit occupancy sensor for camera: {name} ({camera_id})")
+        logger.debug("Created HomeKit occupancy sensor for camera: %s (%s)", name, camera_id)
 
     @property
     def accessory(self):
@@ -228,7 +262,11 @@ class CameraOccupancySensor:
             self._occupancy_detected = detected
             # OccupancyDetected uses integer: 0 = Not Occupied, 1 = Occupied
             self._occupancy_char.set_value(1 if detected else 0)
-            logger.debug(f"HomeKit occupancy sensor {self.name}: occupancy={'detected' if detected else 'cleared'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "HomeKit occupancy sensor %s: occupancy=%s",
+                    self.name, "detected" if detected else "cleared"
+                )
 
     def trigger_occupancy(self) -> None:
         """Trigger occupancy detection (sets occupancy to True)."""
@@ -260,20 +298,7 @@ def create_occupancy_sensor(
     Returns:
         CameraOccupancySensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit occupancy sensor")
-        return None
-
-    try:
-        return CameraOccupancySensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create occupancy sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraOccupancySensor, "occupancy", driver, camera_id, camera_name, manufacturer)
 
 
 # =============================================================================
@@ -281,39 +306,57 @@ def create_occupancy_sensor(
 # =============================================================================
 
 
-class CameraVehicleSensor:
+class _CameraDetectionSensor:
     """
-    HomeKit Vehicle Sensor accessory for ArgusAI cameras (Story P5-1.6).
+    Shared implementation for detection-type-specific sensors (Story P5-1.6).
 
-    Uses MotionSensor service but only triggers on vehicle detection events.
-    Enables users to create vehicle-specific HomeKit automations.
+    Uses the MotionSensor service but is only triggered for a single
+    detection type. Subclasses set ``_SENSOR_KIND`` (used in logs) and
+    ``_DEFAULT_MODEL`` (AccessoryInformation model name).
+
+    Clears are debounced: a clear that arrives within ``debounce_seconds``
+    of the last trigger is deferred until the window ends, and dropped if
+    another trigger lands first. This keeps a flapping detector from
+    toggling the HomeKit characteristic several times per second.
 
     Attributes:
         camera_id: Unique identifier for the camera
-        name: Display name in Home app (should include "Vehicle")
+        name: Display name in Home app
         manufacturer: Manufacturer name
         serial_number: Serial number (uses camera_id)
     """
 
     category = CATEGORY_SENSOR
 
+    _SENSOR_KIND = "detection"
+    _DEFAULT_MODEL = "Detection Sensor"
+
+    # One instance per camera per detection type; slots keep them small
+    __slots__ = (
+        "_accessory", "camera_id", "name", "_motion_detected",
+        "_debounce_seconds", "_last_triggered", "_pending_clear",
+        "_motion_service", "_motion_char", "_set_value",
+    )
+
     def __init__(
         self,
         driver,
         camera_id: str,
         name: str,
         manufacturer: str = "ArgusAI",
-        model: str = "Vehicle Sensor"
+        model: Optional[str] = None,
+        debounce_seconds: float = DEFAULT_CLEAR_DEBOUNCE_SECONDS
     ):
         """
-        Initialize a camera vehicle sensor accessory.
+        Initialize a camera detection sensor accessory.
 
         Args:
             driver: HAP-python AccessoryDriver instance
             camera_id: Unique camera identifier
-            name: Display name for the accessory (should include "Vehicle")
+            name: Display name for the accessory
             manufacturer: Manufacturer name (default: ArgusAI)
-            model: Model name (default: Vehicle Sensor)
+            model: Model name (default: the subclass's _DEFAULT_MODEL)
+            debounce_seconds: Minimum time detection stays set after a trigger (0 disables)
         """
         if not HAP_AVAILABLE:
             raise ImportError("HAP-python is not installed. Install with: pip install HAP-python")
@@ -324,20 +367,18 @@ class CameraVehicleSensor:
         self.camera_id = camera_id
         self.name = name
         self._motion_detected = False
+        self._debounce_seconds = debounce_seconds
+        self._last_triggered = 0.0  # time.monotonic() of the most recent trigger
+        self._pending_clear: Optional[asyncio.TimerHandle] = None
 
-        # Set accessory information
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
+        _configure_accessory_info(self._accessory, manufacturer, model or self._DEFAULT_MODEL, camera_id)
 
         # Use MotionSensor service (same as motion sensor, differentiated by name)
         self._motion_service = self._accessory.add_preload_service("MotionSensor")
         self._motion_char = self._motion_service.configure_char("MotionDetected", value=False)
+        self._set_value = self._motion_char.set_value
 
-        logger.debug(f"Created HomeKit vehicle sensor for camera: {name} ({camera_id})")
+        logger.debug("Created HomeKit %s sensor for camera: %s (%s)", self._SENSOR_KIND, name, camera_id)
 
     @property
     def accessory(self):
@@ -350,22 +391,83 @@ class CameraVehicleSensor:
         return self._motion_detected
 
     def set_motion(self, detected: bool) -> None:
-        """Update the motion detection state."""
-        if self._motion_detected != detected:
-            self._motion_detected = detected
-            self._motion_char.set_value(detected)
-            logger.debug(f"HomeKit vehicle sensor {self.name}: {'detected' if detected else 'cleared'}")
+        """Update the motion detection state, debouncing rapid clears."""
+        detected = bool(detected)
+        if detected:
+            self._last_triggered = time.monotonic()
+            self._cancel_pending_clear()
+        else:
+            remaining = self._last_triggered + self._debounce_seconds - time.monotonic()
+            if remaining > 0 and self._defer_clear(remaining):
+                return
+        self._apply_motion(detected)
+
+    def _apply_motion(self, detected: bool) -> None:
+        """Push a state change to HomeKit if the value differs."""
+        if detected is self._motion_detected:
+            return
+        self._motion_detected = detected
+        self._set_value(detected)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "HomeKit %s sensor %s: %s",
+                self._SENSOR_KIND, self.name, "detected" if detected else "cleared"
+            )
+
+    def _defer_clear(self, delay: float) -> bool:
+        """
+        Schedule a clear after the debounce window.
+
+        Returns:
+            True if a clear is pending, False if no event loop is running
+            (caller should clear immediately)
+        """
+        if self._pending_clear is not None:
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._pending_clear = loop.call_later(delay, self._run_pending_clear)
+        return True
+
+    def _run_pending_clear(self) -> None:
+        """Apply a clear deferred by the debounce window."""
+        self._pending_clear = None
+        self._apply_motion(False)
+
+    def _cancel_pending_clear(self) -> None:
+        """Drop a deferred clear because detection was re-triggered."""
+        if self._pending_clear is not None:
+            self._pending_clear.cancel()
+            self._pending_clear = None
 
     def trigger_motion(self) -> None:
-        """Trigger vehicle detection."""
+        """Trigger detection for this sensor's detection type."""
         self.set_motion(True)
 
     def clear_motion(self) -> None:
-        """Clear vehicle detection."""
+        """Clear detection for this sensor's detection type."""
         self.set_motion(False)
 
     def __repr__(self) -> str:
-        return f"<CameraVehicleSensor(name={self.name}, camera_id={self.camera_id}, detected={self._motion_detected})>"
+        return (
+            f"<{type(self).__name__}(name={self.name}, camera_id={self.camera_id}, "
+            f"detected={self._motion_detected})>"
+        )
+
+
+class CameraVehicleSensor(_CameraDetectionSensor):
+    """
+    HomeKit Vehicle Sensor accessory for ArgusAI cameras (Story P5-1.6).
+
+    Uses MotionSensor service but only triggers on vehicle detection events.
+    Enables users to create vehicle-specific HomeKit automations.
+    """
+
+    _SENSOR_KIND = "vehicle"
+    _DEFAULT_MODEL = "Vehicle Sensor"
+    __slots__ = ()
 
 
 def create_vehicle_sensor(
@@ -386,105 +488,20 @@ def create_vehicle_sensor(
     Returns:
         CameraVehicleSensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit vehicle sensor")
-        return None
-
-    try:
-        return CameraVehicleSensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create vehicle sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraVehicleSensor, "vehicle", driver, camera_id, camera_name, manufacturer)
 
 
-class CameraAnimalSensor:
+class CameraAnimalSensor(_CameraDetectionSensor):
     """
     HomeKit Animal Sensor accessory for ArgusAI cameras (Story P5-1.6).
 
     Uses MotionSensor service but only triggers on animal detection events.
     Enables users to create animal-specific HomeKit automations.
-
-    Attributes:
-        camera_id: Unique identifier for the camera
-        name: Display name in Home app (should include "Animal")
-        manufacturer: Manufacturer name
-        serial_number: Serial number (uses camera_id)
     """
 
-    category = CATEGORY_SENSOR
-
-    def __init__(
-        self,
-        driver,
-        camera_id: str,
-        name: str,
-        manufacturer: str = "ArgusAI",
-        model: str = "Animal Sensor"
-    ):
-        """
-        Initialize a camera animal sensor accessory.
-
-        Args:
-            driver: HAP-python AccessoryDriver instance
-            camera_id: Unique camera identifier
-            name: Display name for the accessory (should include "Animal")
-            manufacturer: Manufacturer name (default: ArgusAI)
-            model: Model name (default: Animal Sensor)
-        """
-        if not HAP_AVAILABLE:
-            raise ImportError("HAP-python is not installed. Install with: pip install HAP-python")
-
-        self._accessory = Accessory(driver, name)
-        self._accessory.category = CATEGORY_SENSOR
-
-        self.camera_id = camera_id
-        self.name = name
-        self._motion_detected = False
-
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
-
-        self._motion_service = self._accessory.add_preload_service("MotionSensor")
-        self._motion_char = self._motion_service.configure_char("MotionDetected", value=False)
-
-        logger.debug(f"Created HomeKit animal sensor for camera: {name} ({camera_id})")
-
-    @property
-    def accessory(self):
-        """Get the underlying HAP-python Accessory instance."""
-        return self._accessory
-
-    @property
-    def motion_detected(self) -> bool:
-        """Get current motion detection state."""
-        return self._motion_detected
-
-    def set_motion(self, detected: bool) -> None:
-        """Update the motion detection state."""
-        if self._motion_detected != detected:
-            self._motion_detected = detected
-            self._motion_char.set_value(detected)
-            logger.debug(f"HomeKit animal sensor {self.name}: {'detected' if detected else 'cleared'}")
-
-    def trigger_motion(self) -> None:
-        """Trigger animal detection."""
-        self.set_motion(True)
-
-    def clear_motion(self) -> None:
-        """Clear animal detection."""
-        self.set_motion(False)
-
-    def __repr__(self) -> str:
-        return f"<CameraAnimalSensor(name={self.name}, camera_id={self.camera_id}, detected={self._motion_detected})>"
+    _SENSOR_KIND = "animal"
+    _DEFAULT_MODEL = "Animal Sensor"
+    __slots__ = ()
 
 
 def create_animal_sensor(
@@ -505,106 +522,21 @@ def create_animal_sensor(
     Returns:
         CameraAnimalSensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit animal sensor")
-        return None
-
-    try:
-        return CameraAnimalSensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create animal sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraAnimalSensor, "animal", driver, camera_id, camera_name, manufacturer)
 
 
-class CameraPackageSensor:
+class CameraPackageSensor(_CameraDetectionSensor):
     """
     HomeKit Package Sensor accessory for ArgusAI cameras (Story P5-1.6).
 
     Uses MotionSensor service but only triggers on package detection events.
     Enables users to create package-specific HomeKit automations.
     Has a longer default timeout (60s) since packages persist.
-
-    Attributes:
-        camera_id: Unique identifier for the camera
-        name: Display name in Home app (should include "Package")
-        manufacturer: Manufacturer name
-        serial_number: Serial number (uses camera_id)
     """
 
-    category = CATEGORY_SENSOR
-
-    def __init__(
-        self,
-        driver,
-        camera_id: str,
-        name: str,
-        manufacturer: str = "ArgusAI",
-        model: str = "Package Sensor"
-    ):
-        """
-        Initialize a camera package sensor accessory.
-
-        Args:
-            driver: HAP-python AccessoryDriver instance
-            camera_id: Unique camera identifier
-            name: Display name for the accessory (should include "Package")
-            manufacturer: Manufacturer name (default: ArgusAI)
-            model: Model name (default: Package Sensor)
-        """
-        if not HAP_AVAILABLE:
-            raise ImportError("HAP-python is not installed. Install with: pip install HAP-python")
-
-        self._accessory = Accessory(driver, name)
-        self._accessory.category = CATEGORY_SENSOR
-
-        self.camera_id = camera_id
-        self.name = name
-        self._motion_detected = False
-
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
-
-        self._motion_service = self._accessory.add_preload_service("MotionSensor")
-        self._motion_char = self._motion_service.configure_char("MotionDetected", value=False)
-
-        logger.debug(f"Created HomeKit package sensor for camera: {name} ({camera_id})")
-
-    @property
-    def accessory(self):
-        """Get the underlying HAP-python Accessory instance."""
-        return self._accessory
-
-    @property
-    def motion_detected(self) -> bool:
-        """Get current motion detection state."""
-        return self._motion_detected
-
-    def set_motion(self, detected: bool) -> None:
-        """Update the motion detection state."""
-        if self._motion_detected != detected:
-            self._motion_detected = detected
-            self._motion_char.set_value(detected)
-            logger.debug(f"HomeKit package sensor {self.name}: {'detected' if detected else 'cleared'}")
-
-    def trigger_motion(self) -> None:
-        """Trigger package detection."""
-        self.set_motion(True)
-
-    def clear_motion(self) -> None:
-        """Clear package detection."""
-        self.set_motion(False)
-
-    def __repr__(self) -> str:
-        return f"<CameraPackageSensor(name={self.name}, camera_id={self.camera_id}, detected={self._motion_detected})>"
+    _SENSOR_KIND = "package"
+    _DEFAULT_MODEL = "Package Sensor"
+    __slots__ = ()
 
 
 def create_package_sensor(
@@ -625,20 +557,7 @@ def create_package_sensor(
     Returns:
         CameraPackageSensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit package sensor")
-        return None
-
-    try:
-        return CameraPackageSensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create package sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraPackageSensor, "package", driver, camera_id, camera_name, manufacturer)
 
 
 # =============================================================================
@@ -692,13 +611,7 @@ class CameraDoorbellSensor:
         self.camera_id = camera_id
         self.name = name
 
-        # Set accessory information
-        accessory_info = self._accessory.get_service("AccessoryInformation")
-        if accessory_info:
-            accessory_info.configure_char("Manufacturer", value=manufacturer)
-            accessory_info.configure_char("Model", value=model)
-            accessory_info.configure_char("SerialNumber", value=camera_id[:20])
-            accessory_info.configure_char("FirmwareRevision", value="1.0.0")
+        _configure_accessory_info(self._accessory, manufacturer, model, camera_id)
 
         # Add StatelessProgrammableSwitch service for doorbell events
         # This is the HAP service that triggers doorbell-style notifications
@@ -712,7 +625,7 @@ class CameraDoorbellSensor:
             value=0
         )
 
-        logger.debug(f"Created HomeKit doorbell sensor for camera: {name} ({camera_id})")
+        logger.debug("Created HomeKit doorbell sensor for camera: %s (%s)", name, camera_id)
 
     @property
     def accessory(self):
@@ -728,7 +641,7 @@ class CameraDoorbellSensor:
         """
         # Setting value fires the event to HomeKit clients
         self._switch_event.set_value(0)  # 0 = Single Press
-        logger.debug(f"HomeKit doorbell ring triggered for: {self.name}")
+        logger.debug("HomeKit doorbell ring triggered for: %s", self.name)
 
     def __repr__(self) -> str:
         return f"<CameraDoorbellSensor(name={self.name}, camera_id={self.camera_id})>"
@@ -752,17 +665,4 @@ def create_doorbell_sensor(
     Returns:
         CameraDoorbellSensor instance or None if HAP-python not available
     """
-    if not HAP_AVAILABLE:
-        logger.warning("HAP-python not available, cannot create HomeKit doorbell sensor")
-        return None
-
-    try:
-        return CameraDoorbellSensor(
-            driver=driver,
-            camera_id=camera_id,
-            name=camera_name,
-            manufacturer=manufacturer
-        )
-    except Exception as e:
-        logger.error(f"Failed to create doorbell sensor for {camera_name}: {e}")
-        return None
+    return _create_sensor(CameraDoorbellSensor, "doorbell", driver, camera_id, camera_name, manufacturer)
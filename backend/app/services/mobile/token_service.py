@@ -10,9 +10,10 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, Tuple
 from uuid import uuid4
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models.refresh_token import RefreshToken
+from app.models.refresh_token import RefreshToken, RevokeReason, revoke_reason_value
 from app.models.device import Device
 from app.models.user import User
 from app.utils.jwt import create_access_token
@@ -24,6 +25,15 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 REFRESH_TOKEN_LENGTH = 64  # bytes
 GRACE_PERIOD_SECONDS = 30  # Allow old token during rotation
+REVOKED_RETENTION_DAYS = 7  # Keep revoked tokens this long before cleanup
+CLEANUP_BATCH_SIZE = 10_000  # Rows deleted per transaction during cleanup
+
+_REFRESH_TOKEN_TTL = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+_GRACE_PERIOD = timedelta(seconds=GRACE_PERIOD_SECONDS)
+_REVOKED_RETENTION = timedelta(days=REVOKED_RETENTION_DAYS)
+
+# Bound once at import; _hash_token runs on every issue/refresh/revoke
+_sha256 = hashlib.sha256
 
 
 class TokenService:
@@ -62,7 +72,8 @@ class TokenService:
         token_family = str(uuid4())
 
         # Store refresh token
-        expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        now = datetime.now(timezone.utc)
+        expires_at = now + _REFRESH_TOKEN_TTL
 
         refresh_token_record = RefreshToken(
             device_id=device_id,
@@ -74,11 +85,11 @@ class TokenService:
 
         self.db.add(refresh_token_record)
 
-        # Update device pairing status
-        device = self.db.query(Device).filter(Device.id == device_id).first()
-        if device:
-            device.pairing_confirmed = True
-            device.update_last_seen()
+        # Update device pairing status in place (no need to load the row)
+        self.db.query(Device).filter(Device.id == device_id).update(
+            {Device.pairing_confirmed: True, Device.last_seen_at: now},
+            synchronize_session=False,
+        )
 
         self.db.commit()
 
@@ -116,13 +127,23 @@ class TokenService:
         Returns:
             Tuple of (access_token, new_refresh_token, expires_in) or None if invalid
         """
+        if not self._is_well_formed(refresh_token):
+            logger.warning(
+                "Malformed refresh token",
+                extra={"device_id": device_id}
+            )
+            return None
+
         token_hash = self._hash_token(refresh_token)
+        now = datetime.now(timezone.utc)
 
-        # Find the refresh token
-        token_record = self.db.query(RefreshToken).filter(
-            RefreshToken.token_hash == token_hash,
-            RefreshToken.device_id == device_id,
-        ).first()
+        # Find the refresh token (hashes are unique per issued token)
+        token_record = self.db.execute(
+            select(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.device_id == device_id,
+            )
+        ).scalar_one_or_none()
 
         if not token_record:
             logger.warning(
@@ -135,14 +156,16 @@ class TokenService:
         if not token_record.is_valid:
             # Check if this is a recently revoked token (grace period)
             if token_record.revoked_at:
-                grace_cutoff = datetime.now(timezone.utc) - timedelta(seconds=GRACE_PERIOD_SECONDS)
+                grace_cutoff = now - _GRACE_PERIOD
                 if token_record.revoked_at > grace_cutoff:
                     # Within grace period, find the new token in the same family
-                    new_token = self.db.query(RefreshToken).filter(
-                        RefreshToken.token_family == token_record.token_family,
-                        RefreshToken.revoked_at.is_(None),
-                        RefreshToken.expires_at > datetime.now(timezone.utc),
-                    ).first()
+                    new_token = self.db.execute(
+                        select(RefreshToken).where(
+                            RefreshToken.token_family == token_record.token_family,
+                            RefreshToken.revoked_at.is_(None),
+                            RefreshToken.expires_at > now,
+                        ).limit(1)
+                    ).scalar_one_or_none()
 
                     if new_token:
                         # Return the access token for the new refresh token
@@ -163,51 +186,59 @@ class TokenService:
             )
             return None
 
+        # Read what we need from the record now; commit() expires it and
+        # touching it afterwards would cost another SELECT
+        user_id = token_record.user_id
+        token_family = token_record.token_family
+        user = self.db.get(User, user_id)
+        username = user.username if user else None
+
         # Revoke current token (rotation)
-        token_record.revoke("rotation")
+        token_record.revoke(RevokeReason.ROTATION)
 
         # Generate new token pair with same family
         new_refresh_token = secrets.token_hex(REFRESH_TOKEN_LENGTH)
         new_token_hash = self._hash_token(new_refresh_token)
-        expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        expires_at = now + _REFRESH_TOKEN_TTL
 
         new_token_record = RefreshToken(
             device_id=device_id,
-            user_id=token_record.user_id,
+            user_id=user_id,
             token_hash=new_token_hash,
-            token_family=token_record.token_family,  # Keep same family
+            token_family=token_family,  # Keep same family
             expires_at=expires_at,
         )
 
         self.db.add(new_token_record)
 
-        # Update device last seen
-        device = self.db.query(Device).filter(Device.id == device_id).first()
-        if device:
-            device.update_last_seen()
+        # Update device last seen in place (no need to load the row)
+        self.db.query(Device).filter(Device.id == device_id).update(
+            {Device.last_seen_at: now},
+            synchronize_session=False,
+        )
 
+        # Revocation, new token and device update go out in one transaction
         self.db.commit()
 
         # Generate new access token
-        user = self.db.query(User).filter(User.id == token_record.user_id).first()
-        if not user:
-            logger.error("User not found during token refresh", extra={"user_id": token_record.user_id})
+        if username is None:
+            logger.error("User not found during token refresh", extra={"user_id": user_id})
             return None
 
-        access_token = create_access_token(user.id, user.username)
+        access_token = create_access_token(user_id, username)
 
         logger.info(
             "Token refreshed",
             extra={
                 "device_id": device_id,
-                "user_id": token_record.user_id,
-                "token_family": token_record.token_family,
+                "user_id": user_id,
+                "token_family": token_family,
             }
         )
 
         return access_token, new_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-    def revoke_token(self, refresh_token: str, reason: str = "logout") -> bool:
+    def revoke_token(self, refresh_token: str, reason: RevokeReason | str = RevokeReason.LOGOUT) -> bool:
         """
         Revoke a specific refresh token.
 
@@ -218,12 +249,19 @@ class TokenService:
         Returns:
             True if token was found and revoked
         """
+        if not self._is_well_formed(refresh_token):
+            return False
+        reason = revoke_reason_value(reason)
+
         token_hash = self._hash_token(refresh_token)
 
-        token_record = self.db.query(RefreshToken).filter(
-            RefreshToken.token_hash == token_hash,
-            RefreshToken.revoked_at.is_(None),
-        ).first()
+        # Served by the partial ix_refresh_tokens_hash_active index
+        token_record = self.db.execute(
+            select(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+            )
+        ).scalar_one_or_none()
 
         if not token_record:
             return False
@@ -241,7 +279,7 @@ class TokenService:
 
         return True
 
-    def revoke_device_tokens(self, device_id: str, reason: str = "device_removed") -> int:
+    def revoke_device_tokens(self, device_id: str, reason: RevokeReason | str = RevokeReason.DEVICE_REMOVED) -> int:
         """
         Revoke all tokens for a device.
 
@@ -252,16 +290,17 @@ class TokenService:
         Returns:
             Number of tokens revoked
         """
+        reason = revoke_reason_value(reason)
         now = datetime.now(timezone.utc)
 
-        tokens = self.db.query(RefreshToken).filter(
+        # Single bulk UPDATE; the commit below expires any loaded instances
+        count = self.db.query(RefreshToken).filter(
             RefreshToken.device_id == device_id,
             RefreshToken.revoked_at.is_(None),
-        ).all()
-
-        for token in tokens:
-            token.revoked_at = now
-            token.revoked_reason = reason
+        ).update(
+            {RefreshToken.revoked_at: now, RefreshToken.revoked_reason: reason},
+            synchronize_session=False,
+        )
 
         self.db.commit()
 
@@ -269,14 +308,14 @@ class TokenService:
             "Device tokens revoked",
             extra={
                 "device_id": device_id,
-                "count": len(tokens),
+                "count": count,
                 "reason": reason,
             }
         )
 
-        return len(tokens)
+        return count
 
-    def revoke_user_tokens(self, user_id: str, reason: str = "security") -> int:
+    def revoke_user_tokens(self, user_id: str, reason: RevokeReason | str = RevokeReason.SECURITY) -> int:
         """
         Revoke all mobile tokens for a user (e.g., password change).
 
@@ -287,16 +326,17 @@ class TokenService:
         Returns:
             Number of tokens revoked
         """
+        reason = revoke_reason_value(reason)
         now = datetime.now(timezone.utc)
 
-        tokens = self.db.query(RefreshToken).filter(
+        # Single bulk UPDATE; the commit below expires any loaded instances
+        count = self.db.query(RefreshToken).filter(
             RefreshToken.user_id == user_id,
             RefreshToken.revoked_at.is_(None),
-        ).all()
-
-        for token in tokens:
-            token.revoked_at = now
-            token.revoked_reason = reason
+        ).update(
+            {RefreshToken.revoked_at: now, RefreshToken.revoked_reason: reason},
+            synchronize_session=False,
+        )
 
         self.db.commit()
 
@@ -304,35 +344,63 @@ class TokenService:
             "User tokens revoked",
             extra={
                 "user_id": user_id,
-                "count": len(tokens),
+                "count": count,
                 "reason": reason,
             }
         )
 
-        return len(tokens)
+        return count
 
-    def cleanup_expired_tokens(self) -> int:
+    def cleanup_expired_tokens(self, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
         """
         Delete expired and old revoked tokens.
 
+        Deletes in batches, committing after each, so a large backlog does not
+        hold one long write transaction that blocks token refreshes.
+
+        Args:
+            batch_size: Maximum rows deleted per transaction
+
         Returns:
             Number of tokens deleted
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+        now = datetime.now(timezone.utc)
+        cutoff = now - _REVOKED_RETENTION
 
-        # Delete tokens that are both expired AND revoked > 7 days ago
-        deleted = self.db.query(RefreshToken).filter(
-            RefreshToken.expires_at < datetime.now(timezone.utc),
+        # Tokens that are both expired AND revoked > 7 days ago
+        # (served by ix_refresh_tokens_cleanup)
+        batch_ids = select(RefreshToken.id).where(
+            RefreshToken.expires_at < now,
             RefreshToken.revoked_at < cutoff,
-        ).delete()
+        ).limit(batch_size)
 
-        self.db.commit()
+        deleted = 0
+        while True:
+            batch_deleted = self.db.query(RefreshToken).filter(
+                RefreshToken.id.in_(batch_ids)
+            ).delete(synchronize_session=False)
+            self.db.commit()
+
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                break
 
         if deleted > 0:
             logger.info(f"Cleaned up {deleted} old tokens")
 
         return deleted
 
+    @staticmethod
+    def _is_well_formed(token: str) -> bool:
+        """Check a client-supplied refresh token has the issued hex format."""
+        if len(token) != REFRESH_TOKEN_LENGTH * 2:
+            return False
+        try:
+            # fromhex skips whitespace, so confirm the decoded length too
+            return len(bytes.fromhex(token)) == REFRESH_TOKEN_LENGTH
+        except ValueError:
+            return False
+
     def _hash_token(self, token: str) -> str:
         """Hash a token using SHA-256."""
-        return hashlib.sha256(token.encode()).hexdigest()
+        return _sha256(token.encode()).hexdigest()
@@ -18,7 +18,7 @@ from app.services.mqtt_service import MQTTService, get_mqtt_service
 from app.core.database import SessionLocal
 from app.models.mqtt_config import MQTTConfig
 from app.models.camera import Camera
-from app.services.mqtt_status_service import publish_all_camera_statuses
+from app.services.mqtt_status_service import publish_all_camera_statuses, reset_published_cache
 
 logger = logging.getLogger(__name__)
 
@@ -798,6 +798,8 @@ class MQTTDiscoveryService:
             # Publish camera statuses on connect/reconnect (Bug fix: statuses were only
             # published at startup, not on reconnect, causing "Unknown" in Home Assistant)
             try:
+                # Broker may have lost retained state; republish everything
+                reset_published_cache()
                 status_count = await publish_all_camera_statuses()
                 logger.info(
                     f"Published status for {status_count} cameras on MQTT connect",
@@ -10,11 +10,15 @@ Provides helper functions and scheduled tasks for camera status sensors:
 Uses APScheduler for background tasks.
 """
 import asyncio
+import heapq
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, Set
+import time
+from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.models.event import Event
@@ -24,18 +28,98 @@ logger = logging.getLogger(__name__)
 
 # Activity timeout in minutes (AC4)
 ACTIVITY_TIMEOUT_MINUTES = 5
+_ACTIVITY_TIMEOUT = timedelta(minutes=ACTIVITY_TIMEOUT_MINUTES)
 
 # Scheduled update interval in minutes (AC3)
 COUNT_UPDATE_INTERVAL_MINUTES = 5
 
-# Track cameras with active activity (for timeout management)
-_active_cameras: Dict[str, datetime] = {}  # camera_id -> last_event_timestamp
+# Track cameras with active activity (for timeout management).
+# Only touched from the event loop with no await between read and write,
+# so plain dict operations are safe without a lock.
+# Expiry is stored as a time.monotonic() deadline, so timeout checks are
+# float comparisons that are unaffected by wall-clock adjustments.
+_active_cameras: Dict[str, float] = {}  # camera_id -> activity expiry (monotonic)
 
-# Lock for activity state
-_activity_lock = asyncio.Lock()
+# Min-heap of (expiry, camera_id) so timeout checks only visit expired
+# entries. Entries superseded by a newer event are left in place and
+# skipped when popped (their expiry no longer matches _active_cameras).
+_activity_heap: List[Tuple[float, str]] = []
 
+# Last values successfully published per camera. Sensors are retained, so
+# unchanged values are skipped until the cache is reset (e.g. on reconnect).
+_last_counts: Dict[str, Tuple[int, int]] = {}  # camera_id -> (today, this_week)
+_last_statuses: Dict[str, Tuple[str, str]] = {}  # camera_id -> (status, source_type)
 
-async def get_camera_event_counts(camera_id: str) -> Dict[str, int]:
+
+def reset_published_cache() -> None:
+    """
+    Forget last-published counts and statuses.
+
+    Call when retained state on the broker may be lost (e.g. MQTT reconnect)
+    so the next publish pass sends every camera again.
+    """
+    _last_counts.clear()
+    _last_statuses.clear()
+
+
+def _count_published(camera_ids: List[str], results: List[Any], action: str) -> int:
+    """
+    Count successful publishes from gathered results, logging failures.
+
+    Args:
+        camera_ids: Camera UUIDs in the same order as results
+        results: Results from asyncio.gather(..., return_exceptions=True)
+        action: Short description used in failure log messages
+
+    Returns:
+        Number of results that were True
+    """
+    published = 0
+    for camera_id, result in zip(camera_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(
+                f"Failed to publish {action} for camera {camera_id}: {result}",
+                extra={"camera_id": camera_id, "error": str(result)}
+            )
+        elif result:
+            published += 1
+    return published
+
+
+@lru_cache(maxsize=1)
+def _window_bounds_for_day(day: date) -> Tuple[datetime, datetime]:
+    """Start of `day` and of its week (Monday), both at 00:00 UTC."""
+    # Calculate start of today (midnight UTC)
+    today_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+    # Calculate start of week (Monday 00:00 UTC)
+    # weekday() returns 0 for Monday, 6 for Sunday
+    week_start = today_start - timedelta(days=day.weekday())
+
+    return today_start, week_start
+
+
+def get_count_window_bounds(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Get the start of the current day and week for event counts (AC10).
+
+    The bounds only change at midnight, so they are cached per UTC date.
+
+    Args:
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        Tuple of (today_start, week_start)
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return _window_bounds_for_day(now.astimezone(timezone.utc).date())
+
+
+async def get_camera_event_counts(
+    camera_id: str,
+    db: Optional[Session] = None
+) -> Dict[str, int]:
     """
     Calculate event counts for a camera (AC3, AC10).
 
@@ -44,34 +128,28 @@ async def get_camera_event_counts(camera_id: str) -> Dict[str, int]:
 
     Args:
         camera_id: Camera UUID
+        db: Existing session to query with; a new one is opened if omitted
 
     Returns:
         Dict with events_today and events_this_week counts
     """
-    now = datetime.now(timezone.utc)
+    if db is None:
+        with SessionLocal() as session:
+            return await get_camera_event_counts(camera_id, db=session)
 
-    # Calculate start of today (midnight UTC)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_start, week_start = get_count_window_bounds()
 
-    # Calculate start of week (Monday 00:00 UTC)
-    # weekday() returns 0 for Monday, 6 for Sunday
-    days_since_monday = now.weekday()
-    week_start = (now - timedelta(days=days_since_monday)).replace(
-        hour=0, minute=0, second=0, microsecond=0
-    )
+    # Count events today
+    events_today = db.query(func.count(Event.id)).filter(
+        Event.camera_id == camera_id,
+        Event.timestamp >= today_start
+    ).scalar() or 0
 
-    with SessionLocal() as db:
-        # Count events today
-        events_today = db.query(func.count(Event.id)).filter(
-            Event.camera_id == camera_id,
-            Event.timestamp >= today_start
-        ).scalar() or 0
-
-        # Count events this week
-        events_this_week = db.query(func.count(Event.id)).filter(
-            Event.camera_id == camera_id,
-            Event.timestamp >= week_start
-        ).scalar() or 0
+    # Count events this week
+    events_this_week = db.query(func.count(Event.id)).filter(
+        Event.camera_id == camera_id,
+        Event.timestamp >= week_start
+    ).scalar() or 0
 
     return {
         "events_today": events_today,
@@ -79,10 +157,53 @@ async def get_camera_event_counts(camera_id: str) -> Dict[str, int]:
     }
 
 
-async def publish_all_camera_counts() -> int:
+def _collect_camera_counts_sync(
+    today_start: datetime,
+    week_start: datetime
+) -> List[Tuple[str, str, int, int]]:
+    """
+    Query daily and weekly event counts for all enabled cameras.
+
+    Runs in a worker thread (see publish_all_camera_counts).
+
+    Args:
+        today_start: Start of the current day
+        week_start: Start of the current week
+
+    Returns:
+        List of (camera_id, camera_name, events_today, events_this_week)
+    """
+    with SessionLocal() as db:
+        # One aggregated query for all cameras instead of two COUNTs per
+        # camera. The outer join keeps cameras with no events this week.
+        rows = db.query(
+            Camera.id,
+            Camera.name,
+            func.coalesce(func.sum(case((Event.timestamp >= today_start, 1), else_=0)), 0),
+            func.count(Event.id),
+        ).outerjoin(
+            Event,
+            and_(Event.camera_id == Camera.id, Event.timestamp >= week_start)
+        ).filter(
+            Camera.is_enabled == True
+        ).group_by(Camera.id, Camera.name).all()
+
+    return [
+        (str(camera_id), camera_name, int(events_today), int(events_this_week))
+        for camera_id, camera_name, events_today, events_this_week in rows
+    ]
+
+
+async def publish_all_camera_counts(force: bool = False) -> int:
     """
     Publish event counts for all enabled cameras (scheduled task).
 
+    Cameras whose counts are unchanged since the last successful publish
+    are skipped.
+
+    Args:
+        force: Clear the last-published cache and publish every camera
+
     Returns:
         Number of cameras updated
     """
@@ -93,33 +214,43 @@ async def publish_all_camera_counts() -> int:
         logger.debug("Cannot publish camera counts: MQTT not connected")
         return 0
 
-    with SessionLocal() as db:
-        cameras = db.query(Camera).filter(Camera.is_enabled == True).all()
-
-        updated_count = 0
-        for camera in cameras:
-            try:
-                counts = await get_camera_event_counts(str(camera.id))
-                success = await mqtt_service.publish_event_counts(
-                    camera_id=str(camera.id),
-                    camera_name=camera.name,
-                    events_today=counts["events_today"],
-                    events_this_week=counts["events_this_week"]
-                )
-                if success:
-                    updated_count += 1
-            except Exception as e:
-                logger.warning(
-                    f"Failed to publish counts for camera {camera.id}: {e}",
-                    extra={"camera_id": str(camera.id), "error": str(e)}
-                )
+    if force:
+        _last_counts.clear()
 
-        logger.debug(
-            f"Published event counts for {updated_count}/{len(cameras)} cameras",
-            extra={"event_type": "mqtt_counts_scheduled_update"}
+    today_start, week_start = get_count_window_bounds()
+
+    # Keep the synchronous query off the event loop
+    rows = await asyncio.to_thread(_collect_camera_counts_sync, today_start, week_start)
+
+    changed = []
+    for camera_id, camera_name, events_today, events_this_week in rows:
+        counts = (events_today, events_this_week)
+        if _last_counts.get(camera_id) != counts:
+            changed.append((camera_id, camera_name, counts))
+
+    camera_ids = [camera_id for camera_id, _, _ in changed]
+    results = await asyncio.gather(*(
+        mqtt_service.publish_event_counts(
+            camera_id=camera_id,
+            camera_name=camera_name,
+            events_today=counts[0],
+            events_this_week=counts[1]
         )
+        for camera_id, camera_name, counts in changed
+    ), return_exceptions=True)
+    updated_count = _count_published(camera_ids, results, "counts")
+
+    for (camera_id, _, counts), result in zip(changed, results):
+        if result is True:
+            _last_counts[camera_id] = counts
+
+    logger.debug(
+        f"Published event counts for {updated_count}/{len(rows)} cameras "
+        f"({len(rows) - len(changed)} unchanged)",
+        extra={"event_type": "mqtt_counts_scheduled_update"}
+    )
 
-        return updated_count
+    return updated_count
 
 
 async def set_activity_on(camera_id: str, last_event_at: datetime) -> None:
@@ -132,8 +263,16 @@ async def set_activity_on(camera_id: str, last_event_at: datetime) -> None:
         camera_id: Camera UUID
         last_event_at: Timestamp of the triggering event
     """
-    async with _activity_lock:
-        _active_cameras[camera_id] = last_event_at
+    if last_event_at.tzinfo is None:
+        last_event_at = last_event_at.replace(tzinfo=timezone.utc)
+
+    # Activity expires ACTIVITY_TIMEOUT_MINUTES after the event itself;
+    # convert that wall-clock instant to a monotonic deadline once here
+    remaining = last_event_at + _ACTIVITY_TIMEOUT - datetime.now(timezone.utc)
+    expires_at = time.monotonic() + remaining.total_seconds()
+
+    _active_cameras[camera_id] = expires_at
+    heapq.heappush(_activity_heap, (expires_at, camera_id))
 
     logger.debug(
         f"Camera {camera_id} activity set to ON",
@@ -156,52 +295,66 @@ async def check_activity_timeouts() -> int:
     if not mqtt_service.is_connected:
         return 0
 
-    now = datetime.now(timezone.utc)
-    timeout_threshold = now - timedelta(minutes=ACTIVITY_TIMEOUT_MINUTES)
+    now = time.monotonic()
 
     cameras_to_deactivate = []
 
-    async with _activity_lock:
-        for camera_id, last_event_at in list(_active_cameras.items()):
-            # Ensure last_event_at is timezone-aware for comparison
-            if last_event_at.tzinfo is None:
-                last_event_at = last_event_at.replace(tzinfo=timezone.utc)
-            if last_event_at < timeout_threshold:
-                cameras_to_deactivate.append(camera_id)
-
-        # Remove from active set
-        for camera_id in cameras_to_deactivate:
+    while _activity_heap and _activity_heap[0][0] < now:
+        expires_at, camera_id = heapq.heappop(_activity_heap)
+        # Skip entries superseded by a newer event for the same camera
+        if _active_cameras.get(camera_id) == expires_at:
             del _active_cameras[camera_id]
+            cameras_to_deactivate.append(camera_id)
+
+    # Publish OFF state for all timed-out cameras together
+    results = await asyncio.gather(*(
+        mqtt_service.publish_activity_state(
+            camera_id=camera_id,
+            state="OFF",
+            last_event_at=None
+        )
+        for camera_id in cameras_to_deactivate
+    ), return_exceptions=True)
+    off_count = _count_published(cameras_to_deactivate, results, "activity OFF")
 
-    # Publish OFF state for each camera
-    off_count = 0
-    for camera_id in cameras_to_deactivate:
-        try:
-            success = await mqtt_service.publish_activity_state(
-                camera_id=camera_id,
-                state="OFF",
-                last_event_at=None
-            )
-            if success:
-                off_count += 1
-                logger.debug(
-                    f"Camera {camera_id} activity set to OFF (timeout)",
-                    extra={"camera_id": camera_id}
-                )
-        except Exception as e:
-            logger.warning(
-                f"Failed to publish activity OFF for camera {camera_id}: {e}",
-                extra={"camera_id": camera_id, "error": str(e)}
-            )
+    if off_count:
+        logger.debug(
+            f"Set activity OFF (timeout) for {off_count} cameras",
+            extra={"camera_ids": cameras_to_deactivate}
+        )
 
     return off_count
 
 
-async def publish_all_camera_statuses() -> int:
+def _collect_enabled_cameras_sync() -> List[Tuple[str, str, str]]:
+    """
+    Load the enabled cameras needed for status publishing.
+
+    Runs in a worker thread (see publish_all_camera_statuses).
+
+    Returns:
+        List of (camera_id, camera_name, source_type)
+    """
+    with SessionLocal() as db:
+        cameras = db.query(
+            Camera.id, Camera.name, Camera.source_type, Camera.type
+        ).filter(Camera.is_enabled == True).all()
+
+    return [
+        (str(camera_id), name, source_type or camera_type or "rtsp")
+        for camera_id, name, source_type, camera_type in cameras
+    ]
+
+
+async def publish_all_camera_statuses(force: bool = False) -> int:
     """
     Publish status for all enabled cameras.
 
-    Used on MQTT reconnect and initial startup.
+    Used on MQTT reconnect and initial startup. Cameras whose status is
+    unchanged since the last successful publish are skipped.
+
+    Args:
+        force: Clear the last-published cache and publish every camera
 
     Returns:
         Number of cameras updated
@@ -214,45 +367,59 @@ async def publish_all_camera_statuses() -> int:
     if not mqtt_service.is_connected:
         return 0
 
-    with SessionLocal() as db:
-        cameras = db.query(Camera).filter(Camera.is_enabled == True).all()
-
-        updated_count = 0
-        for camera in cameras:
-            try:
-                # Get camera status from camera service
-                camera_status = camera_service.get_camera_status(str(camera.id))
-
-                # Determine MQTT status
-                if camera_status:
-                    status = camera_status.get("status", "unavailable")
-                else:
-                    # No status means camera isn't running
-                    status = "unavailable"
-
-                # Get source type
-                source_type = camera.source_type or camera.type or "rtsp"
-
-                success = await mqtt_service.publish_camera_status(
-                    camera_id=str(camera.id),
-                    camera_name=camera.name,
-                    status=status,
-                    source_type=source_type
-                )
-                if success:
-                    updated_count += 1
-            except Exception as e:
-                logger.warning(
-                    f"Failed to publish status for camera {camera.id}: {e}",
-                    extra={"camera_id": str(camera.id), "error": str(e)}
-                )
+    if force:
+        _last_statuses.clear()
 
-        logger.info(
-            f"Published status for {updated_count}/{len(cameras)} cameras",
-            extra={"event_type": "mqtt_status_all_published"}
-        )
+    # Keep the synchronous query off the event loop
+    cameras = await asyncio.to_thread(_collect_enabled_cameras_sync)
+
+    camera_ids = []
+    values = []
+    publishes = []
+    for camera_id, camera_name, source_type in cameras:
+        # Get camera status from camera service
+        try:
+            camera_status = camera_service.get_camera_status(camera_id)
+        except Exception as e:
+            logger.warning(
+                f"Failed to get status for camera {camera_id}: {e}",
+                extra={"camera_id": camera_id, "error": str(e)}
+            )
+            continue
+
+        # Determine MQTT status
+        if camera_status:
+            status = camera_status.get("status", "unavailable")
+        else:
+            # No status means camera isn't running
+            status = "unavailable"
+
+        value = (status, source_type)
+        if _last_statuses.get(camera_id) == value:
+            continue
+
+        camera_ids.append(camera_id)
+        values.append(value)
+        publishes.append(mqtt_service.publish_camera_status(
+            camera_id=camera_id,
+            camera_name=camera_name,
+            status=status,
+            source_type=source_type
+        ))
+
+    results = await asyncio.gather(*publishes, return_exceptions=True)
+    updated_count = _count_published(camera_ids, results, "status")
+
+    for camera_id, value, result in zip(camera_ids, values, results):
+        if result is True:
+            _last_statuses[camera_id] = value
+
+    logger.info(
+        f"Published status for {updated_count}/{len(cameras)} cameras",
+        extra={"event_type": "mqtt_status_all_published"}
+    )
 
-        return updated_count
+    return updated_count
 
 
 async def publish_camera_status_update(
@@ -281,12 +448,53 @@ async def publish_camera_status_update(
     if not mqtt_service.is_connected:
         return False
 
-    return await mqtt_service.publish_camera_status(
+    success = await mqtt_service.publish_camera_status(
         camera_id=camera_id,
         camera_name=camera_name,
         status=status,
         source_type=source_type
     )
+    if success:
+        _last_statuses[camera_id] = (status, source_type)
+    return success
+
+
+async def publish_camera_counts_update(
+    camera_id: str,
+    camera_name: str,
+    events_today: int,
+    events_this_week: int
+) -> bool:
+    """
+    Publish a single camera's event counts.
+
+    Use from per-event paths so the last-published cache tracks what the
+    broker retains and the scheduled pass does not skip a stale sensor.
+
+    Args:
+        camera_id: Camera UUID
+        camera_name: Human-readable camera name
+        events_today: Events since midnight
+        events_this_week: Events since start of week
+
+    Returns:
+        True if published successfully
+    """
+    from app.services.mqtt_service import get_mqtt_service
+
+    mqtt_service = get_mqtt_service()
+    if not mqtt_service.is_connected:
+        return False
+
+    success = await mqtt_service.publish_event_counts(
+        camera_id=camera_id,
+        camera_name=camera_name,
+        events_today=events_today,
+        events_this_week=events_this_week
+    )
+    if success:
+        _last_counts[camera_id] = (events_today, events_this_week)
+    return success
 
 
 # ===========================================================================
@@ -295,6 +503,14 @@ async def publish_camera_status_update(
 
 _scheduler_initialized = False
 
+# Never run a job concurrently with itself; if runs are missed (slow DB or
+# broker), collapse them into one catch-up run
+_JOB_DEFAULTS = {
+    "max_instances": 1,
+    "coalesce": True,
+    "misfire_grace_time": 60,
+}
+
 
 def setup_status_sensor_scheduler() -> None:
     """
@@ -324,7 +540,8 @@ def setup_status_sensor_scheduler() -> None:
             trigger=IntervalTrigger(minutes=COUNT_UPDATE_INTERVAL_MINUTES),
             id="mqtt_count_updates",
             name="MQTT Event Count Updates",
-            replace_existing=True
+            replace_existing=True,
+            **_JOB_DEFAULTS
         )
 
         # Schedule activity timeout checks every 1 minute (AC4)
@@ -333,7 +550,8 @@ def setup_status_sensor_scheduler() -> None:
             trigger=IntervalTrigger(minutes=1),
             id="mqtt_activity_timeout",
             name="MQTT Activity Timeout Check",
-            replace_existing=True
+            replace_existing=True,
+            **_JOB_DEFAULTS
         )
 
         scheduler.start()
@@ -371,10 +589,10 @@ async def initialize_status_sensors() -> None:
         await asyncio.sleep(1.0)
 
         # Publish initial statuses
-        await publish_all_camera_statuses()
+        await publish_all_camera_statuses(force=True)
 
         # Publish initial counts
-        await publish_all_camera_counts()
+        await publish_all_camera_counts(force=True)
 
         logger.info(
             "MQTT status sensors initialized",
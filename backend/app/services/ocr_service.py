@@ -9,7 +9,8 @@ in video frame overlays (commonly added by security cameras).
 
 import logging
 import re
-from typing import Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 import cv2
@@ -58,6 +59,14 @@ CAMERA_NAME_PATTERNS = [
     r'\b(Front|Back|Rear|Side|Garage|Driveway|Porch|Door)\b',  # Common location keywords
 ]
 
+# Compiled once at import. Kept as ordered lists rather than one alternation:
+# an alternation returns the leftmost match in the text, whereas these lists
+# are priority-ordered (e.g. a date beats an earlier time-of-day).
+_TIMESTAMP_REGEXES = [re.compile(pattern) for pattern in TIMESTAMP_PATTERNS]
+_CAMERA_NAME_REGEXES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in CAMERA_NAME_PATTERNS
+]
+
 
 def parse_timestamp(text: str) -> Optional[str]:
     """
@@ -69,8 +78,8 @@ def parse_timestamp(text: str) -> Optional[str]:
     Returns:
         Extracted timestamp string if found, None otherwise
     """
-    for pattern in TIMESTAMP_PATTERNS:
-        match = re.search(pattern, text)
+    for regex in _TIMESTAMP_REGEXES:
+        match = regex.search(text)
         if match:
             return match.group()
     return None
@@ -86,8 +95,8 @@ def parse_camera_name(text: str) -> Optional[str]:
     Returns:
         Extracted camera name if found, None otherwise
     """
-    for pattern in CAMERA_NAME_PATTERNS:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for regex in _CAMERA_NAME_REGEXES:
+        match = regex.search(text)
         if match:
             # Return the last captured group (the actual name, not the prefix)
             # For patterns with multiple groups, get the last one
@@ -95,6 +104,100 @@ def parse_camera_name(text: str) -> Optional[str]:
     return None
 
 
+# Corners whose grayscale standard deviation is below this are treated as
+# blank (no overlay text) and skipped before OCR
+OVERLAY_MIN_STDDEV = 15.0
+
+# Regions taller than OCR_MAX_REGION_HEIGHT are scaled down to
+# OCR_TARGET_REGION_HEIGHT before OCR; tesseract's cost grows with pixel
+# count and single overlay lines read fine at this height
+OCR_MAX_REGION_HEIGHT = 48
+OCR_TARGET_REGION_HEIGHT = 32
+
+# Slight dilation to connect broken characters
+_DILATE_KERNEL = np.ones((2, 2), np.uint8)
+
+# Per-thread intermediate buffers. OCR runs from executor threads, and the
+# corner regions are the same size frame after frame, so the grayscale and
+# threshold arrays are reused rather than reallocated for every corner.
+_scratch = threading.local()
+
+
+def _scratch_buffer(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """Return this thread's uint8 scratch buffer `name`, resized if needed."""
+    buffer = getattr(_scratch, name, None)
+    if buffer is None or buffer.shape != shape:
+        buffer = np.empty(shape, dtype=np.uint8)
+        setattr(_scratch, name, buffer)
+    return buffer
+
+
+def _to_gray(region: np.ndarray) -> np.ndarray:
+    """
+    Reduce a BGR region to a single channel for OCR.
+
+    Uses the green channel instead of a full luminance conversion. Overlay
+    text is white or yellow, both of which saturate green, and green already
+    carries most of the luminance weight.
+
+    The result is a per-thread scratch buffer, valid until the next call.
+    """
+    gray = _scratch_buffer("gray", region.shape[:2])
+    np.copyto(gray, region[:, :, 1])
+    return gray
+
+
+def _binarize(gray: np.ndarray) -> np.ndarray:
+    """Threshold and dilate a grayscale region for OCR (returns a new array)."""
+    # Apply adaptive thresholding for better text contrast
+    # This works better than simple threshold for varying backgrounds
+    thresh = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2,
+        dst=_scratch_buffer("thresh", gray.shape)
+    )
+
+    return cv2.dilate(thresh, _DILATE_KERNEL, iterations=1)
+
+
+def fit_ocr_height(region: np.ndarray) -> np.ndarray:
+    """
+    Downscale a preprocessed region to OCR_TARGET_REGION_HEIGHT if oversized.
+
+    Aspect ratio is preserved. Regions at or below OCR_MAX_REGION_HEIGHT are
+    returned unchanged.
+
+    Args:
+        region: Preprocessed single-channel region
+
+    Returns:
+        The region, resized if it was taller than OCR_MAX_REGION_HEIGHT
+    """
+    height, width = region.shape[:2]
+    if height <= OCR_MAX_REGION_HEIGHT:
+        return region
+
+    new_width = max(1, round(width * OCR_TARGET_REGION_HEIGHT / height))
+    return cv2.resize(
+        region, (new_width, OCR_TARGET_REGION_HEIGHT), interpolation=cv2.INTER_AREA
+    )
+
+
+def has_overlay_content(gray: np.ndarray) -> bool:
+    """
+    Cheap check for whether a grayscale region could contain overlay text.
+
+    Text overlays produce strong local contrast; near-uniform regions are
+    not worth a tesseract pass.
+
+    Args:
+        gray: Grayscale image region
+
+    Returns:
+        True if the region's standard deviation reaches OVERLAY_MIN_STDDEV
+    """
+    return float(cv2.meanStdDev(gray)[1][0][0]) >= OVERLAY_MIN_STDDEV
+
+
 def preprocess_region(region: np.ndarray) -> np.ndarray:
     """
     Preprocess a frame region for better OCR accuracy.
@@ -105,23 +208,106 @@ def preprocess_region(region: np.ndarray) -> np.ndarray:
     Returns:
         Preprocessed grayscale image optimized for OCR
     """
-    # Convert to grayscale
-    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+    return _binarize(_to_gray(region))
 
-    # Apply adaptive thresholding for better text contrast
-    # This works better than simple threshold for varying backgrounds
-    thresh = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+
+# White rows placed between stacked regions so tesseract keeps them apart
+REGION_SEPARATOR_PX = 10
+
+
+def ocr_regions(regions: List[np.ndarray]) -> List[str]:
+    """
+    OCR several preprocessed regions with a single tesseract invocation.
+
+    Each tesseract call spawns a subprocess and reloads its models, so the
+    regions are stacked vertically (separated by white rows) and read in one
+    pass. Recognized words are assigned back to their source region by the
+    vertical centre of their bounding box.
+
+    Args:
+        regions: Preprocessed single-channel regions of equal width
+
+    Returns:
+        Recognized text for each region, in the same order (may be empty)
+    """
+    width = regions[0].shape[1]
+    separator = np.full((REGION_SEPARATOR_PX, width), 255, dtype=np.uint8)
+
+    parts = []
+    bounds: List[Tuple[int, int]] = []
+    offset = 0
+    for region in regions:
+        if parts:
+            parts.append(separator)
+            offset += REGION_SEPARATOR_PX
+        parts.append(region)
+        bounds.append((offset, offset + region.shape[0]))
+        offset += region.shape[0]
+
+    data = pytesseract.image_to_data(
+        np.vstack(parts),
+        config='--psm 6 --oem 3',  # Uniform block of text, best OCR engine
+        output_type=pytesseract.Output.DICT
     )
 
-    # Optional: slight dilation to connect broken characters
-    kernel = np.ones((2, 2), np.uint8)
-    dilated = cv2.dilate(thresh, kernel, iterations=1)
+    words: List[List[str]] = [[] for _ in regions]
+    for word, top, word_height in zip(data["text"], data["top"], data["height"]):
+        word = word.strip()
+        if not word:
+            continue
+        center = top + word_height / 2
+        for index, (start, end) in enumerate(bounds):
+            if start <= center < end:
+                words[index].append(word)
+                break
+
+    return [" ".join(region_words) for region_words in words]
 
-    return dilated
 
+# Region that last yielded overlay text, per camera. Overlay position is a
+# fixed camera setting, so that region is read on its own before the rest.
+_last_overlay_region: Dict[str, str] = {}
 
-def extract_overlay_text(frame: np.ndarray) -> Optional[OCRResult]:
+
+def _match_overlay_text(candidates: List[Tuple[str, np.ndarray]]) -> Optional[OCRResult]:
+    """
+    OCR candidate regions and return the first one with recognizable text.
+
+    Args:
+        candidates: (region_name, preprocessed_region) pairs in priority order
+
+    Returns:
+        OCRResult for the first matching region, or None
+    """
+    texts = ocr_regions([processed for _, processed in candidates])
+
+    for (region_name, _), text in zip(candidates, texts):
+        if not text:
+            continue
+
+        # Try to extract timestamp and camera name
+        timestamp = parse_timestamp(text)
+        camera_name = parse_camera_name(text)
+
+        if timestamp or camera_name:
+            logger.debug(
+                f"OCR extraction from {region_name}: timestamp={timestamp}, "
+                f"camera_name={camera_name}, raw='{text}'"
+            )
+            return OCRResult(
+                region=region_name,
+                timestamp=timestamp,
+                camera_name=camera_name,
+                raw_text=text
+            )
+
+    return None
+
+
+def extract_overlay_text(
+    frame: np.ndarray,
+    camera_id: Optional[str] = None
+) -> Optional[OCRResult]:
     """
     Extract timestamp and camera name from frame overlay.
 
@@ -129,8 +315,13 @@ def extract_overlay_text(frame: np.ndarray) -> Optional[OCRResult]:
     showing timestamp, camera name, or both. This function attempts to
     extract that information using OCR.
 
+    When a camera_id is given, the corner that matched last time for that
+    camera is tried alone first; the other corners are only read if it
+    yields nothing.
+
     Args:
         frame: BGR image (numpy array) from video frame
+        camera_id: Optional camera UUID used to remember the overlay corner
 
     Returns:
         OCRResult with extracted data, or None if OCR unavailable or nothing found
@@ -157,41 +348,40 @@ def extract_overlay_text(frame: np.ndarray) -> Optional[OCRResult]:
         ("bottom_right", frame[height-region_height:height, width-region_width:width]),
     ]
 
-    for region_name, region in regions:
-        try:
-            # Preprocess for better OCR
-            processed = preprocess_region(region)
-
-            # Run OCR
-            text = pytesseract.image_to_string(
-                processed,
-                config='--psm 7 --oem 3'  # Single line mode, best OCR engine
-            ).strip()
-
-            if not text:
-                continue
-
-            # Try to extract timestamp and camera name
-            timestamp = parse_timestamp(text)
-            camera_name = parse_camera_name(text)
-
-            if timestamp or camera_name:
-                logger.debug(
-                    f"OCR extraction from {region_name}: timestamp={timestamp}, "
-                    f"camera_name={camera_name}, raw='{text}'"
-                )
-                return OCRResult(
-                    region=region_name,
-                    timestamp=timestamp,
-                    camera_name=camera_name,
-                    raw_text=text
-                )
-        except Exception as e:
-            logger.warning(f"OCR failed for {region_name}: {e}")
-            continue
+    try:
+        # Skip blank corners and preprocess the rest
+        candidates = []
+        for region_name, region in regions:
+            gray = _to_gray(region)
+            if has_overlay_content(gray):
+                candidates.append((region_name, fit_ocr_height(_binarize(gray))))
+
+        if not candidates:
+            logger.debug("No overlay content in any region, skipping OCR")
+            return None
+
+        hint = _last_overlay_region.get(camera_id) if camera_id else None
+        hinted = [c for c in candidates if c[0] == hint]
+        if hinted:
+            result = _match_overlay_text(hinted)
+            if result:
+                return result
+            candidates = [c for c in candidates if c[0] != hint]
+            if not candidates:
+                return None
+
+        # Read the remaining corners in one pass
+        result = _match_overlay_text(candidates)
+    except Exception as e:
+        logger.warning(f"OCR failed: {e}")
+        return None
 
-    logger.debug("No overlay text found in any region")
-    return None
+    if result is None:
+        logger.debug("No overlay text found in any region")
+    elif camera_id:
+        _last_overlay_region[camera_id] = result.region
+
+    return result
 
 
 def is_ocr_available() -> bool:
@@ -15,15 +15,26 @@ PRD Reference: docs/PRD-phase5.md (FR13, FR14, FR15)
 """
 import asyncio
 import hashlib
+import ipaddress
 import logging
+import operator
+import os
 import re
+import socket
+import threading
 import time
+import uuid
+import weakref
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, field
-from urllib.parse import urlparse, urlunparse, quote
+from urllib.parse import urlparse, urlunparse, quote, unquote
 
 import cv2
+import psutil
 
 from app.schemas.discovery import (
     DiscoveredDevice,
@@ -35,17 +46,6 @@ from app.schemas.discovery import (
 
 logger = logging.getLogger(__name__)
 
-# Try to import WSDiscovery
-try:
-    from wsdiscovery import WSDiscovery
-    from wsdiscovery.discovery import ThreadedWSDiscovery
-    from wsdiscovery import QName  # For type-based filtering
-    WSDISCOVERY_AVAILABLE = True
-except ImportError:
-    WSDISCOVERY_AVAILABLE = False
-    QName = None
-    logger.warning("WSDiscovery not installed. ONVIF camera discovery will be unavailable.")
-
 # Try to import onvif-zeep for device details (P5-2.2)
 try:
     from onvif import ONVIFCamera
@@ -70,16 +70,71 @@ ONVIF_NVT_ALT_TYPE = "tdn:NetworkVideoTransmitter"
 
 # ONVIF scope patterns
 ONVIF_SCOPE_PREFIX = "onvif://www.onvif.org"
+_CAMERA_ID_TRANS = str.maketrans({".": "-", ":": "-"})
+_SCOPE_RE = re.compile(r"^onvif://www\.onvif\.org/(?P<category>[^/]+)/(?P<value>.+)$")
+
+# WS-Discovery SOAP namespaces
+WSA_NS = "http://schemas.xmlsoap.org/ws/2004/08/addressing"
+WSD_NS = "http://schemas.xmlsoap.org/ws/2005/04/discovery"
+MULTICAST_TTL = 4
+
+# Comma-separated interface names to probe from (e.g. "eth0,wlan0"). When
+# unset, probes go out on every interface that is up, not loopback,
+# multicast-capable and has a private IPv4 address.
+DISCOVERY_INTERFACES_ENV = "ONVIF_DISCOVERY_INTERFACES"
+
+# Probe retransmission: delays (ms) before each retransmit, and how long the
+# scan may go without a new responder after the last retransmit before it
+# ends early. The caller's timeout remains the hard upper bound.
+PROBE_RETRANSMIT_SCHEDULE_MS = (250, 1000, 3000)
+PROBE_QUIET_WINDOW_MS = 500
+
+# Probe for ONVIF Network Video Transmitters; MessageID is filled per scan
+PROBE_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+    f'xmlns:a="{WSA_NS}" xmlns:d="{WSD_NS}" '
+    'xmlns:dn="http://www.onvif.org/ver10/network/wsdl" '
+    'xmlns:tdn="http://www.onvif.org/ver10/network/wsdl">'
+    '<s:Header>'
+    '<a:MessageID>urn:uuid:{message_id}</a:MessageID>'
+    '<a:To>urn:schemas-xmlsoap-org:ws:2005:04:discovery</a:To>'
+    f'<a:Action>{WSD_NS}/Probe</a:Action>'
+    '</s:Header>'
+    '<s:Body><d:Probe>{types}</d:Probe></s:Body>'
+    '</s:Envelope>'
+)
+
+# Type filters probed concurrently in every scan: the standard NVT type, the
+# tdn-prefixed alias some older firmware matches literally, and an
+# unfiltered probe for cameras advertising only a generic device type.
+# Replies that don't look like ONVIF devices are dropped when parsing.
+PROBE_TYPE_FILTERS = (ONVIF_NVT_TYPE, ONVIF_NVT_ALT_TYPE, None)
 
 # Device details constants (P5-2.2)
 DEVICE_QUERY_TIMEOUT = 5  # seconds per device query
 MAX_CONCURRENT_QUERIES = 10  # max parallel device queries
 
+# ONVIF client cache: reuse parsed WSDL clients when re-querying a camera
+CLIENT_CACHE_TTL = 300  # seconds
+CLIENT_CACHE_MAX_SIZE = 64
+
+# Video encoder fields read for each stream profile
+_ENCODER_FIELDS = operator.attrgetter(
+    "Resolution.Width",
+    "Resolution.Height",
+    "RateControl.FrameRateLimit",
+    "Encoding",
+)
+
+# Parallel GetStreamUri calls across all in-flight device queries
+MAX_CONCURRENT_STREAM_URI_QUERIES = 8
+
 # Test connection constants (P5-2.4)
 TEST_CONNECTION_TIMEOUT = 5.0  # seconds for RTSP connection test
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveryResult:
     """Internal result from discovery operation."""
     devices: List[DiscoveredDevice] = field(default_factory=list)
@@ -88,7 +143,19 @@ class DiscoveryResult:
     status: str = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
+class _ProbeMatchIndex:
+    """Devices parsed so far in one scan, indexed for deduplication."""
+    devices: List[DiscoveredDevice] = field(default_factory=list)
+    by_reference: Dict[str, DiscoveredDevice] = field(default_factory=dict)
+    by_endpoint: Dict[Tuple[str, int], DiscoveredDevice] = field(default_factory=dict)
+    # Tallied and logged once per scan rather than per response
+    responses: int = 0
+    duplicates: int = 0
+    parse_errors: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
 class DeviceDetailsResult:
     """Internal result from device details query (P5-2.2)."""
     device: Optional[DiscoveredCameraDetails] = None
@@ -97,6 +164,60 @@ class DeviceDetailsResult:
     status: str = "success"  # success, auth_required, error
 
 
+# Fault text used by cameras that reject the request's credentials
+_AUTH_FAULT_MARKERS = ("not authorized", "unauthorized", "authentication")
+
+
+def _is_auth_fault(fault: Exception) -> bool:
+    """
+    Check whether an ONVIF SOAP fault means authentication is required.
+
+    Checks the structured ter:NotAuthorized subcode first, then falls back
+    to matching the fault message for devices that only report it as text.
+    """
+    for subcode in getattr(fault, "subcodes", None) or ():
+        if str(getattr(subcode, "localname", subcode)).endswith("NotAuthorized"):
+            return True
+    message = str(getattr(fault, "message", None) or fault).lower()
+    return any(marker in message for marker in _AUTH_FAULT_MARKERS)
+
+
+class _WSDiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collects WS-Discovery response datagrams."""
+
+    def __init__(self):
+        self.responses: List[Tuple[bytes, Tuple[str, int]]] = []
+        # Set when a responder not heard from before replies; repeated
+        # replies to retransmitted probes don't extend the scan.
+        self.new_responder = asyncio.Event()
+        self._responders: Set[str] = set()
+
+    def reset(self) -> List[Tuple[bytes, Tuple[str, int]]]:
+        """Start a new scan, returning the responses collected so far."""
+        responses, self.responses = self.responses, []
+        self._responders = set()
+        self.new_responder.clear()
+        return responses
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.responses.append((data, addr))
+        if addr[0] not in self._responders:
+            self._responders.add(addr[0])
+            self.new_responder.set()
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("WS-Discovery socket error: %s", exc)
+
+
+@dataclass(slots=True)
+class _CachedONVIFClient:
+    """ONVIF camera client and services reused across device queries."""
+    camera: Any
+    device_service: Any
+    created_at: float
+    media_service: Any = None
+
+
 class ONVIFDiscoveryService:
     """
     ONVIF WS-Discovery service for camera auto-discovery.
@@ -117,15 +238,57 @@ class ONVIFDiscoveryService:
 
     def __init__(self):
         """Initialize the discovery service."""
-        self._discovery_lock = asyncio.Lock()
-        self._last_discovery_time: Optional[float] = None
-        self._cached_devices: List[DiscoveredDevice] = []
+        # Scan in progress; concurrent callers await it instead of queueing
+        # their own scans, so at most one scan runs at a time
+        self._inflight_discovery: Optional[asyncio.Task] = None
+        # Devices found so far by the running scan, and queues of
+        # discover_cameras_stream() callers waiting for new ones
+        self._scan_index: Optional[_ProbeMatchIndex] = None
+        self._discovery_listeners: Set[asyncio.Queue] = set()
+        self._last_discovery_time: Optional[float] = None  # time.monotonic() seconds
+        # Local address used to reach the LAN when the cache was filled; a
+        # change (VPN toggle, Wi-Fi switch) invalidates the cache early
+        self._cache_network: Optional[str] = None
+        # Immutable so cache hits can hand out the same object without copying
+        self._cached_devices: Tuple[DiscoveredDevice, ...] = ()
         self._cache_ttl = 30  # seconds - cache discovery results briefly
+        self.retransmit_schedule_ms = PROBE_RETRANSMIT_SCHEDULE_MS
+        self.quiet_window_ms = PROBE_QUIET_WINDOW_MS
+        # Probe socket kept open across scans (only one scan is ever in
+        # flight); recreated if the running loop changes.
+        self._discovery_endpoint: Optional[
+            Tuple[asyncio.DatagramTransport, _WSDiscoveryProtocol]
+        ] = None
+        self._discovery_endpoint_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Caps concurrent SOAP queries across all get_device_details callers.
+        # One per event loop: the service is a process-wide singleton, but
+        # an asyncio primitive can only be waited on from one loop.
+        self._details_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Dedicated threads for blocking SOAP calls so they neither starve
+        # nor are starved by the loop's shared default executor.
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_QUERIES,
+            thread_name_prefix="onvif"
+        )
+        # ONVIFCamera construction parses WSDLs and queries capabilities, so
+        # clients are kept per (host, port, credentials). Accessed from
+        # executor threads, hence the threading lock.
+        self._client_cache: "OrderedDict[Tuple[str, int, bytes], _CachedONVIFClient]" = OrderedDict()
+        self._client_cache_lock = threading.Lock()
+        # Separate pool for per-profile GetStreamUri calls: they are submitted
+        # from device queries already running on self._executor, which would
+        # deadlock if that pool were saturated.
+        self._stream_uri_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_STREAM_URI_QUERIES,
+            thread_name_prefix="onvif-uri"
+        )
 
     @property
     def is_available(self) -> bool:
-        """Check if WS-Discovery library is available."""
-        return WSDISCOVERY_AVAILABLE
+        """Check if discovery is available (WS-Discovery uses only the stdlib)."""
+        return True
 
     @property
     def is_device_details_available(self) -> bool:
@@ -136,7 +299,7 @@ class ONVIFDiscoveryService:
         self,
         timeout: int = DEFAULT_TIMEOUT,
         use_cache: bool = True
-    ) -> List[DiscoveredDevice]:
+    ) -> Sequence[DiscoveredDevice]:
         """
         Discover ONVIF cameras on the local network.
 
@@ -148,38 +311,18 @@ class ONVIFDiscoveryService:
             use_cache: Whether to use cached results if available (default: True)
 
         Returns:
-            List of discovered ONVIF devices with their service URLs
-
-        Raises:
-            RuntimeError: If WS-Discovery library is not available
+            Discovered ONVIF devices with their service URLs (read-only)
         """
-        if not WSDISCOVERY_AVAILABLE:
-            logger.error("WS-Discovery library not installed")
-            raise RuntimeError(
-                "ONVIF discovery unavailable: WSDiscovery package not installed. "
-                "Install with: pip install WSDiscovery"
-            )
-
         # Check cache
         if use_cache and self._is_cache_valid():
             logger.debug(
-                f"Returning cached discovery results: {len(self._cached_devices)} devices"
+                "Returning cached discovery results: %d devices",
+                len(self._cached_devices)
             )
-            return self._cached_devices.copy()
-
-        # Use lock to prevent concurrent discovery scans
-        async with self._discovery_lock:
-            # Double-check cache after acquiring lock
-            if use_cache and self._is_cache_valid():
-                return self._cached_devices.copy()
-
-            result = await self._run_discovery(timeout)
-
-            # Update cache
-            self._cached_devices = result.devices
-            self._last_discovery_time = time.time()
+            return self._cached_devices
 
-            return result.devices
+        await self._shared_discovery(timeout)
+        return self._cached_devices
 
     async def discover_cameras_with_result(
         self,
@@ -196,58 +339,132 @@ class ONVIFDiscoveryService:
         Returns:
             DiscoveryResult with devices, duration, status, and any error
         """
-        if not WSDISCOVERY_AVAILABLE:
-            return DiscoveryResult(
-                devices=[],
-                duration_ms=0,
-                status="error",
-                error="ONVIF discovery unavailable: WSDiscovery package not installed"
-            )
+        return await self._shared_discovery(timeout)
+
+    async def discover_cameras_stream(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        use_cache: bool = True
+    ) -> AsyncIterator[DiscoveredDevice]:
+        """
+        Discover ONVIF cameras, yielding each device as soon as it responds.
+
+        Joins the scan already in progress if there is one (yielding the
+        devices it has found so far first), so results and the cache are
+        shared with discover_cameras(). Closing the iterator early doesn't
+        abort the scan for other callers.
+
+        Args:
+            timeout: Discovery timeout in seconds if a new scan is started
+            use_cache: Whether to yield cached results if available
+
+        Yields:
+            Each discovered device once. Replies that arrive later for the
+            same device are merged into the already-yielded object.
+        """
+        if use_cache and self._is_cache_valid():
+            for device in self._cached_devices:
+                yield device
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        found = list(self._scan_index.devices) if self._scan_index else []
+        task = self._discovery_task(timeout)
+        self._discovery_listeners.add(queue)
+        getter: Optional[asyncio.Future] = None
+        yielded: Set[int] = set()
+        try:
+            for device in found:
+                yielded.add(id(device))
+                yield device
+
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    break
+                device = getter.result()
+                if id(device) not in yielded:
+                    yielded.add(id(device))
+                    yield device
+
+            # Anything still queued is in the result, in discovery order
+            for device in task.result().devices:
+                if id(device) not in yielded:
+                    yielded.add(id(device))
+                    yield device
+        finally:
+            self._discovery_listeners.discard(queue)
+            if getter is not None:
+                getter.cancel()
+
+    async def _shared_discovery(self, timeout: int) -> DiscoveryResult:
+        """
+        Run a discovery scan, or join the one already in progress.
+
+        Callers arriving during a scan share its result (and its timeout)
+        rather than each running a scan of their own. The scan is shielded
+        so one caller being cancelled doesn't abort it for the others.
+
+        Args:
+            timeout: Discovery timeout in seconds if a new scan is started
 
-        async with self._discovery_lock:
+        Returns:
+            DiscoveryResult of the shared scan
+        """
+        return await asyncio.shield(self._discovery_task(timeout))
+
+    def _discovery_task(self, timeout: int) -> asyncio.Task:
+        """Return the scan in progress, starting one if there is none."""
+        task = self._inflight_discovery
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.ensure_future(self._discover_and_cache(timeout))
+            self._inflight_discovery = task
+        return task
+
+    async def _discover_and_cache(self, timeout: int) -> DiscoveryResult:
+        """Run a scan and store its devices in the cache."""
+        try:
             result = await self._run_discovery(timeout)
 
             # Update cache
-            self._cached_devices = result.devices
-            self._last_discovery_time = time.time()
+            self._cached_devices = tuple(result.devices)
+            self._last_discovery_time = time.monotonic()
+            self._cache_network = self._network_fingerprint()
 
             return result
+        finally:
+            self._inflight_discovery = None
 
     async def _run_discovery(self, timeout: int) -> DiscoveryResult:
         """
         Execute the actual WS-Discovery scan.
 
-        Uses ThreadedWSDiscovery which handles:
-        - Sending probe messages to multicast address
-        - Listening on all network interfaces
-        - Collecting and deduplicating responses
-
         Args:
             timeout: Maximum time to wait for responses
 
         Returns:
             DiscoveryResult with found devices
         """
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
             logger.info(
-                f"Starting ONVIF discovery scan (timeout: {timeout}s, "
-                f"multicast: {MULTICAST_GROUP}:{MULTICAST_PORT})"
+                "Starting ONVIF discovery scan (timeout: %ss, multicast: %s:%d)",
+                timeout, MULTICAST_GROUP, MULTICAST_PORT
             )
 
-            # Run blocking discovery in thread pool
-            devices = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._sync_discover,
-                timeout
-            )
+            devices = await self._async_discover(timeout)
 
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.monotonic() - start_time) * 1000)
 
             logger.info(
-                f"Discovery complete: found {len(devices)} ONVIF device(s) "
-                f"in {duration_ms}ms"
+                "Discovery complete: found %d ONVIF device(s) in %dms",
+                len(devices), duration_ms
             )
 
             return DiscoveryResult(
@@ -257,7 +474,7 @@ class ONVIFDiscoveryService:
             )
 
         except Exception as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.monotonic() - start_time) * 1000)
             error_msg = f"Discovery failed: {str(e)}"
             logger.error(error_msg, exc_info=True)
 
@@ -268,130 +485,470 @@ class ONVIFDiscoveryService:
                 error=error_msg
             )
 
-    def _sync_discover(self, timeout: int) -> List[DiscoveredDevice]:
+    async def _async_discover(self, timeout: float) -> List[DiscoveredDevice]:
         """
-        Synchronous discovery using WSDiscovery library.
+        Send WS-Discovery probes and collect responses on the event loop.
 
-        This runs in a thread pool to avoid blocking the event loop.
+        Devices answer the multicast probe with a unicast ProbeMatches
+        message to the sending socket, so no multicast group membership
+        is needed.
+
+        UDP is lossy, so the probe is retransmitted per
+        retransmit_schedule_ms. The scan ends once quiet_window_ms passes
+        without a new responder (or a probe being sent), so on a healthy
+        LAN it finishes well before the timeout.
+
+        Responses are parsed as they arrive and new devices are handed to
+        any discover_cameras_stream() listeners.
 
         Args:
-            timeout: Discovery timeout in seconds
+            timeout: Maximum time to wait for responses in seconds
 
         Returns:
             List of discovered devices
         """
-        wsd = ThreadedWSDiscovery()
-        discovered_devices: List[DiscoveredDevice] = []
-        seen_endpoints: Set[str] = set()  # For deduplication
+        loop = asyncio.get_running_loop()
+        transport, protocol = await self._get_discovery_endpoint()
+        # Drop late replies to the previous scan
+        protocol.reset()
+        index = _ProbeMatchIndex()
+        self._scan_index = index
+        consumed = 0
+
+        def collect() -> None:
+            nonlocal consumed
+            batch = protocol.responses[consumed:]
+            consumed += len(batch)
+            for device in self._index_probe_matches(batch, message_ids, index):
+                for queue in self._discovery_listeners:
+                    queue.put_nowait(device)
 
         try:
-            wsd.start()
+            # Retransmits reuse the MessageIDs so devices can drop duplicates
+            message_ids = []
+            probes = []
+            for type_filter in PROBE_TYPE_FILTERS:
+                message_id = uuid.uuid4()
+                types = f"<d:Types>{type_filter}</d:Types>" if type_filter else ""
+                message_ids.append(message_id)
+                probes.append(
+                    PROBE_TEMPLATE.format(message_id=message_id, types=types).encode()
+                )
+
+            # Replies are unicast back to the socket whichever interface
+            # the probe left on, so only the outgoing interface is switched
+            sock = transport.get_extra_info("socket")
+            interfaces = self._discovery_interfaces() if sock is not None else []
+
+            def send_probes() -> None:
+                for interface in interfaces or (None,):
+                    if interface is not None:
+                        try:
+                            sock.setsockopt(
+                                socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                socket.inet_aton(interface)
+                            )
+                        except OSError as e:
+                            logger.debug("Cannot probe from %s: %s", interface, e)
+                            continue
+                    for probe in probes:
+                        transport.sendto(probe, (MULTICAST_GROUP, MULTICAST_PORT))
+
+            quiet_window = self.quiet_window_ms / 1000
+
+            start = loop.time()
+            deadline = start + timeout
+            retransmit_at = []
+            offset = start
+            for delay_ms in self.retransmit_schedule_ms:
+                offset += delay_ms / 1000
+                retransmit_at.append(offset)
+
+            send_probes()
+            last_activity = start
+
+            while True:
+                now = loop.time()
+                if protocol.new_responder.is_set():
+                    protocol.new_responder.clear()
+                    last_activity = now
+                    collect()
+                if retransmit_at and now >= retransmit_at[0]:
+                    retransmit_at.pop(0)
+                    send_probes()
+                    last_activity = now
+
+                # Only go quiet once every retransmit has been sent, so a
+                # device that misses the early probes still gets a chance
+                quiet_until = last_activity + quiet_window
+                if now >= deadline or (not retransmit_at and now >= quiet_until):
+                    break
+
+                if retransmit_at:
+                    wake_at = min(deadline, retransmit_at[0])
+                else:
+                    wake_at = min(deadline, quiet_until)
 
-            # Search for ONVIF Network Video Transmitters
-            # Build QName types for proper filtering (Python 3.13 compatibility)
-            search_types = None
-            if QName is not None:
                 try:
-                    # ONVIF NetworkVideoTransmitter namespace and local name
-                    # Namespace: http://www.onvif.org/ver10/network/wsdl
-                    nvt_qname = QName(
-                        "http://www.onvif.org/ver10/network/wsdl",
-                        "NetworkVideoTransmitter"
+                    await asyncio.wait_for(
+                        protocol.new_responder.wait(), timeout=wake_at - now
                     )
-                    search_types = [nvt_qname]
-                except Exception as qname_err:
-                    logger.debug(f"Could not create QName filter: {qname_err}")
-                    # Fall back to searching all devices
-
-            services = wsd.searchServices(
-                timeout=timeout,
-                types=search_types
-            )
+                except asyncio.TimeoutError:
+                    pass
 
-            logger.debug(f"WS-Discovery returned {len(services)} service(s)")
+            collect()
+        except Exception:
+            self._close_discovery_endpoint()
+            raise
+        finally:
+            self._scan_index = None
+            protocol.reset()
+
+        self._log_probe_summary(index)
+        return index.devices
+
+    async def _get_discovery_endpoint(
+        self
+    ) -> Tuple[asyncio.DatagramTransport, _WSDiscoveryProtocol]:
+        """Return the probe socket, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._discovery_endpoint is not None:
+            transport, protocol = self._discovery_endpoint
+            if self._discovery_endpoint_loop is loop and not transport.is_closing():
+                return transport, protocol
+            self._close_discovery_endpoint()
+
+        transport, protocol = await loop.create_datagram_endpoint(
+            _WSDiscoveryProtocol,
+            local_addr=("0.0.0.0", 0),
+            family=socket.AF_INET
+        )
+
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+        self._discovery_endpoint = (transport, protocol)
+        self._discovery_endpoint_loop = loop
+        return transport, protocol
+
+    @staticmethod
+    def _discovery_interfaces() -> List[str]:
+        """
+        IPv4 addresses of the interfaces to send discovery probes from.
 
-            for service in services:
+        Unless ONVIF_DISCOVERY_INTERFACES names the interfaces, down,
+        loopback and non-multicast links (such as most VPN tunnels) and
+        public addresses are skipped. Returns an empty list (probe via the
+        default route) if no interface qualifies.
+        """
+        configured = os.environ.get(DISCOVERY_INTERFACES_ENV, "")
+        names = {name.strip() for name in configured.split(",") if name.strip()}
+        try:
+            stats = psutil.net_if_stats()
+            addrs = psutil.net_if_addrs()
+        except (OSError, RuntimeError) as e:
+            logger.debug("Cannot enumerate network interfaces: %s", e)
+            return []
+
+        interfaces = []
+        for name, snics in addrs.items():
+            if names:
+                if name not in names:
+                    continue
+            else:
+                stat = stats.get(name)
+                if stat is None or not stat.isup:
+                    continue
+                flags = getattr(stat, "flags", "").split(",")
+                if "loopback" in flags or (flags != [""] and "multicast" not in flags):
+                    continue
+            for snic in snics:
+                if snic.family != socket.AF_INET:
+                    continue
                 try:
-                    # Get XAddrs (service endpoints)
-                    xaddrs = service.getXAddrs()
-                    if not xaddrs:
-                        continue
+                    address = ipaddress.IPv4Address(snic.address)
+                except ValueError:
+                    continue
+                if address.is_loopback or (not names and not address.is_private):
+                    continue
+                interfaces.append(snic.address)
+        return interfaces
+
+    def _close_discovery_endpoint(self) -> None:
+        """Close the probe socket if open."""
+        if self._discovery_endpoint is None:
+            return
+        transport, _ = self._discovery_endpoint
+        self._discovery_endpoint = None
+        self._discovery_endpoint_loop = None
+        try:
+            transport.close()
+        except RuntimeError:
+            # Its event loop is already closed
+            pass
 
-                    # Use first endpoint URL
-                    endpoint_url = xaddrs[0]
+    def _parse_probe_matches(
+        self,
+        responses: List[Tuple[bytes, Tuple[str, int]]],
+        message_ids: Optional[Sequence[uuid.UUID]] = None
+    ) -> List[DiscoveredDevice]:
+        """
+        Parse ProbeMatches datagrams into discovered devices.
 
-                    # Skip if already seen (deduplication)
-                    if endpoint_url in seen_endpoints:
-                        logger.debug(f"Skipping duplicate endpoint: {endpoint_url}")
-                        continue
+        Args:
+            responses: Received (datagram, address) pairs
+            message_ids: MessageIDs of this scan's probes; replies relating
+                to other probes (e.g. late replies to an earlier scan) are
+                ignored
 
-                    seen_endpoints.add(endpoint_url)
+        Returns:
+            Devices in arrival order, deduplicated by endpoint reference
+            (falling back to endpoint host/port). Replies from the same
+            device on other interfaces are merged into one entry: XAddrs,
+            scopes and types are combined and the preferred endpoint URL
+            is chosen from all XAddrs.
+        """
+        index = _ProbeMatchIndex()
+        self._index_probe_matches(responses, message_ids, index)
+        self._log_probe_summary(index)
+        return index.devices
+
+    def _index_probe_matches(
+        self,
+        responses: List[Tuple[bytes, Tuple[str, int]]],
+        message_ids: Optional[Sequence[uuid.UUID]],
+        index: _ProbeMatchIndex
+    ) -> List[DiscoveredDevice]:
+        """
+        Parse a batch of ProbeMatches datagrams into a scan's device index.
 
-                    # Extract scopes
-                    scopes = []
-                    raw_scopes = service.getScopes()
-                    if raw_scopes:
-                        scopes = [str(s) for s in raw_scopes]
+        Returns:
+            Devices first seen in this batch; replies from devices already
+            in the index are merged into their existing entries
+        """
+        new_devices: List[DiscoveredDevice] = []
+        by_reference = index.by_reference
+        by_endpoint = index.by_endpoint
+        index.responses += len(responses)
 
-                    # Extract types
-                    types = []
-                    raw_types = service.getTypes()
-                    if raw_types:
-                        types = [str(t) for t in raw_types]
+        for data, addr in responses:
+            try:
+                root = ET.fromstring(data)
+            except ET.ParseError:
+                index.parse_errors.append(addr[0])
+                continue
+
+            if message_ids is not None:
+                relates_to = root.findtext(f".//{{{WSA_NS}}}RelatesTo")
+                if relates_to and not any(
+                    str(message_id) in relates_to for message_id in message_ids
+                ):
+                    continue
 
-                    # Get metadata version if available
-                    metadata_version = None
-                    try:
-                        metadata_version = str(service.getMetadataVersion())
-                    except Exception:
-                        pass
-
-                    device = DiscoveredDevice(
-                        endpoint_url=endpoint_url,
-                        scopes=scopes,
-                        types=types,
-                        metadata_version=metadata_version
-                    )
+            for match in root.iter(f"{{{WSD_NS}}}ProbeMatch"):
+                # Get XAddrs (service endpoints)
+                xaddrs = (match.findtext(f"{{{WSD_NS}}}XAddrs") or "").split()
+                if not xaddrs:
+                    continue
 
-                    discovered_devices.append(device)
-                    logger.debug(
-                        f"Discovered ONVIF device: {endpoint_url} "
-                        f"(types: {types}, scopes: {len(scopes)})"
+                scopes = (match.findtext(f"{{{WSD_NS}}}Scopes") or "").split()
+                types = (match.findtext(f"{{{WSD_NS}}}Types") or "").split()
+
+                # The unfiltered probe also reaches printers and other
+                # WS-Discovery devices
+                if not self._is_onvif_device(types, scopes):
+                    continue
+
+                endpoint_keys = {self._endpoint_key(xaddr) for xaddr in xaddrs}
+
+                # Devices answer every (re)transmitted probe and may reply on
+                # several interfaces; the endpoint reference is stable
+                reference = match.findtext(
+                    f"{{{WSA_NS}}}EndpointReference/{{{WSA_NS}}}Address"
+                )
+                reference = reference.strip() if reference else None
+
+                existing = by_reference.get(reference) if reference else None
+                if existing is None:
+                    existing = next(
+                        (by_endpoint[key] for key in endpoint_keys if key in by_endpoint),
+                        None
                     )
 
-                except Exception as e:
-                    logger.warning(f"Error parsing discovery response: {e}")
+                if existing is not None:
+                    # Same device: merge what this reply adds and re-pick the
+                    # endpoint so callers can fall back across paths
+                    index.duplicates += 1
+                    self._merge_unique(existing.xaddrs, xaddrs)
+                    self._merge_unique(existing.types, types)
+                    if self._merge_unique(existing.scopes, scopes):
+                        existing.scope_index = self._index_scopes(existing.scopes)
+                    existing.endpoint_url = self._select_xaddr(existing.xaddrs)
+                    for key in endpoint_keys:
+                        by_endpoint.setdefault(key, existing)
                     continue
 
-        finally:
-            try:
-                wsd.stop()
-            except Exception as e:
-                logger.warning(f"Error stopping WS-Discovery: {e}")
+                scope_index = self._index_scopes(scopes)
+                metadata_version = match.findtext(f"{{{WSD_NS}}}MetadataVersion")
+
+                device = DiscoveredDevice(
+                    endpoint_url=self._select_xaddr(xaddrs),
+                    xaddrs=xaddrs,
+                    scopes=scopes,
+                    types=types,
+                    metadata_version=metadata_version.strip() if metadata_version else None,
+                    scope_index=scope_index
+                )
 
-        return discovered_devices
+                index.devices.append(device)
+                new_devices.append(device)
+                if reference:
+                    by_reference[reference] = device
+                for key in endpoint_keys:
+                    by_endpoint.setdefault(key, device)
+
+        return new_devices
+
+    @staticmethod
+    def _log_probe_summary(index: _ProbeMatchIndex) -> None:
+        """Log a scan's parse errors and device summary once."""
+        if index.parse_errors:
+            logger.warning(
+                "Ignored %d malformed discovery response(s) from %s",
+                len(index.parse_errors), ", ".join(sorted(set(index.parse_errors)))
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "WS-Discovery parsed %d response(s): %d device(s) [%s], %d duplicate(s)",
+                index.responses, len(index.devices),
+                ", ".join(d.endpoint_url for d in index.devices), index.duplicates
+            )
+
+    @staticmethod
+    def _is_onvif_device(types: List[str], scopes: List[str]) -> bool:
+        """Whether a ProbeMatch advertises an ONVIF type or ONVIF scopes."""
+        return (
+            any(t.endswith("NetworkVideoTransmitter") for t in types)
+            or any(scope.startswith(ONVIF_SCOPE_PREFIX) for scope in scopes)
+        )
+
+    @staticmethod
+    def _merge_unique(target: List[str], values: List[str]) -> bool:
+        """Append values not already in target; returns whether any were added."""
+        added = False
+        for value in values:
+            if value not in target:
+                target.append(value)
+                added = True
+        return added
+
+    @staticmethod
+    def _index_scopes(scopes: List[str]) -> Dict[str, str]:
+        """
+        Index ONVIF scopes by category, e.g. onvif://www.onvif.org/name/Front%20Door
+        becomes {"name": "Front Door"}. The first value of a category wins.
+        """
+        scope_index: Dict[str, str] = {}
+        for scope in scopes:
+            m = _SCOPE_RE.match(scope)
+            if m:
+                scope_index.setdefault(m.group("category"), unquote(m.group("value")))
+        return scope_index
+
+    @staticmethod
+    def _endpoint_key(endpoint_url: str) -> Tuple[str, int]:
+        """
+        Canonical (host, port) for an endpoint URL.
+
+        Treats http://host/... and http://host:80/... as the same device.
+        """
+        parsed = urlparse(endpoint_url)
+        default_port = 443 if parsed.scheme == "https" else 80
+        try:
+            port = parsed.port or default_port
+        except ValueError:
+            port = default_port
+        return (parsed.hostname or endpoint_url).lower(), port
+
+    @staticmethod
+    def _select_xaddr(xaddrs: List[str]) -> str:
+        """
+        Pick the endpoint URL to use from a device's XAddrs.
+
+        Prefers an IPv4 literal so later queries need no DNS lookup and
+        avoid link-local IPv6 addresses; otherwise the first XAddr.
+        """
+        for xaddr in xaddrs:
+            try:
+                if isinstance(
+                    ipaddress.ip_address(urlparse(xaddr).hostname or ""),
+                    ipaddress.IPv4Address
+                ):
+                    return xaddr
+            except ValueError:
+                continue
+        return xaddrs[0]
 
     def _is_cache_valid(self) -> bool:
-        """Check if cached results are still valid."""
+        """Check if cached results are still valid (within TTL, same network)."""
         if self._last_discovery_time is None:
             return False
-        return (time.time() - self._last_discovery_time) < self._cache_ttl
+        if (time.monotonic() - self._last_discovery_time) >= self._cache_ttl:
+            return False
+        return self._network_fingerprint() == self._cache_network
+
+    @staticmethod
+    def _network_fingerprint() -> Optional[str]:
+        """
+        Local address the host would use to send discovery probes.
+
+        Connecting a UDP socket only selects a route; nothing is sent.
+        Returns None if there is no usable route.
+        """
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect((MULTICAST_GROUP, MULTICAST_PORT))
+                return sock.getsockname()[0]
+        except OSError:
+            return None
+
+    def shutdown(self) -> None:
+        """
+        Stop the service's worker threads without waiting for running
+        queries, and close the discovery socket.
+        """
+        self._executor.shutdown(wait=False)
+        self._stream_uri_executor.shutdown(wait=False)
+        self._close_discovery_endpoint()
 
     def clear_cache(self) -> None:
         """Clear cached discovery results."""
-        self._cached_devices = []
+        self._cached_devices = ()
         self._last_discovery_time = None
+        self._cache_network = None
         logger.debug("Discovery cache cleared")
 
     # =========================================================================
     # Device Details Methods (Story P5-2.2)
     # =========================================================================
 
+    def _get_details_semaphore(self) -> asyncio.Semaphore:
+        """Return the device query semaphore for the running loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._details_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+            self._details_semaphores[loop] = semaphore
+        return semaphore
+
     async def get_device_details(
         self,
         endpoint_url: str,
         username: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        timeout: Optional[float] = None
     ) -> DeviceDetailsResult:
         """
         Query a discovered ONVIF device for detailed information.
@@ -403,6 +960,7 @@ class ONVIFDiscoveryService:
             endpoint_url: ONVIF device service URL from discovery
             username: Optional username for authentication
             password: Optional password for authentication
+            timeout: Optional limit in seconds for the SOAP queries
 
         Returns:
             DeviceDetailsResult with device details or error
@@ -424,7 +982,7 @@ class ONVIFDiscoveryService:
                       "Install with: pip install onvif-zeep"
             )
 
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
             logger.info(f"Querying device details for: {endpoint_url}")
@@ -435,21 +993,25 @@ class ONVIFDiscoveryService:
                 return DeviceDetailsResult(
                     status="error",
                     error=f"Invalid endpoint URL: {endpoint_url}",
-                    duration_ms=int((time.time() - start_time) * 1000)
+                    duration_ms=int((time.monotonic() - start_time) * 1000)
                 )
 
             # Run blocking ONVIF queries in thread pool
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._sync_get_device_details,
-                host,
-                port,
-                username or "",
-                password or "",
-                endpoint_url
-            )
+            async with self._get_details_semaphore():
+                result = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        self._executor,
+                        self._sync_get_device_details,
+                        host,
+                        port,
+                        username or "",
+                        password or "",
+                        endpoint_url
+                    ),
+                    timeout=timeout
+                )
 
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.monotonic() - start_time) * 1000)
             result.duration_ms = duration_ms
 
             if result.status == "success":
@@ -462,8 +1024,18 @@ class ONVIFDiscoveryService:
 
             return result
 
+        except asyncio.TimeoutError:
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            logger.warning(f"Device details query timed out after {timeout}s: {endpoint_url}")
+
+            return DeviceDetailsResult(
+                status="error",
+                error=f"Device did not respond within {timeout} seconds",
+                duration_ms=duration_ms
+            )
+
         except Exception as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.monotonic() - start_time) * 1000)
             error_msg = f"Device details query failed: {str(e)}"
             logger.error(error_msg, exc_info=True)
 
@@ -473,6 +1045,34 @@ class ONVIFDiscoveryService:
                 duration_ms=duration_ms
             )
 
+    async def get_all_device_details(
+        self,
+        devices: List[DiscoveredDevice],
+        username: Optional[str] = None,
+        password: Optional[str] = None
+    ) -> List[DeviceDetailsResult]:
+        """
+        Query several discovered devices concurrently.
+
+        At most MAX_CONCURRENT_QUERIES queries run at once, and each device is
+        given DEVICE_QUERY_TIMEOUT seconds (not counting time spent waiting
+        for a slot) so one unresponsive camera does not hold up the rest.
+
+        Args:
+            devices: Devices returned by discovery
+            username: Optional username applied to every device
+            password: Optional password applied to every device
+
+        Returns:
+            DeviceDetailsResult for each device, in the same order as devices
+        """
+        return list(await asyncio.gather(*(
+            self.get_device_details(
+                device.endpoint_url, username, password, timeout=DEVICE_QUERY_TIMEOUT
+            )
+            for device in devices
+        )))
+
     def _parse_endpoint_url(self, endpoint_url: str) -> Tuple[Optional[str], int]:
         """
         Parse endpoint URL to extract host and port.
@@ -504,8 +1104,77 @@ class ONVIFDiscoveryService:
             Unique camera ID string
         """
         # Create a deterministic ID from IP and port
-        normalized_ip = ip_address.replace(".", "-").replace(":", "-")
-        return f"camera-{normalized_ip}-{port}"
+        return f"camera-{ip_address.translate(_CAMERA_ID_TRANS)}-{port}"
+
+    @staticmethod
+    def _client_cache_key(
+        host: str,
+        port: int,
+        username: str,
+        password: str
+    ) -> Tuple[str, int, bytes]:
+        """Cache key for a client; credentials are hashed, never stored."""
+        credentials = hashlib.blake2b(
+            f"{username}:{password}".encode(), digest_size=8
+        ).digest()
+        return host, port, credentials
+
+    def _get_onvif_client(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str
+    ) -> _CachedONVIFClient:
+        """
+        Return a cached ONVIF client for the device, creating it if needed.
+
+        Entries expire after CLIENT_CACHE_TTL seconds and the cache holds at
+        most CLIENT_CACHE_MAX_SIZE clients (least recently used evicted).
+        """
+        key = self._client_cache_key(host, port, username, password)
+        now = time.monotonic()
+
+        with self._client_cache_lock:
+            client = self._client_cache.get(key)
+            if client is not None:
+                if now - client.created_at < CLIENT_CACHE_TTL:
+                    self._client_cache.move_to_end(key)
+                    return client
+                del self._client_cache[key]
+
+        # Build outside the lock: this does network I/O
+        # Use empty string if no credentials to avoid None issues
+        camera = ONVIFCamera(
+            host=host,
+            port=port,
+            user=username if username else "",
+            passwd=password if password else "",
+        )
+        client = _CachedONVIFClient(
+            camera=camera,
+            device_service=camera.create_devicemgmt_service(),
+            created_at=now
+        )
+
+        with self._client_cache_lock:
+            self._client_cache[key] = client
+            while len(self._client_cache) > CLIENT_CACHE_MAX_SIZE:
+                self._client_cache.popitem(last=False)
+
+        return client
+
+    def _evict_onvif_client(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str
+    ) -> None:
+        """Drop a cached client, e.g. after a failed query."""
+        key = self._client_cache_key(host, port, username, password)
+        with self._client_cache_lock:
+            self._client_cache.pop(key, None)
 
     def _sync_get_device_details(
         self,
@@ -531,25 +1200,16 @@ class ONVIFDiscoveryService:
             DeviceDetailsResult with device info and profiles
         """
         try:
-            # Create ONVIF camera client
-            # Use empty string if no credentials to avoid None issues
-            camera = ONVIFCamera(
-                host=host,
-                port=port,
-                user=username if username else "",
-                passwd=password if password else "",
-            )
-
-            # Get device management service
-            device_service = camera.create_devicemgmt_service()
+            # Get (possibly cached) ONVIF camera client and device management service
+            client = self._get_onvif_client(host, port, username, password)
+            device_service = client.device_service
 
             # Call GetDeviceInformation
             try:
                 device_info_response = device_service.GetDeviceInformation()
             except ZeepFault as e:
                 # Check if authentication is required
-                fault_str = str(e).lower()
-                if "sender not authorized" in fault_str or "authentication" in fault_str:
+                if _is_auth_fault(e):
                     return DeviceDetailsResult(
                         status="auth_required",
                         error="Authentication required for device information"
@@ -582,14 +1242,30 @@ class ONVIFDiscoveryService:
             primary_rtsp_url = ""
 
             try:
-                media_service = camera.create_media_service()
-                media_profiles = media_service.GetProfiles()
+                if client.media_service is None:
+                    client.media_service = client.camera.create_media_service()
+                media_service = client.media_service
+                media_profiles = [
+                    profile for profile in media_service.GetProfiles()
+                    if getattr(profile, "token", None)
+                    and getattr(profile, "VideoEncoderConfiguration", None)
+                ]
+
+                # GetStreamUri is one SOAP round trip per profile; issue them
+                # concurrently instead of one after another.
+                def fetch_uri(profile) -> str:
+                    return self._fetch_stream_uri(media_service, profile.token, host)
+
+                if len(media_profiles) > 1:
+                    stream_uris = list(
+                        self._stream_uri_executor.map(fetch_uri, media_profiles)
+                    )
+                else:
+                    stream_uris = [fetch_uri(profile) for profile in media_profiles]
 
-                for profile in media_profiles:
+                for profile, rtsp_url in zip(media_profiles, stream_uris):
                     try:
-                        profile_info = self._extract_profile_info(
-                            profile, media_service, host
-                        )
+                        profile_info = self._extract_profile_info(profile, rtsp_url)
                         if profile_info:
                             profiles.append(profile_info)
                     except Exception as profile_err:
@@ -606,8 +1282,7 @@ class ONVIFDiscoveryService:
                     primary_rtsp_url = profiles[0].rtsp_url
 
             except ZeepFault as e:
-                fault_str = str(e).lower()
-                if "sender not authorized" in fault_str or "authentication" in fault_str:
+                if _is_auth_fault(e):
                     # Partial success - have device info but need auth for streams
                     logger.info(
                         f"Device info retrieved but streams require auth: {host}"
@@ -640,8 +1315,8 @@ class ONVIFDiscoveryService:
             )
 
         except ZeepFault as e:
-            fault_str = str(e).lower()
-            if "sender not authorized" in fault_str or "authentication" in fault_str:
+            self._evict_onvif_client(host, port, username, password)
+            if _is_auth_fault(e):
                 return DeviceDetailsResult(
                     status="auth_required",
                     error="Authentication required to access this device"
@@ -651,24 +1326,51 @@ class ONVIFDiscoveryService:
                 error=f"ONVIF SOAP fault: {str(e)}"
             )
         except Exception as e:
+            self._evict_onvif_client(host, port, username, password)
             return DeviceDetailsResult(
                 status="error",
                 error=f"Failed to query device: {str(e)}"
             )
 
+    def _fetch_stream_uri(self, media_service, token: str, host: str) -> str:
+        """
+        Get the RTSP stream URI for a profile.
+
+        Args:
+            media_service: Media service client for GetStreamUri
+            token: Profile token
+            host: Device host for the fallback URL
+
+        Returns:
+            Stream URI, or a default URL if the device doesn't return one
+        """
+        stream_setup = {
+            'Stream': 'RTP-Unicast',
+            'Transport': {'Protocol': 'RTSP'}
+        }
+
+        try:
+            uri_response = media_service.GetStreamUri({
+                'ProfileToken': token,
+                'StreamSetup': stream_setup
+            })
+            return getattr(uri_response, "Uri", "")
+        except Exception as uri_err:
+            logger.debug(f"Failed to get stream URI for profile {token}: {uri_err}")
+            # Construct a default URL
+            return f"rtsp://{host}:554/stream"
+
     def _extract_profile_info(
         self,
         profile,
-        media_service,
-        host: str
+        rtsp_url: str
     ) -> Optional[StreamProfile]:
         """
         Extract stream profile information from an ONVIF profile.
 
         Args:
             profile: ONVIF media profile object
-            media_service: Media service client for GetStreamUri
-            host: Device host for URL construction
+            rtsp_url: Stream URI fetched for this profile
 
         Returns:
             StreamProfile or None if extraction fails
@@ -685,31 +1387,19 @@ class ONVIFDiscoveryService:
             if not video_encoder:
                 return None
 
-            resolution = getattr(video_encoder, "Resolution", None)
-            width = getattr(resolution, "Width", 0) if resolution else 0
-            height = getattr(resolution, "Height", 0) if resolution else 0
-
-            rate_control = getattr(video_encoder, "RateControl", None)
-            fps = getattr(rate_control, "FrameRateLimit", 30) if rate_control else 30
-
-            encoding = getattr(video_encoder, "Encoding", None)
+            try:
+                width, height, fps, encoding = _ENCODER_FIELDS(video_encoder)
+            except AttributeError:
+                # Optional elements missing (zeep returns None for them);
+                # fall back to per-field defaults
+                resolution = getattr(video_encoder, "Resolution", None)
+                width = getattr(resolution, "Width", 0) if resolution else 0
+                height = getattr(resolution, "Height", 0) if resolution else 0
 
-            # Get stream URI
-            stream_setup = {
-                'Stream': 'RTP-Unicast',
-                'Transport': {'Protocol': 'RTSP'}
-            }
+                rate_control = getattr(video_encoder, "RateControl", None)
+                fps = getattr(rate_control, "FrameRateLimit", 30) if rate_control else 30
 
-            try:
-                uri_response = media_service.GetStreamUri({
-                    'ProfileToken': token,
-                    'StreamSetup': stream_setup
-                })
-                rtsp_url = getattr(uri_response, "Uri", "")
-            except Exception as uri_err:
-                logger.debug(f"Failed to get stream URI for profile {token}: {uri_err}")
-                # Construct a default URL
-                rtsp_url = f"rtsp://{host}:554/stream"
+                encoding = getattr(video_encoder, "Encoding", None)
 
             return StreamProfile(
                 name=name,
@@ -759,7 +1449,7 @@ class ONVIFDiscoveryService:
             >>> if result.success:
             ...     print(f"Connected: {result.resolution} @ {result.fps}fps")
         """
-        start_time = time.time()
+        start_time = time.monotonic()
 
         # Build authenticated URL if credentials provided
         test_url = self._build_authenticated_url(rtsp_url, username, password)
@@ -779,7 +1469,7 @@ class ONVIFDiscoveryService:
                 timeout=TEST_CONNECTION_TIMEOUT
             )
 
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.monotonic() - start_time) * 1000)
 
             if result["success"]:
                 logger.info(
@@ -804,7 +1494,7 @@ class ONVIFDiscoveryService:
                 )
 
         except asyncio.TimeoutError:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.monotonic() - start_time) * 1000)
             error_msg = "Connection timed out after 5 seconds"
             logger.warning(f"Connection test timed out: {sanitized_url}")
             return TestConnectionResponse(
@@ -814,7 +1504,7 @@ class ONVIFDiscoveryService:
             )
 
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.monotonic() - start_time) * 1000)
             error_msg = self._map_error_message(str(e))
             logger.error(f"Connection test error: {sanitized_url} - {e}", exc_info=True)
             return TestConnectionResponse(
@@ -1062,3 +1752,11 @@ def get_onvif_discovery_service() -> ONVIFDiscoveryService:
     if _discovery_service is None:
         _discovery_service = ONVIFDiscoveryService()
     return _discovery_service
+
+
+def shutdown_onvif_discovery_service() -> None:
+    """Shut down the singleton discovery service, if it was created."""
+    global _discovery_service
+    if _discovery_service is not None:
+        _discovery_service.shutdown()
+        _discovery_service = None
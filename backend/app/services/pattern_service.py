@@ -22,21 +22,68 @@ Flow:
 """
 import json
 import logging
+import math
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-import statistics
 
-from sqlalchemy import func
+from sqlalchemy import and_, bindparam, func, or_, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.models.camera_activity_pattern import CameraActivityPattern
 from app.models.event import Event
 from app.models.camera import Camera
 
+# orjson (installed with uiprotect) parses the small per-event JSON arrays
+# several times faster; output is only written with json.dumps so stored
+# values keep their existing format
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Distribution keys: zero-padded hours ("00"-"23") and weekday() numbers
+# ("0"=Monday). Indexed by hour/weekday instead of formatting per event.
+_HOUR_KEYS = tuple(f"{h:02d}" for h in range(24))
+_DAY_KEYS = tuple(str(d) for d in range(7))
+
+
+# Object type counts expanded from the objects_detected JSON arrays in the
+# database, per dialect. Only non-empty string elements of well-formed
+# arrays are counted, matching _calculate_object_type_distribution().
+_OBJECT_TYPES_SQL = {
+    "sqlite": """
+        SELECT events.camera_id, obj.value, COUNT(*)
+        FROM events, json_each(
+            CASE WHEN json_valid(events.objects_detected) THEN
+                CASE WHEN json_type(events.objects_detected) = 'array'
+                    THEN events.objects_detected ELSE '[]' END
+            ELSE '[]' END
+        ) AS obj
+        WHERE events.camera_id IN :camera_ids
+            AND events.timestamp >= :cutoff
+            AND obj.type = 'text' AND obj.value != ''
+        GROUP BY events.camera_id, obj.value
+    """,
+    "postgresql": """
+        SELECT events.camera_id, obj #>> '{}', COUNT(*)
+        FROM events CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(CAST(events.objects_detected AS jsonb)) = 'array'
+                THEN CAST(events.objects_detected AS jsonb) ELSE CAST('[]' AS jsonb) END
+        ) AS obj
+        WHERE events.camera_id IN :camera_ids
+            AND events.timestamp >= :cutoff
+            AND jsonb_typeof(obj) = 'string' AND obj #>> '{}' <> ''
+        GROUP BY 1, 2
+    """,
+}
+
 
 @dataclass
 class PatternData:
@@ -73,14 +120,21 @@ class PatternService:
         MIN_EVENTS_FOR_PATTERNS: Minimum events required for meaningful patterns (10)
         MIN_DAYS_FOR_PATTERNS: Minimum days of history for meaningful patterns (7)
         DEFAULT_WINDOW_DAYS: Default time window for pattern calculation (30 days)
+        CACHE_TTL_SECONDS: How long get_patterns() results are reused (60s)
     """
 
     MIN_EVENTS_FOR_PATTERNS = 10
     MIN_DAYS_FOR_PATTERNS = 7
     DEFAULT_WINDOW_DAYS = 30
+    CACHE_TTL_SECONDS = 60
 
     def __init__(self):
         """Initialize PatternService."""
+        # camera_id -> (time.monotonic() when cached, parsed patterns or None).
+        # Recalculation invalidates an entry and incremental updates replace
+        # it, so per-event lookups skip the DB.
+        self._cache: dict[str, tuple[float, Optional[PatternData]]] = {}
+        self._cache_lock = threading.Lock()
         logger.info(
             "PatternService initialized",
             extra={"event_type": "pattern_service_init"}
@@ -94,7 +148,8 @@ class PatternService:
 
         Retrieves pre-calculated patterns from the database. Returns None if
         no patterns exist (camera has insufficient history or patterns haven't
-        been calculated yet).
+        been calculated yet). Results are cached per camera for
+        CACHE_TTL_SECONDS; callers must not modify the returned object.
 
         Args:
             db: SQLAlchemy database session
@@ -103,6 +158,10 @@ class PatternService:
         Returns:
             PatternData with activity patterns, or None if no patterns exist
         """
+        cached = self._cache.get(camera_id)
+        if cached is not None and time.monotonic() - cached[0] < self.CACHE_TTL_SECONDS:
+            return cached[1]
+
         start_time = time.time()
 
         pattern = db.query(CameraActivityPattern).filter_by(
@@ -119,6 +178,7 @@ class PatternService:
                     "lookup_time_ms": round(lookup_time_ms, 2)
                 }
             )
+            self._cache_patterns(camera_id, None)
             return None
 
         logger.debug(
@@ -130,28 +190,68 @@ class PatternService:
             }
         )
 
-        # Parse object type distribution and compute dominant type
-        object_type_dist = None
+        data = self._to_pattern_data(
+            camera_id,
+            pattern,
+            hourly=_json_loads(pattern.hourly_distribution),
+            daily=_json_loads(pattern.daily_distribution),
+            peak=_json_loads(pattern.peak_hours),
+            quiet=_json_loads(pattern.quiet_hours),
+            object_types=(
+                _json_loads(pattern.object_type_distribution)
+                if pattern.object_type_distribution else None
+            ),
+        )
+        self._cache_patterns(camera_id, data)
+        return data
+
+    @staticmethod
+    def _to_pattern_data(
+        camera_id: str,
+        pattern: CameraActivityPattern,
+        hourly: dict[str, int],
+        daily: dict[str, int],
+        peak: list[str],
+        quiet: list[str],
+        object_types: Optional[dict[str, int]],
+    ) -> PatternData:
+        """Build PatternData from a pattern record and its parsed distributions."""
         dominant_type = None
-        if pattern.object_type_distribution:
-            object_type_dist = json.loads(pattern.object_type_distribution)
-            if object_type_dist:
-                dominant_type = max(object_type_dist, key=object_type_dist.get)
+        if object_types:
+            dominant_type = max(object_types, key=object_types.get)
 
         return PatternData(
             camera_id=camera_id,
-            hourly_distribution=json.loads(pattern.hourly_distribution),
-            daily_distribution=json.loads(pattern.daily_distribution),
-            peak_hours=json.loads(pattern.peak_hours),
-            quiet_hours=json.loads(pattern.quiet_hours),
+            hourly_distribution=hourly,
+            daily_distribution=daily,
+            peak_hours=peak,
+            quiet_hours=quiet,
             average_events_per_day=pattern.average_events_per_day,
             last_calculated_at=pattern.last_calculated_at,
             calculation_window_days=pattern.calculation_window_days,
             insufficient_data=False,
-            object_type_distribution=object_type_dist,
+            object_type_distribution=object_types,
             dominant_object_type=dominant_type,
         )
 
+    def _cache_patterns(self, camera_id: str, data: Optional[PatternData]) -> None:
+        """Store get_patterns() result for a camera."""
+        with self._cache_lock:
+            self._cache[camera_id] = (time.monotonic(), data)
+
+    def invalidate_cache(self, camera_id: Optional[str] = None) -> None:
+        """
+        Drop cached patterns so the next get_patterns() reads the database.
+
+        Args:
+            camera_id: Camera to invalidate, or None to clear all cameras
+        """
+        with self._cache_lock:
+            if camera_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(camera_id, None)
+
     async def is_typical_timing(
         self, db: Session, camera_id: str, timestamp: datetime
     ) -> TimingAnalysisResult:
@@ -179,8 +279,8 @@ class PatternService:
             )
 
         # Get current hour (zero-padded string) and day of week
-        hour = str(timestamp.hour).zfill(2)
-        day_of_week = str(timestamp.weekday())  # 0=Monday
+        hour = _HOUR_KEYS[timestamp.hour]
+        day_of_week = _DAY_KEYS[timestamp.weekday()]  # 0=Monday
 
         # Check if current hour is in quiet hours (highest priority - unusual)
         if hour in pattern.quiet_hours:
@@ -258,107 +358,29 @@ class PatternService:
         ).first()
 
         if existing_pattern and not force:
-            time_since_calc = datetime.now(timezone.utc) - existing_pattern.last_calculated_at.replace(tzinfo=timezone.utc)
-            if time_since_calc < timedelta(hours=1):
+            if self._recently_calculated(existing_pattern):
+                return existing_pattern
+            if not self._window_changed(db, existing_pattern, window_days):
                 logger.debug(
-                    f"Skipping pattern recalculation for camera {camera_id} - recently calculated",
-                    extra={
-                        "camera_id": camera_id,
-                        "last_calculated": existing_pattern.last_calculated_at.isoformat(),
-                        "minutes_ago": round(time_since_calc.total_seconds() / 60, 1)
-                    }
+                    f"Skipping pattern recalculation for camera {camera_id} - no events added or expired",
+                    extra={"camera_id": camera_id}
                 )
                 return existing_pattern
 
-        # Query events within time window
-        cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
-        events = db.query(Event).filter(
-            Event.camera_id == camera_id,
-            Event.timestamp >= cutoff
-        ).all()
-
-        # Check minimum thresholds
-        if len(events) < self.MIN_EVENTS_FOR_PATTERNS:
-            logger.info(
-                f"Insufficient events for pattern calculation: {len(events)} events for camera {camera_id}",
-                extra={
-                    "camera_id": camera_id,
-                    "event_count": len(events),
-                    "min_required": self.MIN_EVENTS_FOR_PATTERNS
-                }
-            )
+        existing = {camera_id: existing_pattern} if existing_pattern else {}
+        pattern = self._calculate_patterns(db, [camera_id], existing, window_days).get(camera_id)
+        if pattern is None:
             return None
 
-        # Check if we have enough days of history
-        if events:
-            first_event = min(events, key=lambda e: e.timestamp)
-            days_of_history = (datetime.now(timezone.utc) - first_event.timestamp.replace(tzinfo=timezone.utc)).days
-            if days_of_history < self.MIN_DAYS_FOR_PATTERNS:
-                logger.info(
-                    f"Insufficient history for pattern calculation: {days_of_history} days for camera {camera_id}",
-                    extra={
-                        "camera_id": camera_id,
-                        "days_of_history": days_of_history,
-                        "min_required": self.MIN_DAYS_FOR_PATTERNS
-                    }
-                )
-                return None
-
-        # Calculate distributions
-        hourly = self._calculate_hourly_distribution(events)
-        daily = self._calculate_daily_distribution(events)
-        peak = self._calculate_peak_hours(hourly)
-        quiet = self._calculate_quiet_hours(hourly)
-        object_types = self._calculate_object_type_distribution(events)
-        avg_per_day = len(events) / window_days
-
-        # Upsert pattern record
-        now = datetime.now(timezone.utc)
-
-        if existing_pattern:
-            existing_pattern.hourly_distribution = json.dumps(hourly)
-            existing_pattern.daily_distribution = json.dumps(daily)
-            existing_pattern.peak_hours = json.dumps(peak)
-            existing_pattern.quiet_hours = json.dumps(quiet)
-            existing_pattern.object_type_distribution = json.dumps(object_types) if object_types else None
-            existing_pattern.average_events_per_day = avg_per_day
-            existing_pattern.calculation_window_days = window_days
-            existing_pattern.last_calculated_at = now
-            existing_pattern.updated_at = now
-            pattern = existing_pattern
-        else:
-            pattern = CameraActivityPattern(
-                camera_id=camera_id,
-                hourly_distribution=json.dumps(hourly),
-                daily_distribution=json.dumps(daily),
-                peak_hours=json.dumps(peak),
-                quiet_hours=json.dumps(quiet),
-                object_type_distribution=json.dumps(object_types) if object_types else None,
-                average_events_per_day=avg_per_day,
-                calculation_window_days=window_days,
-                last_calculated_at=now,
-                created_at=now,
-                updated_at=now,
-            )
-            db.add(pattern)
-
         db.commit()
         db.refresh(pattern)
+        self.invalidate_cache(camera_id)
 
         calc_time_ms = (time.time() - start_time) * 1000
 
-        logger.info(
-            f"Pattern calculation complete for camera {camera_id}",
-            extra={
-                "event_type": "pattern_calculation_complete",
-                "camera_id": camera_id,
-                "event_count": len(events),
-                "window_days": window_days,
-                "avg_events_per_day": round(avg_per_day, 2),
-                "peak_hours_count": len(peak),
-                "quiet_hours_count": len(quiet),
-                "calc_time_ms": round(calc_time_ms, 2),
-            }
+        logger.debug(
+            f"Pattern recalculation for camera {camera_id} took {calc_time_ms:.2f}ms",
+            extra={"camera_id": camera_id, "calc_time_ms": round(calc_time_ms, 2)}
         )
 
         return pattern
@@ -372,6 +394,8 @@ class PatternService:
         Recalculate patterns for all cameras.
 
         Useful for batch updates scheduled by the pattern recalculation job.
+        All due cameras are aggregated together (a fixed number of grouped
+        queries rather than several per camera) and committed once.
 
         Args:
             db: SQLAlchemy database session
@@ -387,30 +411,41 @@ class PatternService:
         start_time = time.time()
 
         # Get all cameras
-        cameras = db.query(Camera).filter(Camera.is_enabled == True).all()
+        camera_ids = [
+            camera_id for (camera_id,) in
+            db.query(Camera.id).filter(Camera.is_enabled == True).all()
+        ]
+        existing = {
+            pattern.camera_id: pattern
+            for pattern in db.query(CameraActivityPattern).filter(
+                CameraActivityPattern.camera_id.in_(camera_ids)
+            ).all()
+        } if camera_ids else {}
+
+        # Respect rate limiting: recently calculated patterns count as done
+        due = [
+            camera_id for camera_id in camera_ids
+            if camera_id not in existing or not self._recently_calculated(existing[camera_id])
+        ]
 
-        total_cameras = len(cameras)
-        patterns_calculated = 0
-        patterns_skipped = 0
+        total_cameras = len(camera_ids)
+        patterns_calculated = total_cameras - len(due)
 
-        for camera in cameras:
+        if due:
             try:
-                pattern = await self.recalculate_patterns(
-                    db=db,
-                    camera_id=camera.id,
-                    window_days=window_days,
-                    force=False  # Respect rate limiting
-                )
-                if pattern:
-                    patterns_calculated += 1
-                else:
-                    patterns_skipped += 1
+                patterns = self._calculate_patterns(db, due, existing, window_days)
+                db.commit()
+                patterns_calculated += len(patterns)
+                for camera_id in patterns:
+                    self.invalidate_cache(camera_id)
             except Exception as e:
                 logger.error(
-                    f"Failed to calculate patterns for camera {camera.id}: {e}",
-                    extra={"camera_id": camera.id, "error": str(e)}
+                    f"Failed to calculate patterns for {len(due)} cameras: {e}",
+                    extra={"camera_ids": due, "error": str(e)}
                 )
-                patterns_skipped += 1
+                db.rollback()
+
+        patterns_skipped = total_cameras - patterns_calculated
 
         elapsed_ms = (time.time() - start_time) * 1000
 
@@ -432,6 +467,195 @@ class PatternService:
             "elapsed_ms": round(elapsed_ms, 2),
         }
 
+    def _recently_calculated(self, pattern: CameraActivityPattern) -> bool:
+        """Whether a pattern was calculated within the last hour."""
+        time_since_calc = datetime.now(timezone.utc) - pattern.last_calculated_at.replace(tzinfo=timezone.utc)
+        if time_since_calc >= timedelta(hours=1):
+            return False
+
+        logger.debug(
+            f"Skipping pattern recalculation for camera {pattern.camera_id} - recently calculated",
+            extra={
+                "camera_id": pattern.camera_id,
+                "last_calculated": pattern.last_calculated_at.isoformat(),
+                "minutes_ago": round(time_since_calc.total_seconds() / 60, 1)
+            }
+        )
+        return True
+
+    def _window_changed(
+        self, db: Session, pattern: CameraActivityPattern, window_days: int
+    ) -> bool:
+        """
+        Whether a recalculation could produce a different pattern.
+
+        Checks with a single indexed lookup for events stored since the last
+        calculation, or that have since aged out of the window.
+        """
+        if pattern.calculation_window_days != window_days:
+            return True
+
+        last_calculated = pattern.last_calculated_at.replace(tzinfo=timezone.utc)
+        window = timedelta(days=window_days)
+        changed = db.query(Event.id).filter(
+            Event.camera_id == pattern.camera_id,
+            or_(
+                Event.created_at > last_calculated,
+                and_(
+                    Event.timestamp >= last_calculated - window,
+                    Event.timestamp < datetime.now(timezone.utc) - window
+                )
+            )
+        ).first()
+        return changed is not None
+
+    def _has_sufficient_history(
+        self, camera_id: str, event_count: int, first_timestamp: Optional[datetime]
+    ) -> bool:
+        """Check a camera's event count and history length against the minimums."""
+        if event_count < self.MIN_EVENTS_FOR_PATTERNS:
+            logger.info(
+                f"Insufficient events for pattern calculation: {event_count} events for camera {camera_id}",
+                extra={
+                    "camera_id": camera_id,
+                    "event_count": event_count,
+                    "min_required": self.MIN_EVENTS_FOR_PATTERNS
+                }
+            )
+            return False
+
+        if first_timestamp:
+            days_of_history = (datetime.now(timezone.utc) - first_timestamp.replace(tzinfo=timezone.utc)).days
+            if days_of_history < self.MIN_DAYS_FOR_PATTERNS:
+                logger.info(
+                    f"Insufficient history for pattern calculation: {days_of_history} days for camera {camera_id}",
+                    extra={
+                        "camera_id": camera_id,
+                        "days_of_history": days_of_history,
+                        "min_required": self.MIN_DAYS_FOR_PATTERNS
+                    }
+                )
+                return False
+
+        return True
+
+    def _calculate_patterns(
+        self,
+        db: Session,
+        camera_ids: list[str],
+        existing: dict[str, CameraActivityPattern],
+        window_days: int
+    ) -> dict[str, CameraActivityPattern]:
+        """
+        Calculate and stage (without committing) patterns for cameras.
+
+        Aggregates are computed in the database for all cameras at once, so
+        the number of queries doesn't grow with the number of cameras.
+
+        Args:
+            db: SQLAlchemy database session
+            camera_ids: Cameras to calculate patterns for
+            existing: Current pattern records by camera ID, updated in place
+            window_days: Number of days to analyze
+
+        Returns:
+            Updated or newly added patterns by camera ID; cameras with
+            insufficient data are omitted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+
+        # Count events within time window (aggregated in the database)
+        stats = {
+            camera_id: (event_count, first_timestamp)
+            for camera_id, event_count, first_timestamp in db.query(
+                Event.camera_id,
+                func.count(Event.id),
+                func.min(Event.timestamp)
+            ).filter(
+                Event.camera_id.in_(camera_ids),
+                Event.timestamp >= cutoff
+            ).group_by(Event.camera_id).all()
+        }
+
+        # Check minimum thresholds
+        eligible = [
+            camera_id for camera_id in camera_ids
+            if self._has_sufficient_history(camera_id, *stats.get(camera_id, (0, None)))
+        ]
+        if not eligible:
+            return {}
+
+        # Calculate distributions
+        window_filter = (
+            Event.camera_id.in_(eligible),
+            Event.timestamp >= cutoff
+        )
+        distributions = self._calculate_distributions_sql(db, window_filter)
+        object_types_by_camera = self._calculate_object_types_sql(db, eligible, cutoff)
+        if object_types_by_camera is None:
+            objects_by_camera: dict[str, list] = {}
+            for row in db.query(Event.camera_id, Event.objects_detected).filter(*window_filter).all():
+                objects_by_camera.setdefault(row.camera_id, []).append(row)
+            object_types_by_camera = {
+                camera_id: self._calculate_object_type_distribution(rows)
+                for camera_id, rows in objects_by_camera.items()
+            }
+
+        # Upsert pattern records
+        now = datetime.now(timezone.utc)
+        patterns = {}
+
+        for camera_id in eligible:
+            event_count = stats[camera_id][0]
+            hourly, daily = distributions[camera_id]
+            peak = self._calculate_peak_hours(hourly)
+            quiet = self._calculate_quiet_hours(hourly)
+            object_types = object_types_by_camera.get(camera_id)
+            avg_per_day = event_count / window_days
+
+            pattern = existing.get(camera_id)
+            if pattern:
+                pattern.hourly_distribution = json.dumps(hourly)
+                pattern.daily_distribution = json.dumps(daily)
+                pattern.peak_hours = json.dumps(peak)
+                pattern.quiet_hours = json.dumps(quiet)
+                pattern.object_type_distribution = json.dumps(object_types) if object_types else None
+                pattern.average_events_per_day = avg_per_day
+                pattern.calculation_window_days = window_days
+                pattern.last_calculated_at = now
+                pattern.updated_at = now
+            else:
+                pattern = CameraActivityPattern(
+                    camera_id=camera_id,
+                    hourly_distribution=json.dumps(hourly),
+                    daily_distribution=json.dumps(daily),
+                    peak_hours=json.dumps(peak),
+                    quiet_hours=json.dumps(quiet),
+                    object_type_distribution=json.dumps(object_types) if object_types else None,
+                    average_events_per_day=avg_per_day,
+                    calculation_window_days=window_days,
+                    last_calculated_at=now,
+                    created_at=now,
+                    updated_at=now,
+                )
+                db.add(pattern)
+            patterns[camera_id] = pattern
+
+            logger.info(
+                f"Pattern calculation complete for camera {camera_id}",
+                extra={
+                    "event_type": "pattern_calculation_complete",
+                    "camera_id": camera_id,
+                    "event_count": event_count,
+                    "window_days": window_days,
+                    "avg_events_per_day": round(avg_per_day, 2),
+                    "peak_hours_count": len(peak),
+                    "quiet_hours_count": len(quiet),
+                }
+            )
+
+        return patterns
+
     def _calculate_hourly_distribution(self, events: list[Event]) -> dict[str, int]:
         """
         Calculate events per hour (0-23) across all days.
@@ -442,11 +666,10 @@ class PatternService:
         Returns:
             Dictionary mapping hour (zero-padded string) to event count
         """
-        hourly = {str(h).zfill(2): 0 for h in range(24)}
+        hourly = dict.fromkeys(_HOUR_KEYS, 0)
 
         for event in events:
-            hour = str(event.timestamp.hour).zfill(2)
-            hourly[hour] = hourly.get(hour, 0) + 1
+            hourly[_HOUR_KEYS[event.timestamp.hour]] += 1
 
         return hourly
 
@@ -460,14 +683,57 @@ class PatternService:
         Returns:
             Dictionary mapping day-of-week (string) to event count
         """
-        daily = {str(d): 0 for d in range(7)}
+        daily = dict.fromkeys(_DAY_KEYS, 0)
 
         for event in events:
-            day = str(event.timestamp.weekday())
-            daily[day] = daily.get(day, 0) + 1
+            daily[_DAY_KEYS[event.timestamp.weekday()]] += 1
 
         return daily
 
+    def _calculate_distributions_sql(
+        self, db: Session, window_filter: tuple
+    ) -> dict[str, tuple[dict[str, int], dict[str, int]]]:
+        """
+        Calculate hourly and daily distributions with GROUP BY queries.
+
+        Equivalent to _calculate_hourly_distribution and
+        _calculate_daily_distribution per camera, but returns at most
+        24 + 7 rows per camera from the database instead of loading every
+        event in the window.
+
+        Args:
+            db: SQLAlchemy database session
+            window_filter: Filter criteria selecting the events to analyze
+
+        Returns:
+            Dictionary mapping camera ID to (hourly, daily) distributions,
+            keyed as in the Python versions
+        """
+        hour_col = func.extract('hour', Event.timestamp)
+        dow_col = func.extract('dow', Event.timestamp)
+        distributions: dict[str, tuple[dict[str, int], dict[str, int]]] = {}
+
+        def camera_distributions(camera_id: str) -> tuple[dict[str, int], dict[str, int]]:
+            if camera_id not in distributions:
+                distributions[camera_id] = (
+                    dict.fromkeys(_HOUR_KEYS, 0),
+                    dict.fromkeys(_DAY_KEYS, 0),
+                )
+            return distributions[camera_id]
+
+        for camera_id, hour, count in db.query(
+            Event.camera_id, hour_col, func.count(Event.id)
+        ).filter(*window_filter).group_by(Event.camera_id, hour_col).all():
+            camera_distributions(camera_id)[0][_HOUR_KEYS[int(hour)]] = count
+
+        # SQL day-of-week is 0=Sunday; convert to weekday() numbering (0=Monday)
+        for camera_id, dow, count in db.query(
+            Event.camera_id, dow_col, func.count(Event.id)
+        ).filter(*window_filter).group_by(Event.camera_id, dow_col).all():
+            camera_distributions(camera_id)[1][_DAY_KEYS[(int(dow) + 6) % 7]] = count
+
+        return distributions
+
     def _calculate_peak_hours(self, hourly_distribution: dict[str, int]) -> list[str]:
         """
         Identify peak activity hours (above mean + 0.5 * std_dev).
@@ -480,19 +746,16 @@ class PatternService:
         """
         counts = list(hourly_distribution.values())
 
-        if not counts or sum(counts) == 0:
+        # Needs at least two values for a sample std dev; all-equal
+        # (including all-zero) counts have no peaks
+        if len(counts) < 2 or min(counts) == max(counts):
             return []
 
-        mean = statistics.mean(counts)
-
-        # Handle edge case where all values are the same
-        if len(set(counts)) == 1:
-            return []
-
-        try:
-            std_dev = statistics.stdev(counts)
-        except statistics.StatisticsError:
-            return []
+        # Plain float arithmetic: runs on every incremental baseline update,
+        # where statistics' exact mean/stdev is several times slower
+        n = len(counts)
+        mean = sum(counts) / n
+        std_dev = math.sqrt(sum((c - mean) ** 2 for c in counts) / (n - 1))
 
         threshold = mean + (0.5 * std_dev)
 
@@ -513,13 +776,12 @@ class PatternService:
         Returns:
             List of quiet hours (zero-padded strings, e.g., ["02", "03", "04"])
         """
-        counts = list(hourly_distribution.values())
+        max_count = max(hourly_distribution.values(), default=0)
 
-        if not counts or max(counts) == 0:
+        if max_count == 0:
             # If no events, all hours are quiet
-            return [str(h).zfill(2) for h in range(24)]
+            return list(_HOUR_KEYS)
 
-        max_count = max(counts)
         threshold = max_count * 0.1
 
         quiet_hours = [
@@ -544,7 +806,7 @@ class PatternService:
         for event in events:
             if event.objects_detected:
                 try:
-                    objects = json.loads(event.objects_detected)
+                    objects = _json_loads(event.objects_detected)
                     if isinstance(objects, list):
                         for obj_type in objects:
                             if obj_type and isinstance(obj_type, str):
@@ -555,6 +817,53 @@ class PatternService:
 
         return object_types
 
+    def _calculate_object_types_sql(
+        self, db: Session, camera_ids: list[str], cutoff: datetime
+    ) -> Optional[dict[str, dict[str, int]]]:
+        """
+        Calculate object type frequencies by expanding JSON arrays in SQL.
+
+        Avoids transferring every objects_detected payload and parsing it
+        in Python.
+
+        Args:
+            db: SQLAlchemy database session
+            camera_ids: Cameras to analyze
+            cutoff: Start of the analysis window
+
+        Returns:
+            Dictionary mapping camera ID to its object type counts (cameras
+            without objects are omitted), or None if the database can't
+            compute it (unsupported dialect or unparseable JSON), in which
+            case the caller should use _calculate_object_type_distribution
+        """
+        sql = _OBJECT_TYPES_SQL.get(db.get_bind().dialect.name)
+        if sql is None:
+            return None
+
+        statement = text(sql).bindparams(
+            bindparam("camera_ids", expanding=True),
+            bindparam("cutoff", type_=Event.timestamp.type),
+        )
+        try:
+            # Savepoint so a failed cast (e.g. malformed JSON on PostgreSQL)
+            # doesn't abort the surrounding transaction
+            with db.begin_nested():
+                rows = db.execute(
+                    statement, {"camera_ids": list(camera_ids), "cutoff": cutoff}
+                ).all()
+        except SQLAlchemyError as e:
+            logger.warning(
+                f"SQL object type aggregation failed, using Python fallback: {e}",
+                extra={"camera_ids": list(camera_ids), "error": str(e)}
+            )
+            return None
+
+        object_types: dict[str, dict[str, int]] = {}
+        for camera_id, obj_type, count in rows:
+            object_types.setdefault(camera_id, {})[obj_type] = count
+        return object_types
+
     async def update_baseline_incremental(
         self,
         db: Session,
@@ -594,23 +903,24 @@ class PatternService:
                 return None
 
             # Update hourly distribution
-            hourly = json.loads(pattern.hourly_distribution)
-            hour_key = str(event.timestamp.hour).zfill(2)
+            hourly = _json_loads(pattern.hourly_distribution)
+            hour_key = _HOUR_KEYS[event.timestamp.hour]
             hourly[hour_key] = hourly.get(hour_key, 0) + 1
             pattern.hourly_distribution = json.dumps(hourly)
 
             # Update daily distribution
-            daily = json.loads(pattern.daily_distribution)
-            day_key = str(event.timestamp.weekday())
+            daily = _json_loads(pattern.daily_distribution)
+            day_key = _DAY_KEYS[event.timestamp.weekday()]
             daily[day_key] = daily.get(day_key, 0) + 1
             pattern.daily_distribution = json.dumps(daily)
 
             # Update object type distribution
+            object_types = None
             if event.objects_detected:
                 try:
-                    objects = json.loads(event.objects_detected)
+                    objects = _json_loads(event.objects_detected)
                     if isinstance(objects, list):
-                        object_types = json.loads(pattern.object_type_distribution) if pattern.object_type_distribution else {}
+                        object_types = _json_loads(pattern.object_type_distribution) if pattern.object_type_distribution else {}
                         for obj_type in objects:
                             if obj_type and isinstance(obj_type, str):
                                 object_types[obj_type] = object_types.get(obj_type, 0) + 1
@@ -618,9 +928,16 @@ class PatternService:
                 except (json.JSONDecodeError, TypeError):
                     pass  # Skip invalid JSON
 
-            # Recalculate peak and quiet hours (lightweight calculation)
-            pattern.peak_hours = json.dumps(self._calculate_peak_hours(hourly))
-            pattern.quiet_hours = json.dumps(self._calculate_quiet_hours(hourly))
+            # Recalculate peak and quiet hours (lightweight calculation); they
+            # rarely change per event, so only rewrite the columns when they do
+            peak = self._calculate_peak_hours(hourly)
+            peak_hours = json.dumps(peak)
+            if peak_hours != pattern.peak_hours:
+                pattern.peak_hours = peak_hours
+            quiet = self._calculate_quiet_hours(hourly)
+            quiet_hours = json.dumps(quiet)
+            if quiet_hours != pattern.quiet_hours:
+                pattern.quiet_hours = quiet_hours
 
             # Update average events per day (approximate - based on total count)
             total_events = sum(hourly.values())
@@ -629,8 +946,19 @@ class PatternService:
 
             pattern.updated_at = datetime.now(timezone.utc)
 
+            # Every event lands here, so keep the get_patterns() cache warm
+            # with the values just computed rather than invalidating it.
+            # Built before commit, which expires the pattern's attributes.
+            if object_types is None and pattern.object_type_distribution:
+                object_types = _json_loads(pattern.object_type_distribution)
+            data = self._to_pattern_data(
+                camera_id, pattern, hourly, daily, peak, quiet, object_types
+            )
+
+            # No refresh: the caller doesn't read the pattern back, and a
+            # refresh would cost a second SELECT on every event
             db.commit()
-            db.refresh(pattern)
+            self._cache_patterns(camera_id, data)
 
             update_time_ms = (time.time() - start_time) * 1000
 
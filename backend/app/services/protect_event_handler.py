@@ -162,12 +162,18 @@ class ProtectEventHandler:
         # Story P3-5.3: Track last audio transcription for passing to event storage
         self._last_audio_transcription: Optional[str] = None
 
-    def _try_ocr_extraction(self, frame: np.ndarray, db: Session) -> Optional[Any]:
+    def _try_ocr_extraction(
+        self,
+        frame: np.ndarray,
+        db: Session,
+        camera_id: Optional[str] = None
+    ) -> Optional[Any]:
         """Extract OCR from frame if enabled and available (Story P9-3.2).
 
         Args:
             frame: BGR numpy array from camera frame
             db: Database session for checking settings
+            camera_id: Camera UUID, used to remember where its overlay sits
 
         Returns:
             OCRResult if OCR is enabled, available, and extraction succeeds; None otherwise
@@ -187,7 +193,7 @@ class ProtectEventHandler:
             return None
 
         try:
-            return extract_overlay_text(frame)
+            return extract_overlay_text(frame, camera_id=camera_id)
         except Exception as e:
             logger.warning(f"OCR extraction failed: {e}")
             return None
@@ -461,7 +467,7 @@ class ProtectEventHandler:
                             await self._broadcast_event_created(stored_event, camera)
                             asyncio.create_task(self._process_correlation(stored_event))
                             # Publish to MQTT for Home Assistant (even without AI)
-                            await self._publish_event_to_mqtt(stored_event, camera, None)
+                            await self._publish_event_to_mqtt(stored_event, camera, None, db=db)
                             return True
 
                         return False
@@ -512,7 +518,7 @@ class ProtectEventHandler:
                     asyncio.create_task(self._process_correlation(stored_event))
 
                     # Publish to MQTT for Home Assistant (Bug fix: Protect events weren't publishing to MQTT)
-                    await self._publish_event_to_mqtt(stored_event, camera, ai_result)
+                    await self._publish_event_to_mqtt(stored_event, camera, ai_result, db=db)
 
                     return True
 
@@ -836,7 +842,7 @@ class ProtectEventHandler:
                     if stored_event:
                         await self._broadcast_event_created(stored_event, camera)
                         asyncio.create_task(self._process_correlation(stored_event))
-                        await self._publish_event_to_mqtt(stored_event, camera, None)
+                        await self._publish_event_to_mqtt(stored_event, camera, None, db=db)
                         return True
                     return False
 
@@ -871,7 +877,7 @@ class ProtectEventHandler:
                 # Broadcast and publish event
                 await self._broadcast_event_created(stored_event, camera)
                 asyncio.create_task(self._process_correlation(stored_event))
-                await self._publish_event_to_mqtt(stored_event, camera, ai_result)
+                await self._publish_event_to_mqtt(stored_event, camera, ai_result, db=db)
 
                 return True
 
@@ -2155,7 +2161,7 @@ class ProtectEventHandler:
                         else:
                             first_frame_bgr = first_frame_rgb
                         with get_db_session() as ocr_db:
-                            ocr_result = self._try_ocr_extraction(first_frame_bgr, ocr_db)
+                            ocr_result = self._try_ocr_extraction(first_frame_bgr, ocr_db, str(camera.id))
                     except Exception as ocr_err:
                         logger.warning(f"OCR extraction from first frame failed: {ocr_err}")
 
@@ -2280,7 +2286,7 @@ class ProtectEventHandler:
             # Story P9-3.2: Extract OCR from frame overlay if enabled
             ocr_result = None
             with get_db_session() as db:
-                ocr_result = self._try_ocr_extraction(frame_bgr, db)
+                ocr_result = self._try_ocr_extraction(frame_bgr, db, str(camera.id))
 
             # Story P2-4.1: Use doorbell-specific prompt for ring events (AC4)
             # Story P11-3: Use context-enhanced prompt if available
@@ -3196,7 +3202,8 @@ class ProtectEventHandler:
         self,
         event: Event,
         camera: Camera,
-        ai_result: Optional["AIResult"]
+        ai_result: Optional["AIResult"],
+        db: Optional[Session] = None
     ) -> None:
         """
         Publish Protect event to MQTT for Home Assistant integration.
@@ -3211,10 +3218,13 @@ class ProtectEventHandler:
             event: Stored Event model
             camera: Camera that captured the event
             ai_result: AI result (may be None for failed AI events)
+            db: Session the event was stored with, reused for count queries
         """
         try:
             from app.services.mqtt_service import get_mqtt_service, serialize_event_for_mqtt
-            from app.services.mqtt_status_service import get_camera_event_counts, set_activity_on
+            from app.services.mqtt_status_service import (
+                get_camera_event_counts, publish_camera_counts_update, set_activity_on
+            )
 
             mqtt_service = get_mqtt_service()
 
@@ -3281,8 +3291,8 @@ class ProtectEventHandler:
 
             # 4. Publish updated event counts
             try:
-                counts = await get_camera_event_counts(str(camera.id))
-                await mqtt_service.publish_event_counts(
+                counts = await get_camera_event_counts(str(camera.id), db=db)
+                await publish_camera_counts_update(
                     camera_id=str(camera.id),
                     camera_name=camera.name,
                     events_today=counts["events_today"],
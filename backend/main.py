@@ -704,6 +704,16 @@ async def lifespan(app: FastAPI):
             extra={"event_type": "mqtt_shutdown_error", "error": str(e)}
         )
 
+    # Stop ONVIF discovery worker threads
+    try:
+        from app.services.onvif_discovery_service import shutdown_onvif_discovery_service
+        shutdown_onvif_discovery_service()
+    except Exception as e:
+        logger.error(
+            f"Error stopping ONVIF discovery service: {e}",
+            extra={"event_type": "onvif_discovery_shutdown_error", "error": str(e)}
+        )
+
     # Disconnect Protect controllers (Story P2-1.4, AC5)
     # Must happen before other services shutdown
     try:
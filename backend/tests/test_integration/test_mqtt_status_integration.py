@@ -159,27 +159,24 @@ class TestStatusSensorIntegration:
         from datetime import timedelta
         from app.services.mqtt_status_service import (
             set_activity_on, check_activity_timeouts,
-            _active_cameras, _activity_lock, ACTIVITY_TIMEOUT_MINUTES
+            _active_cameras, ACTIVITY_TIMEOUT_MINUTES
         )
 
         camera_id = "activity-test-camera"
 
         # Clean state
-        async with _activity_lock:
-            _active_cameras.clear()
+        _active_cameras.clear()
 
         # Set activity ON with old timestamp
         old_time = datetime.now(timezone.utc) - timedelta(minutes=ACTIVITY_TIMEOUT_MINUTES + 1)
-        async with _activity_lock:
-            _active_cameras[camera_id] = old_time
+        await set_activity_on(camera_id, old_time)
 
         # Run timeout check with mocked MQTT
         with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt_service):
             await check_activity_timeouts()
 
         # Verify camera was removed from active set
-        async with _activity_lock:
-            assert camera_id not in _active_cameras
+        assert camera_id not in _active_cameras
 
         # Verify OFF state was published
         mock_mqtt_service.publish_activity_state.assert_called_once()
@@ -187,8 +184,7 @@ class TestStatusSensorIntegration:
         assert call_args[1]["state"] == "OFF"
 
         # Clean up
-        async with _activity_lock:
-            _active_cameras.clear()
+        _active_cameras.clear()
 
 
 class TestStatusSensorPayloadValidation:
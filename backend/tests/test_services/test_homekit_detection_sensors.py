@@ -945,3 +945,194 @@ class TestEventProcessorCarrierRouting:
         mock_homekit.trigger_package.assert_called_once_with(
             "test-camera", event_id="event-456", delivery_carrier=None
         )
+
+
+class TestDetectionSensorSetMotion:
+    """Tests for set_motion state-change handling on detection sensors"""
+
+    @pytest.fixture
+    def sensor(self):
+        from app.services import homekit_accessories
+
+        if not homekit_accessories.HAP_AVAILABLE:
+            pytest.skip("HAP-python not installed")
+
+        with patch.object(homekit_accessories, "Accessory"):
+            yield homekit_accessories.CameraVehicleSensor(
+                driver=MagicMock(), camera_id="camera-1", name="Front Door Vehicle"
+            )
+
+    def test_set_motion_updates_characteristic_on_change(self, sensor):
+        """set_motion pushes the new value to HomeKit when state changes"""
+        sensor.set_motion(True)
+
+        assert sensor.motion_detected is True
+        sensor._motion_char.set_value.assert_called_once_with(True)
+
+    def test_set_motion_skips_repeated_value(self, sensor):
+        """Repeated set_motion with the same value does not re-notify HomeKit"""
+        sensor.set_motion(True)
+        sensor.set_motion(True)
+        sensor.set_motion(1)
+
+        sensor._motion_char.set_value.assert_called_once_with(True)
+
+    def test_set_motion_clear_after_trigger(self, sensor):
+        """Clearing after a trigger notifies HomeKit of the cleared state"""
+        sensor.trigger_motion()
+        sensor.clear_motion()
+
+        assert sensor.motion_detected is False
+        assert sensor._motion_char.set_value.call_count == 2
+
+    @pytest.mark.parametrize("class_name", [
+        "CameraVehicleSensor", "CameraAnimalSensor", "CameraPackageSensor",
+    ])
+    def test_repr_uses_concrete_class_name(self, class_name):
+        """Shared base class keeps the concrete sensor name in repr"""
+        from app.services import homekit_accessories
+
+        if not homekit_accessories.HAP_AVAILABLE:
+            pytest.skip("HAP-python not installed")
+
+        with patch.object(homekit_accessories, "Accessory"):
+            sensor = getattr(homekit_accessories, class_name)(
+                driver=MagicMock(), camera_id="camera-1", name="Test"
+            )
+
+        assert repr(sensor).startswith(f"<{class_name}(")
+
+
+class TestDetectionSensorFactories:
+    """Tests for create_vehicle/animal/package_sensor factories"""
+
+    @pytest.mark.parametrize("factory_name,class_name", [
+        ("create_vehicle_sensor", "CameraVehicleSensor"),
+        ("create_animal_sensor", "CameraAnimalSensor"),
+        ("create_package_sensor", "CameraPackageSensor"),
+    ])
+    def test_factory_returns_sensor(self, factory_name, class_name):
+        """Factories build the matching sensor when HAP-python is available"""
+        from app.services import homekit_accessories
+
+        with patch.object(homekit_accessories, "HAP_AVAILABLE", True), \
+                patch.object(homekit_accessories, "Accessory"):
+            sensor = getattr(homekit_accessories, factory_name)(
+                driver=MagicMock(), camera_id="camera-1", camera_name="Test"
+            )
+
+        assert isinstance(sensor, getattr(homekit_accessories, class_name))
+        assert sensor.name == "Test"
+
+    @pytest.mark.parametrize("factory_name", [
+        "create_vehicle_sensor", "create_animal_sensor", "create_package_sensor",
+    ])
+    def test_factory_returns_none_without_hap(self, factory_name):
+        """Factories return None when HAP-python is not installed"""
+        from app.services import homekit_accessories
+
+        with patch.object(homekit_accessories, "HAP_AVAILABLE", False):
+            sensor = getattr(homekit_accessories, factory_name)(
+                driver=MagicMock(), camera_id="camera-1", camera_name="Test"
+            )
+
+        assert sensor is None
+
+    def test_factory_returns_none_on_construction_error(self):
+        """Factories swallow construction errors and return None"""
+        from app.services import homekit_accessories
+
+        with patch.object(homekit_accessories, "HAP_AVAILABLE", True), \
+                patch.object(homekit_accessories, "Accessory", side_effect=RuntimeError("boom")):
+            sensor = homekit_accessories.create_package_sensor(
+                driver=MagicMock(), camera_id="camera-1", camera_name="Test"
+            )
+
+        assert sensor is None
+
+
+class TestDetectionSensorClearDebounce:
+    """Tests for debounced clears on detection sensors"""
+
+    @pytest.fixture
+    def make_sensor(self):
+        from app.services import homekit_accessories
+
+        if not homekit_accessories.HAP_AVAILABLE:
+            pytest.skip("HAP-python not installed")
+
+        with patch.object(homekit_accessories, "Accessory"):
+            def _create(debounce_seconds: float = 0.05):
+                return homekit_accessories.CameraAnimalSensor(
+                    driver=MagicMock(),
+                    camera_id="camera-1",
+                    name="Backyard Animal",
+                    debounce_seconds=debounce_seconds,
+                )
+            yield _create
+
+    @pytest.mark.asyncio
+    async def test_clear_within_window_is_deferred(self, make_sensor):
+        """A clear right after a trigger is applied once the window ends"""
+        sensor = make_sensor()
+
+        sensor.trigger_motion()
+        sensor.clear_motion()
+        assert sensor.motion_detected is True
+
+        await asyncio.sleep(0.1)
+        assert sensor.motion_detected is False
+        assert sensor._motion_char.set_value.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retrigger_cancels_deferred_clear(self, make_sensor):
+        """Flapping trigger/clear/trigger results in a single HomeKit update"""
+        sensor = make_sensor()
+
+        sensor.trigger_motion()
+        sensor.clear_motion()
+        sensor.trigger_motion()
+
+        await asyncio.sleep(0.1)
+        assert sensor.motion_detected is True
+        sensor._motion_char.set_value.assert_called_once_with(True)
+
+    @pytest.mark.asyncio
+    async def test_zero_debounce_clears_immediately(self, make_sensor):
+        """debounce_seconds=0 disables the deferral"""
+        sensor = make_sensor(debounce_seconds=0)
+
+        sensor.trigger_motion()
+        sensor.clear_motion()
+
+        assert sensor.motion_detected is False
+
+
+class TestConfigureAccessoryInfo:
+    """Tests for the shared AccessoryInformation helper"""
+
+    @staticmethod
+    def _configured(manufacturer, camera_id="camera-1"):
+        from app.services.homekit_accessories import _configure_accessory_info
+
+        accessory = MagicMock()
+        info = accessory.get_service.return_value
+        _configure_accessory_info(accessory, manufacturer, "Vehicle Sensor", camera_id)
+        return {c.args[0]: c.kwargs["value"] for c in info.configure_char.call_args_list}
+
+    def test_plain_strings_are_interned(self):
+        """Manufacturer and serial number are shared across a camera's sensors"""
+        import sys
+
+        values = self._configured("".join(["Argus", "AI"]))
+
+        assert values["Manufacturer"] is sys.intern("ArgusAI")
+        assert values["SerialNumber"] is sys.intern("camera-1")
+
+    @pytest.mark.parametrize("manufacturer", [None, type("Name", (str,), {})("Acme")])
+    def test_non_str_manufacturer_is_passed_through(self, manufacturer):
+        """Values sys.intern rejects are configured unchanged instead of raising"""
+        values = self._configured(manufacturer)
+
+        assert values["Manufacturer"] is manufacturer
+        assert values["Model"] == "Vehicle Sensor"
@@ -9,6 +9,7 @@ Tests for:
 - Topic format verification (AC6)
 """
 import asyncio
+import time
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -351,6 +352,19 @@ class TestEventCountCalculations:
             assert isinstance(result["events_today"], int)
             assert isinstance(result["events_this_week"], int)
 
+    @pytest.mark.asyncio
+    async def test_get_camera_event_counts_reuses_given_session(self):
+        """A caller-supplied session is used instead of opening a new one."""
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 3
+
+        with patch('app.services.mqtt_status_service.SessionLocal') as mock_session:
+            from app.services.mqtt_status_service import get_camera_event_counts
+            result = await get_camera_event_counts("test-camera", db=mock_db)
+
+        mock_session.assert_not_called()
+        assert result == {"events_today": 3, "events_this_week": 3}
+
     def test_week_start_calculation(self):
         """Test week start is Monday at 00:00 (AC10)."""
         # Tuesday Dec 10, 2025
@@ -367,6 +381,24 @@ class TestEventCountCalculations:
         assert week_start.hour == 0
         assert week_start.minute == 0
 
+    def test_count_window_bounds(self):
+        """Shared bounds helper matches the day/week reset rules (AC10)."""
+        from app.services.mqtt_status_service import get_count_window_bounds
+
+        # Tuesday Dec 10, 2025
+        today_start, week_start = get_count_window_bounds(
+            datetime(2025, 12, 10, 14, 30, 0, tzinfo=timezone.utc)
+        )
+
+        assert today_start == datetime(2025, 12, 10, tzinfo=timezone.utc)
+        assert week_start == datetime(2025, 12, 8, tzinfo=timezone.utc)
+
+        # Monday is its own week start
+        today_start, week_start = get_count_window_bounds(
+            datetime(2025, 12, 8, 0, 0, 1, tzinfo=timezone.utc)
+        )
+        assert today_start == week_start == datetime(2025, 12, 8, tzinfo=timezone.utc)
+
     def test_day_start_calculation(self):
         """Test day start is midnight (AC10)."""
         test_date = datetime(2025, 12, 10, 14, 30, 0, tzinfo=timezone.utc)
@@ -378,6 +410,204 @@ class TestEventCountCalculations:
         assert today_start.minute == 0
 
 
+class TestPublishAllCameraCounts:
+    """Test aggregated count publishing for all cameras (AC3)."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_cache(self):
+        from app.services.mqtt_status_service import reset_published_cache
+        reset_published_cache()
+        yield
+        reset_published_cache()
+
+    @pytest.fixture
+    def mock_mqtt(self):
+        mqtt = MagicMock()
+        mqtt.is_connected = True
+        mqtt.publish_event_counts = AsyncMock(return_value=True)
+        mqtt.publish_camera_status = AsyncMock(return_value=True)
+        return mqtt
+
+    @pytest.fixture
+    def db_session(self):
+        """In-memory database shared across threads (queries run in to_thread)."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        from app.core.database import Base
+
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        self.session_factory = sessionmaker(bind=engine)
+        session = self.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+            engine.dispose()
+
+    @pytest.fixture
+    def patched(self, db_session, mock_mqtt):
+        """Route the status service at the test database and mocked MQTT."""
+        with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt), \
+                patch('app.services.mqtt_status_service.SessionLocal', self.session_factory):
+            yield
+
+    @staticmethod
+    def _add_cameras(db_session, *camera_ids, **kwargs):
+        from app.models.camera import Camera
+        db_session.add_all([
+            Camera(id=cid, name=cid, type="rtsp", rtsp_url=f"rtsp://{cid}", **kwargs)
+            for cid in camera_ids
+        ])
+        db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_single_query_includes_zero_count_cameras(self, db_session, mock_mqtt, patched):
+        """Counts come from one grouped query and idle cameras still publish."""
+        from app.models.event import Event
+        from app.services.mqtt_status_service import publish_all_camera_counts
+
+        self._add_cameras(db_session, "cam-busy", "cam-idle")
+        self._add_cameras(db_session, "cam-off", is_enabled=False)
+        now = datetime.now(timezone.utc)
+        for ts in (now, now, now - timedelta(days=30)):
+            db_session.add(Event(
+                camera_id="cam-busy", timestamp=ts, description="test",
+                confidence=90, objects_detected='["person"]'
+            ))
+        db_session.commit()
+
+        with patch('app.services.mqtt_status_service.get_camera_event_counts') as mock_counts:
+            updated = await publish_all_camera_counts()
+
+        mock_counts.assert_not_called()
+        assert updated == 2
+        published = {
+            c.kwargs["camera_id"]: (c.kwargs["events_today"], c.kwargs["events_this_week"])
+            for c in mock_mqtt.publish_event_counts.call_args_list
+        }
+        assert published == {"cam-busy": (2, 2), "cam-idle": (0, 0)}
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_does_not_stop_others(self, db_session, mock_mqtt, patched):
+        """One camera's publish failure is logged and the rest still count."""
+        from app.services.mqtt_status_service import publish_all_camera_counts
+
+        self._add_cameras(db_session, "cam-a", "cam-b")
+
+        async def publish(camera_id, **kwargs):
+            if camera_id == "cam-a":
+                raise RuntimeError("broker gone")
+            return True
+
+        mock_mqtt.publish_event_counts.side_effect = publish
+
+        updated = await publish_all_camera_counts()
+
+        assert updated == 1
+        assert mock_mqtt.publish_event_counts.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_counts_are_skipped(self, db_session, mock_mqtt, patched):
+        """A second pass with identical counts publishes nothing unless forced."""
+        from app.services.mqtt_status_service import publish_all_camera_counts
+
+        self._add_cameras(db_session, "cam-a")
+
+        assert await publish_all_camera_counts() == 1
+        assert await publish_all_camera_counts() == 0
+        assert await publish_all_camera_counts(force=True) == 1
+        assert mock_mqtt.publish_event_counts.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_is_retried(self, db_session, mock_mqtt, patched):
+        """Counts that failed to publish are not cached."""
+        from app.services.mqtt_status_service import publish_all_camera_counts
+
+        self._add_cameras(db_session, "cam-a")
+        mock_mqtt.publish_event_counts.return_value = False
+
+        assert await publish_all_camera_counts() == 0
+
+        mock_mqtt.publish_event_counts.return_value = True
+        assert await publish_all_camera_counts() == 1
+
+    @pytest.mark.asyncio
+    async def test_per_event_publish_updates_last_counts(self, db_session, mock_mqtt, patched):
+        """A per-event publish is recorded, so reverting counts republishes them."""
+        from app.models.event import Event
+        from app.services.mqtt_status_service import (
+            publish_all_camera_counts, publish_camera_counts_update
+        )
+
+        self._add_cameras(db_session, "cam-a")
+        assert await publish_all_camera_counts() == 1
+
+        # New event publishes updated counts from the event path
+        event = Event(
+            camera_id="cam-a", timestamp=datetime.now(timezone.utc),
+            description="test", confidence=90, objects_detected='["person"]'
+        )
+        db_session.add(event)
+        db_session.commit()
+        assert await publish_camera_counts_update("cam-a", "cam-a", 1, 1) is True
+
+        # Event deleted: the DB is back to the counts the scheduler last sent,
+        # but the broker still holds (1, 1)
+        db_session.delete(event)
+        db_session.commit()
+
+        assert await publish_all_camera_counts() == 1
+        last = mock_mqtt.publish_event_counts.call_args.kwargs
+        assert (last["events_today"], last["events_this_week"]) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_statuses_are_skipped(self, db_session, mock_mqtt, patched):
+        """Statuses are republished only on change or after a cache reset."""
+        from app.services.mqtt_status_service import (
+            publish_all_camera_statuses, reset_published_cache
+        )
+
+        self._add_cameras(db_session, "cam-a")
+        camera_service = MagicMock()
+        camera_service.get_camera_status.return_value = {"status": "online"}
+
+        with patch('app.services.camera_service.get_camera_service', return_value=camera_service):
+            assert await publish_all_camera_statuses() == 1
+            assert await publish_all_camera_statuses() == 0
+
+            camera_service.get_camera_status.return_value = {"status": "offline"}
+            assert await publish_all_camera_statuses() == 1
+
+            reset_published_cache()
+            assert await publish_all_camera_statuses() == 1
+
+
+class TestStatusSensorScheduler:
+    """Test scheduled job configuration."""
+
+    def test_jobs_do_not_overlap(self):
+        """Both jobs are single-instance and coalesce missed runs."""
+        from app.services import mqtt_status_service as status
+
+        mock_scheduler = MagicMock()
+        with patch.object(status, "_scheduler_initialized", False), \
+                patch("apscheduler.schedulers.asyncio.AsyncIOScheduler", return_value=mock_scheduler):
+            status.setup_status_sensor_scheduler()
+
+        assert mock_scheduler.add_job.call_count == 2
+        for call in mock_scheduler.add_job.call_args_list:
+            assert call.kwargs["max_instances"] == 1
+            assert call.kwargs["coalesce"] is True
+            assert call.kwargs["misfire_grace_time"] == 60
+        mock_scheduler.start.assert_called_once()
+
+
 class TestActivityTimeoutLogic:
     """Test activity sensor timeout logic (AC4)."""
 
@@ -391,16 +621,50 @@ class TestActivityTimeoutLogic:
     @pytest.mark.asyncio
     async def test_set_activity_on_tracks_camera(self):
         """Test set_activity_on adds camera to active tracking."""
-        from app.services.mqtt_status_service import set_activity_on, _active_cameras, _activity_lock
+        from app.services.mqtt_status_service import set_activity_on, _active_cameras
 
         camera_id = "test-camera-timeout"
         event_time = datetime.now(timezone.utc)
 
         await set_activity_on(camera_id, event_time)
 
-        async with _activity_lock:
-            assert camera_id in _active_cameras
-            assert _active_cameras[camera_id] == event_time
+        assert camera_id in _active_cameras
+        # Stored as a monotonic deadline ACTIVITY_TIMEOUT_MINUTES out
+        remaining = _active_cameras[camera_id] - time.monotonic()
+        assert 0 < remaining <= 5 * 60
+
+    @pytest.mark.asyncio
+    async def test_timeouts_only_expire_latest_activity(self):
+        """A newer event keeps a camera active even though its old entry expired."""
+        from app.services import mqtt_status_service as status
+
+        status._active_cameras.clear()
+        status._activity_heap.clear()
+        now = datetime.now(timezone.utc)
+        expired = now - timedelta(minutes=status.ACTIVITY_TIMEOUT_MINUTES + 1)
+
+        await status.set_activity_on("cam-stale", expired)
+        await status.set_activity_on("cam-renewed", expired)
+        await status.set_activity_on("cam-renewed", now)
+        # Naive timestamps are treated as UTC
+        await status.set_activity_on("cam-naive", expired.replace(tzinfo=None))
+
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_activity_state = AsyncMock(return_value=True)
+
+        try:
+            with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt):
+                off_count = await status.check_activity_timeouts()
+
+            assert off_count == 2
+            published = {c.kwargs["camera_id"] for c in mock_mqtt.publish_activity_state.call_args_list}
+            assert published == {"cam-stale", "cam-naive"}
+            assert set(status._active_cameras) == {"cam-renewed"}
+            assert [cid for _, cid in status._activity_heap] == ["cam-renewed"]
+        finally:
+            status._active_cameras.clear()
+            status._activity_heap.clear()
 
     def test_timeout_logic_removes_old_entries(self):
         """Test timeout logic identifies cameras older than threshold."""
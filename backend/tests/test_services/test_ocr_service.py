@@ -60,6 +60,10 @@ class TestTimestampParsing:
         """Handle single digit hour format."""
         assert parse_timestamp("7:15:00 AM") == "7:15:00"
 
+    def test_parse_timestamp_prefers_date_over_earlier_time(self):
+        """Pattern priority wins over position in the text."""
+        assert parse_timestamp("10:30:45 2025-12-22") == "2025-12-22"
+
 
 class TestCameraNameParsing:
     """Test camera name extraction from OCR text (AC-3.2.2)."""
@@ -89,6 +93,10 @@ class TestCameraNameParsing:
         assert parse_camera_name("Porch") == "Porch"
         assert parse_camera_name("Side Entrance") == "Side"
 
+    def test_parse_camera_name_prefers_prefix_over_earlier_keyword(self):
+        """Prefixed names win over location keywords appearing first."""
+        assert parse_camera_name("Front Door CAM 2") == "2"
+
     def test_parse_camera_name_none_when_not_found(self):
         """Return None when no camera name pattern found."""
         assert parse_camera_name("12:30:45") is None
@@ -123,6 +131,28 @@ class TestPreprocessRegion:
         assert result.max() == 255
         assert result.min() == 0
 
+    def test_preprocess_region_results_are_independent(self):
+        """Scratch buffers are reused internally but results are not shared."""
+        bright = np.zeros((50, 300, 3), dtype=np.uint8)
+        bright[10:40, 50:250] = 255
+
+        first = preprocess_region(bright)
+        snapshot = first.copy()
+        second = preprocess_region(np.full((50, 300, 3), 255, dtype=np.uint8))
+
+        assert not np.shares_memory(first, second)
+        assert np.array_equal(first, snapshot)
+
+    def test_preprocess_region_handles_yellow_text(self):
+        """Yellow overlay text survives single-channel reduction."""
+        bgr_image = np.zeros((50, 300, 3), dtype=np.uint8)
+        bgr_image[10:40, 50:250] = (0, 255, 255)  # Yellow rectangle
+
+        result = preprocess_region(bgr_image)
+
+        assert result.max() == 255
+        assert result.min() == 0
+
 
 class TestOCRResultDataclass:
     """Test OCRResult dataclass."""
@@ -203,6 +233,155 @@ class TestExtractOverlayText:
         assert result is None or isinstance(result, OCRResult)
 
 
+class TestOcrRegions:
+    """Test single-pass OCR across stacked regions."""
+
+    @staticmethod
+    def _tesseract(words):
+        """Mock pytesseract whose image_to_data reports (text, top, height) words."""
+        mock = MagicMock()
+        mock.image_to_data.return_value = {
+            "text": [w[0] for w in words],
+            "top": [w[1] for w in words],
+            "height": [w[2] for w in words],
+        }
+        return mock
+
+    def test_words_are_assigned_to_source_region(self):
+        """Words map back to regions by vertical position in the stack."""
+        from app.services import ocr_service
+
+        regions = [np.zeros((20, 100), dtype=np.uint8) for _ in range(3)]
+        # Stack rows: region 0 = 0-20, region 1 = 30-50, region 2 = 60-80
+        mock = self._tesseract([("CAM", 32, 14), ("1", 33, 12), ("", 0, 0), ("12:00:00", 62, 14)])
+
+        with patch.object(ocr_service, "pytesseract", mock, create=True):
+            texts = ocr_service.ocr_regions(regions)
+
+        assert texts == ["", "CAM 1", "12:00:00"]
+        stacked = mock.image_to_data.call_args[0][0]
+        assert stacked.shape == (80, 100)
+
+    def test_extract_overlay_text_runs_tesseract_once(self):
+        """All four corners are read with one tesseract call."""
+        from app.services import ocr_service
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[:, ::4] = 255  # Stripes give every corner enough contrast
+        # Corner height is 48px; bottom_left occupies stack rows 116-164
+        mock = self._tesseract([("2025-12-22", 120, 20)])
+
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", mock, create=True):
+            result = ocr_service.extract_overlay_text(frame)
+
+        mock.image_to_data.assert_called_once()
+        assert result.region == "bottom_left"
+        assert result.timestamp == "2025-12-22"
+
+    def test_large_frames_are_downscaled_before_ocr(self):
+        """1080p corners (60px tall) are resized to the OCR target height."""
+        from app.services import ocr_service
+
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        frame[:, ::4] = 255
+        mock = self._tesseract([])
+
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", mock, create=True):
+            ocr_service.extract_overlay_text(frame)
+
+        stacked = mock.image_to_data.call_args[0][0]
+        target = ocr_service.OCR_TARGET_REGION_HEIGHT
+        assert stacked.shape == (4 * target + 3 * ocr_service.REGION_SEPARATOR_PX, 187)
+
+    def test_blank_corners_skip_tesseract(self):
+        """Uniform corners are gated out before any OCR call."""
+        from app.services import ocr_service
+
+        frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+        mock = self._tesseract([])
+
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", mock, create=True):
+            assert ocr_service.extract_overlay_text(frame) is None
+
+        mock.image_to_data.assert_not_called()
+
+    def test_only_corners_with_content_are_stacked(self):
+        """Gated corners are left out of the stacked image."""
+        from app.services import ocr_service
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[480 - 48:, 640 - 213:][:, ::4] = 255  # Content in bottom_right only
+        mock = self._tesseract([("CAM", 10, 20), ("3", 10, 20)])
+
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", mock, create=True):
+            result = ocr_service.extract_overlay_text(frame)
+
+        assert mock.image_to_data.call_args[0][0].shape == (48, 213)
+        assert result.region == "bottom_right"
+        assert result.camera_name == "3"
+
+
+class TestOverlayRegionHint:
+    """Test per-camera memory of the corner holding the overlay."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_hints(self):
+        from app.services import ocr_service
+        ocr_service._last_overlay_region.clear()
+        yield
+        ocr_service._last_overlay_region.clear()
+
+    @staticmethod
+    def _frame():
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[:, ::4] = 255  # Every corner passes the content gate
+        return frame
+
+    def test_hinted_region_is_read_alone(self):
+        """After a hit, the next frame OCRs only the remembered corner."""
+        from app.services import ocr_service
+
+        # bottom_left is the third 48px band of the four-corner stack
+        first = TestOcrRegions._tesseract([("CAM", 120, 20), ("2", 120, 20)])
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", first, create=True):
+            assert ocr_service.extract_overlay_text(self._frame(), camera_id="cam-1").region == "bottom_left"
+
+        second = TestOcrRegions._tesseract([("CAM", 10, 20), ("2", 10, 20)])
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", second, create=True):
+            result = ocr_service.extract_overlay_text(self._frame(), camera_id="cam-1")
+
+        second.image_to_data.assert_called_once()
+        assert second.image_to_data.call_args[0][0].shape == (48, 213)
+        assert result.region == "bottom_left"
+
+    def test_hint_miss_falls_back_to_other_regions(self):
+        """If the remembered corner is empty the remaining corners are read."""
+        from app.services import ocr_service
+
+        ocr_service._last_overlay_region["cam-1"] = "bottom_left"
+        mock = TestOcrRegions._tesseract([])
+        # Second call reads top_left, top_right, bottom_right; match in top_right
+        mock.image_to_data.side_effect = [
+            {"text": [], "top": [], "height": []},
+            {"text": ["12:00:00"], "top": [60], "height": [20]},
+        ]
+
+        with patch.object(ocr_service, "OCR_AVAILABLE", True), \
+                patch.object(ocr_service, "pytesseract", mock, create=True):
+            result = ocr_service.extract_overlay_text(self._frame(), camera_id="cam-1")
+
+        assert mock.image_to_data.call_count == 2
+        assert mock.image_to_data.call_args[0][0].shape == (3 * 48 + 2 * 10, 213)
+        assert result.region == "top_right"
+        assert ocr_service._last_overlay_region["cam-1"] == "top_right"
+
+
 class TestIsOcrAvailable:
     """Test OCR availability check."""
 
@@ -13,6 +13,10 @@ Tests the ONVIFDiscoveryService for:
 - Authentication error handling (P5-2.2)
 """
 import asyncio
+import logging
+import socket
+import threading
+import uuid
 import pytest
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
@@ -34,35 +38,43 @@ from app.services.onvif_discovery_service import (
     DEFAULT_TIMEOUT,
     ONVIF_NVT_TYPE,
     DEVICE_QUERY_TIMEOUT,
+    CLIENT_CACHE_TTL,
 )
 
 
-class MockService:
-    """Mock WS-Discovery service response."""
-
-    def __init__(
-        self,
-        xaddrs: List[str],
-        scopes: List[str] = None,
-        types: List[str] = None,
-        metadata_version: str = "1"
-    ):
-        self._xaddrs = xaddrs
-        self._scopes = scopes or []
-        self._types = types or [ONVIF_NVT_TYPE]
-        self._metadata_version = metadata_version
-
-    def getXAddrs(self):
-        return self._xaddrs
-
-    def getScopes(self):
-        return self._scopes
-
-    def getTypes(self):
-        return self._types
-
-    def getMetadataVersion(self):
-        return self._metadata_version
+def probe_match(
+    xaddrs: str,
+    scopes: str = "",
+    types: str = ONVIF_NVT_TYPE,
+    metadata_version: str = "1",
+    reference: str = None,
+    relates_to: str = None
+) -> bytes:
+    """Build a WS-Discovery ProbeMatches response datagram."""
+    reference = reference or f"urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, xaddrs)}"
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+        'xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing" '
+        'xmlns:d="http://schemas.xmlsoap.org/ws/2005/04/discovery" '
+        'xmlns:dn="http://www.onvif.org/ver10/network/wsdl">'
+        '<s:Header><a:Action>'
+        'http://schemas.xmlsoap.org/ws/2005/04/discovery/ProbeMatches'
+        '</a:Action>'
+        + (f'<a:RelatesTo>{relates_to}</a:RelatesTo>' if relates_to else '')
+        + '</s:Header>'
+        '<s:Body><d:ProbeMatches><d:ProbeMatch>'
+        f'<a:EndpointReference><a:Address>{reference}</a:Address></a:EndpointReference>'
+        f'<d:Types>{types}</d:Types>'
+        f'<d:Scopes>{scopes}</d:Scopes>'
+        f'<d:XAddrs>{xaddrs}</d:XAddrs>'
+        f'<d:MetadataVersion>{metadata_version}</d:MetadataVersion>'
+        '</d:ProbeMatch></d:ProbeMatches></s:Body>'
+        '</s:Envelope>'
+    ).encode()
+
+
+ADDR = ("192.168.1.100", 3702)
 
 
 class TestONVIFDiscoveryConstants:
@@ -102,7 +114,7 @@ class TestONVIFDiscoveryServiceInit:
     def test_cache_initialized_empty(self):
         """Test cache is initially empty."""
         service = ONVIFDiscoveryService()
-        assert service._cached_devices == []
+        assert service._cached_devices == ()
         assert service._last_discovery_time is None
 
 
@@ -117,158 +129,480 @@ class TestDiscoveryServiceAvailability:
         assert isinstance(service.is_available, bool)
 
 
-class TestSyncDiscovery:
-    """Test synchronous discovery method with mocked WS-Discovery.
-
-    These tests require WSDiscovery to be installed. They are skipped
-    if the library is not available.
-    """
-
-    @pytest.fixture(autouse=True)
-    def check_wsdiscovery(self):
-        """Skip tests if WSDiscovery not installed."""
-        from app.services.onvif_discovery_service import WSDISCOVERY_AVAILABLE
-        if not WSDISCOVERY_AVAILABLE:
-            pytest.skip("WSDiscovery library not installed")
+class TestParseProbeMatches:
+    """Test parsing of WS-Discovery ProbeMatches responses."""
 
     def test_discover_single_camera(self):
         """AC4: Test discovery returns single camera correctly."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
+        service = ONVIFDiscoveryService()
 
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
+        devices = service._parse_probe_matches([(
+            probe_match(
+                xaddrs="http://192.168.1.100:80/onvif/device_service",
+                scopes="onvif://www.onvif.org/type/NetworkVideoTransmitter "
+                       "onvif://www.onvif.org/name/Front",
+                types="tdn:NetworkVideoTransmitter"
+            ),
+            ADDR
+        )])
 
-            mock_service = MockService(
-                xaddrs=["http://192.168.1.100:80/onvif/device_service"],
-                scopes=["onvif://www.onvif.org/type/NetworkVideoTransmitter"],
-                types=["tdn:NetworkVideoTransmitter"]
-            )
+        assert len(devices) == 1
+        assert devices[0].endpoint_url == "http://192.168.1.100:80/onvif/device_service"
+        assert "onvif://www.onvif.org/type/NetworkVideoTransmitter" in devices[0].scopes
+        assert len(devices[0].scopes) == 2
+        assert devices[0].types == ["tdn:NetworkVideoTransmitter"]
+        assert devices[0].metadata_version == "1"
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=[mock_service]):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+    def test_scope_index(self):
+        """ONVIF scopes are indexed by category with decoded values."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([(
+            probe_match(
+                xaddrs="http://192.168.1.100/onvif/device_service",
+                scopes="onvif://www.onvif.org/type/video_encoder "
+                       "onvif://www.onvif.org/type/NetworkVideoTransmitter "
+                       "onvif://www.onvif.org/name/Front%20Door "
+                       "onvif://www.onvif.org/hardware/IPC-HDW2431T "
+                       "http://example.com/custom"
+            ),
+            ADDR
+        )])
 
-                assert len(devices) == 1
-                assert devices[0].endpoint_url == "http://192.168.1.100:80/onvif/device_service"
-                assert "onvif://www.onvif.org/type/NetworkVideoTransmitter" in devices[0].scopes
+        assert devices[0].scope_index == {
+            "type": "video_encoder",
+            "name": "Front Door",
+            "hardware": "IPC-HDW2431T",
+        }
 
     def test_discover_multiple_cameras(self):
         """AC3: Test discovery handles multiple cameras."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
-
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
-
-            mock_services = [
-                MockService(xaddrs=["http://192.168.1.100:80/onvif/device_service"]),
-                MockService(xaddrs=["http://192.168.1.101:80/onvif/device_service"]),
-                MockService(xaddrs=["http://192.168.1.102:80/onvif/device_service"]),
-            ]
+        service = ONVIFDiscoveryService()
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=mock_services):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs=f"http://192.168.1.{i}:80/onvif/device_service"), ADDR)
+            for i in (100, 101, 102)
+        ])
 
-                assert len(devices) == 3
-                urls = [d.endpoint_url for d in devices]
-                assert "http://192.168.1.100:80/onvif/device_service" in urls
-                assert "http://192.168.1.101:80/onvif/device_service" in urls
-                assert "http://192.168.1.102:80/onvif/device_service" in urls
+        assert len(devices) == 3
+        urls = [d.endpoint_url for d in devices]
+        assert "http://192.168.1.100:80/onvif/device_service" in urls
+        assert "http://192.168.1.101:80/onvif/device_service" in urls
+        assert "http://192.168.1.102:80/onvif/device_service" in urls
 
     def test_discover_deduplicates_same_endpoint(self):
         """AC3: Test deduplication of devices found on multiple interfaces."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
+        service = ONVIFDiscoveryService()
 
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
+        # Same camera responding twice (from different interfaces)
+        same_url = "http://192.168.1.100:80/onvif/device_service"
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs=same_url), ADDR),
+            (probe_match(xaddrs=same_url), ADDR),  # Duplicate
+        ])
 
-            # Same camera responding twice (from different interfaces)
-            same_url = "http://192.168.1.100:80/onvif/device_service"
-            mock_services = [
-                MockService(xaddrs=[same_url]),
-                MockService(xaddrs=[same_url]),  # Duplicate
-            ]
+        # Should only have one device after deduplication
+        assert len(devices) == 1
+        assert devices[0].endpoint_url == same_url
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=mock_services):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+    def test_uses_first_xaddr(self):
+        """Devices advertising several endpoints use the first one."""
+        service = ONVIFDiscoveryService()
 
-                # Should only have one device after deduplication
-                assert len(devices) == 1
-                assert devices[0].endpoint_url == same_url
+        devices = service._parse_probe_matches([(
+            probe_match(
+                xaddrs="http://192.168.1.100/onvif/device_service "
+                       "http://[fe80::1]/onvif/device_service"
+            ),
+            ADDR
+        )])
 
-    def test_discover_empty_response(self):
-        """AC2: Test graceful handling of no responses."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
+        assert devices[0].endpoint_url == "http://192.168.1.100/onvif/device_service"
+
+    def test_deduplicates_by_endpoint_reference(self):
+        """A device replying with different addresses is listed once."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://192.168.1.100/onvif/device_service",
+                         reference="urn:uuid:cam-1"), ADDR),
+            (probe_match(xaddrs="http://10.0.0.5/onvif/device_service",
+                         reference="urn:uuid:cam-1"), ("10.0.0.5", 3702)),
+        ])
+
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.100/onvif/device_service"
+        ]
+
+    def test_merges_addresses_for_same_reference(self):
+        """A later reply can supply a preferred IPv4 endpoint for the device."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://[fe80::1]/onvif/device_service",
+                         reference="urn:uuid:cam-1"), ("fe80::1", 3702)),
+            (probe_match(xaddrs="http://192.168.1.100/onvif/device_service",
+                         reference="urn:uuid:cam-1"), ADDR),
+        ])
+
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.100/onvif/device_service"
+        ]
+
+    def test_merges_scopes_types_and_xaddrs(self):
+        """Replies from two interfaces combine into one device."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://192.168.1.100/onvif/device_service",
+                         scopes="onvif://www.onvif.org/type/NetworkVideoTransmitter",
+                         reference="urn:uuid:cam-1"), ADDR),
+            (probe_match(xaddrs="http://10.0.0.5/onvif/device_service",
+                         scopes="onvif://www.onvif.org/type/NetworkVideoTransmitter "
+                                "onvif://www.onvif.org/name/Front",
+                         types="tds:Device",
+                         reference="urn:uuid:cam-1"), ("10.0.0.5", 3702)),
+        ])
+
+        assert len(devices) == 1
+        device = devices[0]
+        assert device.endpoint_url == "http://192.168.1.100/onvif/device_service"
+        assert device.xaddrs == [
+            "http://192.168.1.100/onvif/device_service",
+            "http://10.0.0.5/onvif/device_service",
+        ]
+        assert device.types == [ONVIF_NVT_TYPE, "tds:Device"]
+        assert len(device.scopes) == 2
+        assert device.scope_index["name"] == "Front"
 
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
+    def test_deduplicates_by_host_and_port(self):
+        """Explicit default port and trailing path differences are one device."""
+        service = ONVIFDiscoveryService()
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=[]):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://192.168.1.5:80/onvif/device_service"), ADDR),
+            (probe_match(xaddrs="http://192.168.1.5/onvif/device_service"), ADDR),
+            (probe_match(xaddrs="http://192.168.1.5:8080/onvif/device_service"), ADDR),
+        ])
+
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.5:80/onvif/device_service",
+            "http://192.168.1.5:8080/onvif/device_service",
+        ]
+
+    def test_prefers_ipv4_xaddr(self):
+        """IPv4 literals are preferred over hostnames and IPv6 addresses."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([(
+            probe_match(
+                xaddrs="http://[fe80::1]/onvif/device_service "
+                       "http://camera.local/onvif/device_service "
+                       "http://192.168.1.100/onvif/device_service"
+            ),
+            ADDR
+        )])
 
-                assert devices == []
+        assert devices[0].endpoint_url == "http://192.168.1.100/onvif/device_service"
+
+    def test_ignores_replies_to_other_probes(self):
+        """Late replies to an earlier probe are dropped."""
+        service = ONVIFDiscoveryService()
+        message_id = uuid.uuid4()
+
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://192.168.1.100/onvif/device_service",
+                         relates_to=f"urn:uuid:{uuid.uuid4()}"), ADDR),
+            (probe_match(xaddrs="http://192.168.1.101/onvif/device_service",
+                         relates_to=f"urn:uuid:{message_id}"), ADDR),
+        ], [message_id])
+
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.101/onvif/device_service"
+        ]
+
+    def test_ignores_non_onvif_devices(self):
+        """Replies to the unfiltered probe from non-ONVIF devices are dropped."""
+        service = ONVIFDiscoveryService()
+
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs="http://192.168.1.50:5357/printer",
+                         types="wsdp:Device wprt:PrintDeviceType"), ADDR),
+            (probe_match(xaddrs="http://192.168.1.100/onvif/device_service",
+                         types="tds:Device",
+                         scopes="onvif://www.onvif.org/name/Front"), ADDR),
+        ])
+
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.100/onvif/device_service"
+        ]
+
+    def test_discover_empty_response(self):
+        """AC2: Test graceful handling of no responses."""
+        service = ONVIFDiscoveryService()
+
+        assert service._parse_probe_matches([]) == []
 
     def test_discover_skips_empty_xaddrs(self):
         """AC3: Test devices with no XAddrs are skipped."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
+        service = ONVIFDiscoveryService()
 
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
+        devices = service._parse_probe_matches([
+            (probe_match(xaddrs=""), ADDR),  # No XAddrs
+            (probe_match(xaddrs="http://192.168.1.100:80/onvif/device_service"), ADDR),
+        ])
 
-            mock_services = [
-                MockService(xaddrs=[]),  # No XAddrs
-                MockService(xaddrs=["http://192.168.1.100:80/onvif/device_service"]),
-            ]
+        assert len(devices) == 1
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=mock_services):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+    def test_discover_handles_malformed_response(self, caplog):
+        """AC3: Test graceful handling of malformed responses."""
+        service = ONVIFDiscoveryService()
 
-                assert len(devices) == 1
+        with caplog.at_level(logging.WARNING, logger="app.services.onvif_discovery_service"):
+            devices = service._parse_probe_matches([
+                (b"<not-xml", ADDR),
+                (b"<also-not-xml", ADDR),
+                (probe_match(xaddrs="http://192.168.1.100:80/onvif/device_service"), ADDR),
+            ])
 
-    def test_discover_handles_malformed_service(self):
-        """AC3: Test graceful handling of malformed responses."""
-        from app.services.onvif_discovery_service import ThreadedWSDiscovery
+        # One aggregated warning for the scan
+        warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert len(warnings) == 1
+        assert "2 malformed" in warnings[0].getMessage()
 
-        with patch.object(ThreadedWSDiscovery, '__init__', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'start', return_value=None), \
-             patch.object(ThreadedWSDiscovery, 'stop', return_value=None):
+        # Should still get the good device
+        assert len(devices) == 1
+        assert devices[0].endpoint_url == "http://192.168.1.100:80/onvif/device_service"
 
-            # Service that raises exception on getXAddrs
-            bad_service = MagicMock()
-            bad_service.getXAddrs.side_effect = Exception("Malformed response")
 
-            good_service = MockService(
-                xaddrs=["http://192.168.1.100:80/onvif/device_service"]
-            )
+class TestAsyncDiscoverProbe:
+    """Test the asyncio WS-Discovery probe."""
+
+    @staticmethod
+    def _fake_endpoint(sent, reply=True):
+        """Datagram endpoint whose device answers every probe it is sent."""
+        async def create_datagram_endpoint(protocol_factory, **kwargs):
+            protocol = protocol_factory()
+            transport = MagicMock()
+            transport.get_extra_info.return_value = None
+            transport.is_closing.return_value = False
+
+            def sendto(data, addr):
+                sent.append((data, addr))
+                if reply:
+                    protocol.datagram_received(
+                        probe_match(xaddrs="http://192.168.1.100/onvif/device_service"),
+                        ADDR
+                    )
+
+            transport.sendto.side_effect = sendto
+            return transport, protocol
+
+        return create_datagram_endpoint
+
+    @pytest.mark.asyncio
+    async def test_sends_probe_and_collects_responses(self):
+        """Probe goes to the multicast group and replies are parsed."""
+        service = ONVIFDiscoveryService()
+        loop = asyncio.get_running_loop()
+        sent = []
+
+        with patch.object(
+            loop, "create_datagram_endpoint", side_effect=self._fake_endpoint(sent)
+        ):
+            devices = await service._async_discover(timeout=0)
+
+        # One probe per type filter, each with its own MessageID
+        assert len(sent) == 3
+        assert {addr for _, addr in sent} == {(MULTICAST_GROUP, MULTICAST_PORT)}
+        probes = [data for data, _ in sent]
+        assert b"<d:Types>dn:NetworkVideoTransmitter</d:Types>" in probes[0]
+        assert b"<d:Types>tdn:NetworkVideoTransmitter</d:Types>" in probes[1]
+        assert b"<d:Types>" not in probes[2]
+        assert len({p.split(b"MessageID>")[1] for p in probes}) == 3
+        assert all(b"{" not in p for p in probes)
+        assert [d.endpoint_url for d in devices] == [
+            "http://192.168.1.100/onvif/device_service"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ends_after_quiet_window(self):
+        """Every retransmit goes out, then the scan stops well before the timeout."""
+        service = ONVIFDiscoveryService()
+        service.retransmit_schedule_ms = (20, 100, 200)
+        service.quiet_window_ms = 50
+        loop = asyncio.get_running_loop()
+        sent = []
+
+        start = loop.time()
+        with patch.object(
+            loop, "create_datagram_endpoint", side_effect=self._fake_endpoint(sent)
+        ):
+            devices = await service._async_discover(timeout=5)
+        elapsed = loop.time() - start
+
+        # Initial probes plus all three retransmits, even though no new
+        # responder arrived after the first reply
+        assert len(sent) == 12
+        assert [data for data, _ in sent[:3]] * 3 == [data for data, _ in sent[3:]]
+        # Ends one quiet window after the last retransmit (at 320ms)
+        assert 0.32 <= elapsed < 1
+        assert len(devices) == 1
+
+    @pytest.mark.asyncio
+    async def test_socket_reused_across_scans(self):
+        """The probe socket is created once and closed on shutdown."""
+        service = ONVIFDiscoveryService()
+        service.quiet_window_ms = 10
+        loop = asyncio.get_running_loop()
+        sent = []
+
+        with patch.object(
+            loop, "create_datagram_endpoint", side_effect=self._fake_endpoint(sent)
+        ) as mock_create:
+            first = await service._async_discover(timeout=0.1)
+            second = await service._async_discover(timeout=0.1)
+
+        assert mock_create.call_count == 1
+        assert len(first) == len(second) == 1
+
+        transport, _ = service._discovery_endpoint
+        service.shutdown()
+        transport.close.assert_called_once()
+        assert service._discovery_endpoint is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_bounds_scan(self):
+        """The timeout caps the scan even with a long quiet window."""
+        service = ONVIFDiscoveryService()
+        service.quiet_window_ms = 10_000
+        loop = asyncio.get_running_loop()
+        sent = []
+
+        start = loop.time()
+        with patch.object(
+            loop, "create_datagram_endpoint",
+            side_effect=self._fake_endpoint(sent, reply=False)
+        ):
+            devices = await service._async_discover(timeout=0.1)
+
+        assert loop.time() - start < 1
+        assert devices == []
 
-            with patch.object(ThreadedWSDiscovery, 'searchServices', return_value=[bad_service, good_service]):
-                service = ONVIFDiscoveryService()
-                devices = service._sync_discover(timeout=5)
+    @pytest.mark.asyncio
+    async def test_stream_yields_before_scan_ends(self):
+        """Streamed devices arrive as they respond, not after the timeout."""
+        service = ONVIFDiscoveryService()
+        service.quiet_window_ms = 10_000
+        loop = asyncio.get_running_loop()
+        sent = []
+
+        with patch.object(
+            loop, "create_datagram_endpoint", side_effect=self._fake_endpoint(sent)
+        ):
+            stream = service.discover_cameras_stream(timeout=0.3)
+            first = await stream.__anext__()
+            scan = service._inflight_discovery
+            assert not scan.done()
+
+            # Abandoning the stream leaves the shared scan running
+            await stream.aclose()
+            result = await scan
+
+        assert first.endpoint_url == "http://192.168.1.100/onvif/device_service"
+        assert result.devices == [first]
+        assert service._discovery_listeners == set()
+
+        # A completed scan fills the cache shared with discover_cameras()
+        cached = [device async for device in service.discover_cameras_stream()]
+        assert cached == [first]
+
+
+class TestDiscoveryInterfaces:
+    """Test selection of the interfaces discovery probes are sent from."""
+
+    @staticmethod
+    def _patch_interfaces():
+        stats = {
+            "lo": Mock(isup=True, flags="up,loopback,running"),
+            "eth0": Mock(isup=True, flags="up,broadcast,running,multicast"),
+            "wlan0": Mock(isup=False, flags="broadcast,multicast"),
+            "tun0": Mock(isup=True, flags="up,pointopoint,running,noarp"),
+            "wan0": Mock(isup=True, flags="up,broadcast,running,multicast"),
+        }
+        addrs = {
+            "lo": [Mock(family=socket.AF_INET, address="127.0.0.1")],
+            "eth0": [
+                Mock(family=socket.AF_INET6, address="fe80::1"),
+                Mock(family=socket.AF_INET, address="192.168.1.10"),
+            ],
+            "wlan0": [Mock(family=socket.AF_INET, address="192.168.2.10")],
+            "tun0": [Mock(family=socket.AF_INET, address="10.8.0.2")],
+            "wan0": [Mock(family=socket.AF_INET, address="81.2.69.160")],
+        }
+        return patch.multiple(
+            "app.services.onvif_discovery_service.psutil",
+            net_if_stats=Mock(return_value=stats),
+            net_if_addrs=Mock(return_value=addrs),
+        )
+
+    def test_auto_detects_lan_interfaces(self, monkeypatch):
+        """Only up, multicast, non-loopback interfaces on private nets qualify."""
+        monkeypatch.delenv("ONVIF_DISCOVERY_INTERFACES", raising=False)
+        with self._patch_interfaces():
+            assert ONVIFDiscoveryService._discovery_interfaces() == ["192.168.1.10"]
+
+    def test_configured_interfaces(self, monkeypatch):
+        """ONVIF_DISCOVERY_INTERFACES overrides auto-detection."""
+        monkeypatch.setenv("ONVIF_DISCOVERY_INTERFACES", "tun0, wlan0")
+        with self._patch_interfaces():
+            assert ONVIFDiscoveryService._discovery_interfaces() == [
+                "192.168.2.10", "10.8.0.2"
+            ]
+
+    @pytest.mark.asyncio
+    async def test_probes_sent_from_each_interface(self):
+        """Each probe goes out once per selected interface."""
+        service = ONVIFDiscoveryService()
+        loop = asyncio.get_running_loop()
+        sent = []
+        sock = MagicMock()
+
+        async def create_datagram_endpoint(protocol_factory, **kwargs):
+            transport = MagicMock()
+            transport.get_extra_info.return_value = sock
+            transport.is_closing.return_value = False
+            transport.sendto.side_effect = lambda data, addr: sent.append(data)
+            return transport, protocol_factory()
+
+        with patch.object(
+            loop, "create_datagram_endpoint", side_effect=create_datagram_endpoint
+        ), patch.object(
+            ONVIFDiscoveryService, "_discovery_interfaces",
+            return_value=["192.168.1.10", "192.168.2.10"]
+        ):
+            await service._async_discover(timeout=0)
 
-                # Should still get the good device
-                assert len(devices) == 1
-                assert devices[0].endpoint_url == "http://192.168.1.100:80/onvif/device_service"
+        assert len(sent) == 6
+        selected = [
+            c.args[2] for c in sock.setsockopt.call_args_list
+            if c.args[1] == socket.IP_MULTICAST_IF
+        ]
+        assert selected == [
+            socket.inet_aton("192.168.1.10"), socket.inet_aton("192.168.2.10")
+        ]
 
 
 class TestAsyncDiscovery:
     """Test async discovery methods."""
 
     @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', True)
     async def test_discover_cameras_with_result(self):
         """AC4, AC5: Test discover_cameras_with_result returns DiscoveryResult."""
         service = ONVIFDiscoveryService()
 
-        # Mock _sync_discover
-        with patch.object(service, '_sync_discover', return_value=[]):
+        # Mock the network probe
+        with patch.object(service, '_async_discover', return_value=[]):
             result = await service.discover_cameras_with_result(timeout=5)
 
         assert isinstance(result, DiscoveryResult)
@@ -277,7 +611,6 @@ class TestAsyncDiscovery:
         assert isinstance(result.devices, list)
 
     @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', True)
     async def test_discover_cameras_returns_list(self):
         """AC4: Test discover_cameras returns device list."""
         service = ONVIFDiscoveryService()
@@ -288,40 +621,17 @@ class TestAsyncDiscovery:
             types=["tdn:NVT"]
         )
 
-        with patch.object(service, '_sync_discover', return_value=[mock_device]):
+        with patch.object(service, '_async_discover', return_value=[mock_device]):
             devices = await service.discover_cameras(timeout=5, use_cache=False)
 
         assert len(devices) == 1
         assert devices[0].endpoint_url == "http://192.168.1.100:80/onvif/device_service"
 
-    @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', False)
-    async def test_discover_raises_when_unavailable(self):
-        """Test discovery raises RuntimeError when library unavailable."""
-        service = ONVIFDiscoveryService()
-
-        with pytest.raises(RuntimeError) as exc_info:
-            await service.discover_cameras()
-
-        assert "WSDiscovery" in str(exc_info.value)
-
-    @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', False)
-    async def test_discover_with_result_returns_error_when_unavailable(self):
-        """Test discover_cameras_with_result returns error when library unavailable."""
-        service = ONVIFDiscoveryService()
-
-        result = await service.discover_cameras_with_result(timeout=5)
-
-        assert result.status == "error"
-        assert "WSDiscovery" in result.error
-
 
 class TestDiscoveryCache:
     """Test caching behavior."""
 
     @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', True)
     async def test_cache_is_used(self):
         """Test cached results are returned when cache is valid."""
         service = ONVIFDiscoveryService()
@@ -334,12 +644,12 @@ class TestDiscoveryCache:
 
         call_count = 0
 
-        def mock_sync_discover(timeout):
+        def mock_discover(timeout):
             nonlocal call_count
             call_count += 1
             return [mock_device]
 
-        with patch.object(service, '_sync_discover', side_effect=mock_sync_discover):
+        with patch.object(service, '_async_discover', side_effect=mock_discover):
             # First call should invoke discovery
             devices1 = await service.discover_cameras(timeout=5, use_cache=True)
             # Second call should use cache
@@ -347,9 +657,11 @@ class TestDiscoveryCache:
 
         assert call_count == 1  # Only one actual discovery
         assert devices1 == devices2
+        # Cache hits share the immutable snapshot instead of copying
+        assert devices2 is devices1
+        assert isinstance(devices2, tuple)
 
     @pytest.mark.asyncio
-    @patch('app.services.onvif_discovery_service.WSDISCOVERY_AVAILABLE', True)
     async def test_cache_bypass(self):
         """Test use_cache=False bypasses cache."""
         service = ONVIFDiscoveryService()
@@ -362,31 +674,89 @@ class TestDiscoveryCache:
 
         call_count = 0
 
-        def mock_sync_discover(timeout):
+        def mock_discover(timeout):
             nonlocal call_count
             call_count += 1
             return [mock_device]
 
-        with patch.object(service, '_sync_discover', side_effect=mock_sync_discover):
+        with patch.object(service, '_async_discover', side_effect=mock_discover):
             await service.discover_cameras(timeout=5, use_cache=False)
             await service.discover_cameras(timeout=5, use_cache=False)
 
         assert call_count == 2  # Discovery called both times
 
+    @pytest.mark.asyncio
+    async def test_network_change_invalidates_cache(self):
+        """A different local network address forces a new scan."""
+        service = ONVIFDiscoveryService()
+
+        call_count = 0
+
+        def mock_discover(timeout):
+            nonlocal call_count
+            call_count += 1
+            return []
+
+        with patch.object(service, '_async_discover', side_effect=mock_discover), \
+             patch.object(
+                 ONVIFDiscoveryService, '_network_fingerprint',
+                 side_effect=["192.168.1.10", "192.168.1.10", "10.8.0.2", "10.8.0.2"]
+             ):
+            await service.discover_cameras(timeout=5)
+            # Same network: served from cache
+            await service.discover_cameras(timeout=5)
+            # VPN came up: cache is stale
+            await service.discover_cameras(timeout=5)
+
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_scan(self):
+        """Callers arriving during a scan await it instead of starting their own."""
+        service = ONVIFDiscoveryService()
+
+        mock_device = DiscoveredDevice(
+            endpoint_url="http://192.168.1.100:80/onvif/device_service",
+            scopes=[],
+            types=[]
+        )
+
+        call_count = 0
+
+        async def mock_discover(timeout):
+            nonlocal call_count
+            call_count += 1
+            await asyncio.sleep(0.05)
+            return [mock_device]
+
+        with patch.object(service, '_async_discover', side_effect=mock_discover):
+            results = await asyncio.gather(
+                service.discover_cameras_with_result(timeout=5),
+                service.discover_cameras_with_result(timeout=5),
+                service.discover_cameras(timeout=5, use_cache=False),
+            )
+            # A later call starts a fresh scan
+            await service.discover_cameras_with_result(timeout=5)
+
+        assert call_count == 2
+        assert results[0] is results[1]
+        assert list(results[2]) == [mock_device]
+        assert service._inflight_discovery is None
+
     def test_clear_cache(self):
         """Test clear_cache resets cache state."""
         service = ONVIFDiscoveryService()
 
         # Simulate cached state
-        service._cached_devices = [
-            DiscoveredDevice(endpoint_url="http://test", scopes=[], types=[])
-        ]
+        service._cached_devices = (
+            DiscoveredDevice(endpoint_url="http://test", scopes=[], types=[]),
+        )
         import time
-        service._last_discovery_time = time.time()
+        service._last_discovery_time = time.monotonic()
 
         service.clear_cache()
 
-        assert service._cached_devices == []
+        assert service._cached_devices == ()
         assert service._last_discovery_time is None
 
 
@@ -518,6 +888,12 @@ class TestGenerateCameraId:
         id2 = service._generate_camera_id("192.168.1.100", 80)
         assert id1 == id2
 
+    def test_generate_id_ipv6(self):
+        """Test IPv6 separators are normalized."""
+        service = ONVIFDiscoveryService()
+        camera_id = service._generate_camera_id("fe80::1", 80)
+        assert camera_id == "camera-fe80--1-80"
+
 
 class TestDeviceInfoSchema:
     """Test DeviceInfo Pydantic model (P5-2.2)."""
@@ -731,6 +1107,100 @@ class TestAsyncGetDeviceDetails:
         assert result.device.device_info.manufacturer == "Dahua"
 
 
+class TestGetAllDeviceDetails:
+    """Test concurrent device details queries."""
+
+    @staticmethod
+    def _devices(count: int) -> List[DiscoveredDevice]:
+        return [
+            DiscoveredDevice(endpoint_url=f"http://192.168.1.{100 + i}:80/onvif/device_service")
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    @patch('app.services.onvif_discovery_service.ONVIF_ZEEP_AVAILABLE', True)
+    async def test_queries_run_concurrently_with_cap(self):
+        """Results keep device order and concurrency is bounded by the semaphore."""
+        import threading
+        import time as time_module
+
+        service = ONVIFDiscoveryService()
+        service._details_semaphores[asyncio.get_running_loop()] = asyncio.Semaphore(2)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def fake_query(host, port, username, password, endpoint_url):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time_module.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return DeviceDetailsResult(status="error", error=host)
+
+        with patch.object(service, '_sync_get_device_details', side_effect=fake_query):
+            results = await service.get_all_device_details(self._devices(5))
+
+        assert [r.error for r in results] == [f"192.168.1.{100 + i}" for i in range(5)]
+        assert active["max"] == 2
+
+    def test_semaphore_per_event_loop(self):
+        """Each event loop gets its own query semaphore."""
+        service = ONVIFDiscoveryService()
+
+        async def semaphores():
+            return service._get_details_semaphore(), service._get_details_semaphore()
+
+        first, again = asyncio.run(semaphores())
+        second, _ = asyncio.run(semaphores())
+
+        assert first is again
+        assert second is not first
+
+    @pytest.mark.asyncio
+    @patch('app.services.onvif_discovery_service.ONVIF_ZEEP_AVAILABLE', True)
+    async def test_queries_run_on_dedicated_executor(self):
+        """SOAP queries use the service's own thread pool, not the loop default."""
+        import threading
+
+        service = ONVIFDiscoveryService()
+        thread_names = []
+
+        def fake_query(host, port, username, password, endpoint_url):
+            thread_names.append(threading.current_thread().name)
+            return DeviceDetailsResult(status="auth_required")
+
+        try:
+            with patch.object(service, '_sync_get_device_details', side_effect=fake_query):
+                await service.get_all_device_details(self._devices(2))
+        finally:
+            service.shutdown()
+
+        assert len(thread_names) == 2
+        assert all(name.startswith("onvif") for name in thread_names)
+
+    @pytest.mark.asyncio
+    @patch('app.services.onvif_discovery_service.ONVIF_ZEEP_AVAILABLE', True)
+    @patch('app.services.onvif_discovery_service.DEVICE_QUERY_TIMEOUT', 0.05)
+    async def test_slow_device_times_out_without_blocking_others(self):
+        """An unresponsive device yields an error result; others still succeed."""
+        import time as time_module
+
+        service = ONVIFDiscoveryService()
+
+        def fake_query(host, port, username, password, endpoint_url):
+            if host.endswith(".100"):
+                time_module.sleep(0.3)
+            return DeviceDetailsResult(status="auth_required")
+
+        with patch.object(service, '_sync_get_device_details', side_effect=fake_query):
+            results = await service.get_all_device_details(self._devices(3))
+
+        assert results[0].status == "error"
+        assert "did not respond" in results[0].error
+        assert [r.status for r in results[1:]] == ["auth_required", "auth_required"]
+
+
 class TestSyncGetDeviceDetails:
     """Test synchronous device details query (P5-2.2).
 
@@ -912,6 +1382,78 @@ class TestSyncGetDeviceDetails:
         # Primary RTSP URL should be from highest resolution profile
         assert result.device.primary_rtsp_url == result.device.profiles[0].rtsp_url
 
+    def test_stream_uris_fetched_concurrently(self):
+        """GetStreamUri calls run in parallel and map back to their profile."""
+        service = ONVIFDiscoveryService()
+
+        mock_camera = MagicMock()
+        mock_device_info = MagicMock()
+        mock_device_info.Manufacturer = "Test"
+        mock_device_info.Model = "Camera"
+        mock_device_info.FirmwareVersion = None
+        mock_device_info.SerialNumber = None
+        mock_device_info.HardwareId = None
+        device_service = mock_camera.create_devicemgmt_service.return_value
+        device_service.GetDeviceInformation.return_value = mock_device_info
+
+        profiles = []
+        for name, width in [("mainStream", 1920), ("subStream", 640)]:
+            profile = MagicMock()
+            profile.token = name
+            profile.Name = name
+            profile.VideoEncoderConfiguration.Resolution.Width = width
+            profile.VideoEncoderConfiguration.Resolution.Height = width // 2
+            profile.VideoEncoderConfiguration.RateControl.FrameRateLimit = 30
+            profile.VideoEncoderConfiguration.Encoding = "H264"
+            profiles.append(profile)
+
+        media_service = mock_camera.create_media_service.return_value
+        media_service.GetProfiles.return_value = profiles
+
+        # Both calls must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=2)
+
+        def get_stream_uri(request):
+            barrier.wait()
+            return MagicMock(Uri=f"rtsp://test:554/{request['ProfileToken']}")
+
+        media_service.GetStreamUri.side_effect = get_stream_uri
+
+        with patch('app.services.onvif_discovery_service.ONVIFCamera', return_value=mock_camera):
+            result = service._sync_get_device_details(
+                host="192.168.1.100",
+                port=80,
+                username="",
+                password="",
+                endpoint_url="http://192.168.1.100/onvif/device_service"
+            )
+
+        assert result.status == "success"
+        assert [p.rtsp_url for p in result.device.profiles] == [
+            "rtsp://test:554/mainStream",
+            "rtsp://test:554/subStream",
+        ]
+
+    def test_profile_with_missing_rate_control(self):
+        """Missing optional encoder elements fall back to defaults."""
+        service = ONVIFDiscoveryService()
+
+        profile = Mock(spec=["token", "Name", "VideoEncoderConfiguration"])
+        profile.token = "main"
+        profile.Name = "mainStream"
+        profile.VideoEncoderConfiguration = Mock(
+            spec=["Resolution", "RateControl", "Encoding"],
+            Resolution=Mock(Width=1920, Height=1080),
+            RateControl=None,
+            Encoding="H264"
+        )
+
+        info = service._extract_profile_info(profile, "rtsp://test:554/main")
+
+        assert info.resolution == "1920x1080"
+        assert info.fps == 30
+        assert info.encoding == "H264"
+
     def test_auth_required_detection(self):
         """AC1: Test authentication required error handling."""
         service = ONVIFDiscoveryService()
@@ -939,6 +1481,19 @@ class TestSyncGetDeviceDetails:
         assert result.status == "auth_required"
         assert "Authentication" in result.error or "authorized" in result.error.lower()
 
+    def test_auth_fault_detection(self):
+        """Auth faults are recognized by subcode or by message text."""
+        from lxml.etree import QName
+        from app.services.onvif_discovery_service import ZeepFault, _is_auth_fault
+
+        assert _is_auth_fault(ZeepFault(
+            "Action failed",
+            subcodes=[QName("http://www.onvif.org/ver10/error", "NotAuthorized")]
+        ))
+        assert _is_auth_fault(ZeepFault("Sender not Authorized"))
+        assert _is_auth_fault(ZeepFault("401 Unauthorized"))
+        assert not _is_auth_fault(ZeepFault("Action not supported"))
+
     def test_connection_error_handling(self):
         """Test connection error is handled gracefully."""
         service = ONVIFDiscoveryService()
@@ -994,3 +1549,116 @@ class TestSyncGetDeviceDetails:
         # Name should be "Manufacturer Model"
         assert "Dahua" in result.device.device_info.name
         assert "IPC-HDW2431T" in result.device.device_info.name
+
+
+class TestONVIFClientCache:
+    """Test reuse of ONVIF camera clients across device queries."""
+
+    @pytest.fixture(autouse=True)
+    def check_onvif_zeep(self):
+        """Skip tests if onvif-zeep not installed."""
+        from app.services.onvif_discovery_service import ONVIF_ZEEP_AVAILABLE
+        if not ONVIF_ZEEP_AVAILABLE:
+            pytest.skip("onvif-zeep library not installed")
+
+    @staticmethod
+    def _mock_camera():
+        mock_camera = MagicMock()
+        mock_device_info = MagicMock()
+        mock_device_info.Manufacturer = "Dahua"
+        mock_device_info.Model = "IPC-HDW2431T"
+        mock_device_info.FirmwareVersion = None
+        mock_device_info.SerialNumber = None
+        mock_device_info.HardwareId = None
+        device_service = mock_camera.create_devicemgmt_service.return_value
+        device_service.GetDeviceInformation.return_value = mock_device_info
+        mock_camera.create_media_service.return_value.GetProfiles.return_value = []
+        return mock_camera
+
+    @staticmethod
+    def _query(service, username="admin", password="password"):
+        return service._sync_get_device_details(
+            host="192.168.1.100",
+            port=80,
+            username=username,
+            password=password,
+            endpoint_url="http://192.168.1.100/onvif/device_service"
+        )
+
+    def test_repeat_query_reuses_client(self):
+        """Client and media service are created once per host/credentials."""
+        service = ONVIFDiscoveryService()
+        mock_camera = self._mock_camera()
+
+        with patch(
+            'app.services.onvif_discovery_service.ONVIFCamera',
+            return_value=mock_camera
+        ) as mock_cls:
+            assert self._query(service).status == "success"
+            assert self._query(service).status == "success"
+
+        assert mock_cls.call_count == 1
+        assert mock_camera.create_media_service.call_count == 1
+
+    def test_different_credentials_create_new_client(self):
+        """Credentials are part of the cache key."""
+        service = ONVIFDiscoveryService()
+
+        with patch(
+            'app.services.onvif_discovery_service.ONVIFCamera',
+            side_effect=lambda **kwargs: self._mock_camera()
+        ) as mock_cls:
+            self._query(service, password="one")
+            self._query(service, password="two")
+
+        assert mock_cls.call_count == 2
+
+    def test_expired_client_is_recreated(self):
+        """Clients older than the TTL are rebuilt."""
+        service = ONVIFDiscoveryService()
+
+        with patch(
+            'app.services.onvif_discovery_service.ONVIFCamera',
+            side_effect=lambda **kwargs: self._mock_camera()
+        ) as mock_cls:
+            self._query(service)
+            for client in service._client_cache.values():
+                client.created_at -= CLIENT_CACHE_TTL + 1
+            self._query(service)
+
+        assert mock_cls.call_count == 2
+        assert len(service._client_cache) == 1
+
+    def test_failed_query_evicts_client(self):
+        """A failing device query drops the cached client."""
+        service = ONVIFDiscoveryService()
+        mock_camera = self._mock_camera()
+        device_service = mock_camera.create_devicemgmt_service.return_value
+
+        with patch(
+            'app.services.onvif_discovery_service.ONVIFCamera',
+            return_value=mock_camera
+        ):
+            self._query(service)
+            assert len(service._client_cache) == 1
+
+            device_service.GetDeviceInformation.side_effect = Exception("Connection reset")
+            result = self._query(service)
+
+        assert result.status == "error"
+        assert len(service._client_cache) == 0
+
+    def test_cache_is_bounded(self):
+        """Least recently used clients are evicted beyond the size limit."""
+        service = ONVIFDiscoveryService()
+
+        with patch(
+            'app.services.onvif_discovery_service.CLIENT_CACHE_MAX_SIZE', 2
+        ), patch(
+            'app.services.onvif_discovery_service.ONVIFCamera',
+            side_effect=lambda **kwargs: self._mock_camera()
+        ):
+            for password in ("a", "b", "c"):
+                self._query(service, password=password)
+
+        assert len(service._client_cache) == 2
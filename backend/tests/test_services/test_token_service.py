@@ -0,0 +1,285 @@
+"""
+Unit tests for TokenService (Stories P12-3.4, P12-3.5, P12-3.6)
+
+Tests cover:
+- Token pair creation and refresh token hashing
+- Refresh token rotation
+- Bulk revocation of device and user tokens
+- Rejection of malformed client-supplied tokens
+- Batched cleanup of expired tokens
+"""
+import uuid
+import pytest
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch, PropertyMock
+
+from app.models.device import Device
+from app.models.refresh_token import RefreshToken, RevokeReason
+from app.models.user import User
+from app.services.mobile.token_service import TokenService
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def user(db_session):
+    """Create a persisted test user."""
+    user = User(
+        id=str(uuid.uuid4()),
+        username="tokenuser",
+        password_hash="not-a-real-hash",
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def make_device(db_session, user):
+    """Factory for persisted devices owned by the test user."""
+    def _create(device_id: str = None) -> Device:
+        device = Device(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            device_id=device_id or f"device-{uuid.uuid4().hex[:8]}",
+            platform="ios",
+        )
+        db_session.add(device)
+        db_session.commit()
+        return device
+    return _create
+
+
+@pytest.fixture
+def token_service(db_session):
+    """TokenService bound to the test session."""
+    return TokenService(db_session)
+
+
+def _add_token(
+    db_session,
+    device,
+    user,
+    revoked: bool = False,
+    expires_at: datetime = None,
+    revoked_at: datetime = None,
+) -> RefreshToken:
+    """Insert a refresh token row directly."""
+    now = datetime.now(timezone.utc)
+    if revoked and revoked_at is None:
+        revoked_at = now
+    token = RefreshToken(
+        device_id=device.id,
+        user_id=user.id,
+        token_hash=uuid.uuid4().hex * 2,
+        token_family=str(uuid.uuid4()),
+        expires_at=expires_at or now + timedelta(days=30),
+        revoked_at=revoked_at,
+        revoked_reason="logout" if revoked else None,
+    )
+    db_session.add(token)
+    db_session.commit()
+    return token
+
+
+# =============================================================================
+# Token creation
+# =============================================================================
+
+
+class TestCreateTokenPair:
+    """Tests for create_token_pair"""
+
+    def test_stores_hash_not_plaintext(self, db_session, token_service, make_device, user):
+        """Refresh token is persisted only as its SHA-256 hash"""
+        device = make_device()
+
+        _, refresh_token, expires_in = token_service.create_token_pair(device.id, user.id)
+
+        record = db_session.query(RefreshToken).one()
+        assert record.token_hash == token_service._hash_token(refresh_token)
+        assert record.token_hash != refresh_token
+        assert expires_in == 15 * 60
+
+    def test_marks_device_paired(self, db_session, token_service, make_device, user):
+        """Creating a token pair confirms device pairing"""
+        device = make_device()
+
+        before = datetime.now(timezone.utc)
+
+        token_service.create_token_pair(device.id, user.id)
+
+        db_session.refresh(device)
+        assert device.pairing_confirmed is True
+        assert device.last_seen_at.replace(tzinfo=timezone.utc) >= before
+
+
+# =============================================================================
+# Refresh / rotation
+# =============================================================================
+
+
+class TestRefreshTokens:
+    """Tests for refresh_tokens rotation"""
+
+    @pytest.fixture(autouse=True)
+    def _aware_validity(self):
+        # SQLite returns naive datetimes, which RefreshToken.is_valid cannot
+        # compare against an aware now(); validity is not under test here.
+        with patch.object(RefreshToken, "is_valid", new_callable=PropertyMock, return_value=True):
+            yield
+
+    def test_rotates_within_family(self, db_session, token_service, make_device, user):
+        """Refreshing revokes the old token and issues one in the same family"""
+        device = make_device()
+        _, old_token, _ = token_service.create_token_pair(device.id, user.id)
+
+        with patch(
+            "app.services.mobile.token_service.create_access_token",
+            return_value="access",
+        ) as mock_access:
+            result = token_service.refresh_tokens(old_token, device.id)
+
+        access_token, new_token, _ = result
+        assert access_token == "access"
+        mock_access.assert_called_once_with(user.id, user.username)
+        assert new_token and new_token != old_token
+
+        tokens = db_session.query(RefreshToken).all()
+        assert len({t.token_family for t in tokens}) == 1
+        old = next(t for t in tokens if t.token_hash == token_service._hash_token(old_token))
+        assert old.revoked_reason == "rotation"
+
+    def test_unknown_token_returns_none(self, token_service, make_device):
+        """A well-formed but unknown token is rejected"""
+        assert token_service.refresh_tokens("ab" * 64, make_device().id) is None
+
+
+# =============================================================================
+# Revocation
+# =============================================================================
+
+
+class TestBulkRevocation:
+    """Tests for revoke_device_tokens and revoke_user_tokens"""
+
+    def test_revoke_device_tokens_only_active_for_device(
+        self, db_session, token_service, make_device, user
+    ):
+        """Only active tokens on the target device are revoked"""
+        device = make_device()
+        other_device = make_device()
+        _add_token(db_session, device, user)
+        _add_token(db_session, device, user)
+        already_revoked = _add_token(db_session, device, user, revoked=True)
+        other = _add_token(db_session, other_device, user)
+
+        count = token_service.revoke_device_tokens(device.id)
+
+        assert count == 2
+        remaining = db_session.query(RefreshToken).filter(
+            RefreshToken.device_id == device.id,
+            RefreshToken.revoked_at.is_(None),
+        ).count()
+        assert remaining == 0
+        db_session.refresh(already_revoked)
+        assert already_revoked.revoked_reason == "logout"
+        db_session.refresh(other)
+        assert other.revoked_at is None
+
+    def test_revoke_user_tokens_sets_reason(self, db_session, token_service, make_device, user):
+        """All active user tokens across devices are revoked with the reason"""
+        _add_token(db_session, make_device(), user)
+        _add_token(db_session, make_device(), user)
+
+        count = token_service.revoke_user_tokens(user.id, "logout_all")
+
+        assert count == 2
+        reasons = {t.revoked_reason for t in db_session.query(RefreshToken).all()}
+        assert reasons == {"logout_all"}
+
+    def test_revoke_reason_enum_stored_as_value(self, db_session, token_service, make_device, user):
+        """RevokeReason members are persisted as their plain string value"""
+        device = make_device()
+        _add_token(db_session, device, user)
+
+        token_service.revoke_device_tokens(device.id, RevokeReason.LOGOUT)
+
+        assert db_session.query(RefreshToken).one().revoked_reason == "logout"
+
+    def test_revoke_user_tokens_none_active(self, token_service, user):
+        """Revoking with no active tokens returns zero"""
+        assert token_service.revoke_user_tokens(user.id) == 0
+
+
+# =============================================================================
+# Token format validation
+# =============================================================================
+
+
+class TestMalformedTokens:
+    """Tests for rejecting malformed client-supplied tokens"""
+
+    @pytest.mark.parametrize("token", [
+        "",
+        "invalid-token",
+        "ab" * 63,
+        "zz" * 64,
+        "a b" * 42 + "ab",
+    ])
+    def test_is_well_formed_rejects(self, token):
+        """Tokens not matching the issued hex format are rejected"""
+        assert TokenService._is_well_formed(token) is False
+
+    def test_is_well_formed_accepts_issued_token(self, token_service, make_device, user):
+        """Tokens issued by create_token_pair pass validation"""
+        _, refresh_token, _ = token_service.create_token_pair(make_device().id, user.id)
+
+        assert TokenService._is_well_formed(refresh_token) is True
+
+    def test_refresh_malformed_token_skips_lookup(self, token_service):
+        """Malformed tokens return None without hashing"""
+        with patch.object(token_service, "_hash_token") as mock_hash:
+            assert token_service.refresh_tokens("not-a-token", "device-1") is None
+        mock_hash.assert_not_called()
+
+    def test_revoke_malformed_token(self, token_service):
+        """Revoking a malformed token reports nothing revoked"""
+        assert token_service.revoke_token("not-a-token") is False
+
+
+# =============================================================================
+# Cleanup
+# =============================================================================
+
+
+class TestCleanupExpiredTokens:
+    """Tests for cleanup_expired_tokens"""
+
+    def test_deletes_only_expired_and_long_revoked(
+        self, db_session, token_service, make_device, user
+    ):
+        """Tokens are deleted in batches; recent or active tokens are kept"""
+        device = make_device()
+        long_ago = datetime.now(timezone.utc) - timedelta(days=10)
+        for _ in range(5):
+            _add_token(db_session, device, user, expires_at=long_ago, revoked_at=long_ago)
+        recently_revoked = _add_token(
+            db_session, device, user,
+            expires_at=long_ago, revoked_at=datetime.now(timezone.utc),
+        )
+        active = _add_token(db_session, device, user)
+
+        deleted = token_service.cleanup_expired_tokens(batch_size=2)
+
+        assert deleted == 5
+        remaining = {t.id for t in db_session.query(RefreshToken).all()}
+        assert remaining == {recently_revoked.id, active.id}
+
+    def test_nothing_to_delete(self, token_service):
+        """Cleanup with no eligible tokens returns zero"""
+        assert token_service.cleanup_expired_tokens() == 0
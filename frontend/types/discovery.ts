@@ -53,12 +53,16 @@ export interface IDeviceInfo {
 export interface IDiscoveredDevice {
   /** XAddrs service URL from ProbeMatch response */
   endpoint_url: string;
+  /** All service URLs the device advertised, across interfaces */
+  xaddrs?: string[];
   /** Device scopes (e.g., onvif://www.onvif.org/type/NetworkVideoTransmitter) */
   scopes: string[];
   /** Device types from ProbeMatch (e.g., tdn:NetworkVideoTransmitter) */
   types: string[];
   /** Metadata version from ProbeMatch if available */
   metadata_version?: string | null;
+  /** ONVIF scopes by category (e.g., { name: "FrontDoor" }) */
+  scope_index?: Record<string, string>;
 }
 
 /**